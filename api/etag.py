@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request
+
+from auth.auth_bearer import get_authenticated_user_data_async
+from service.resource_cache_service import resource_cache
+
+# Clients may keep the body but must revalidate it before each use
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, so W/"x" and "x" match
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+class ETagged:
+    """
+    Dependency making a GET route of a user-owned resource conditional.
+
+    The ETag is the resource's version token from the resource cache, which every write to
+    the resource replaces. A request whose ``If-None-Match`` matches is answered with a 304
+    straight away, before the route runs, so it never reaches Postgres. Otherwise the ETag
+    is stored on ``request.state`` and added to successful responses by the app middleware.
+    Without Redis no ETag is sent and requests are served as usual.
+
+    Usage: ``dependencies=[Depends(ETagged("walking_plans"))]`` on the route.
+    """
+
+    def __init__(self, resource: str, daily: bool = False) -> None:
+        """
+        Args:
+            resource (str): The resource cache name of the resource.
+            daily (bool): Also change the ETag each UTC day, for responses with values
+                derived from the date, such as an age.
+        """
+        self.resource = resource
+        self.daily = daily
+
+    async def __call__(
+        self,
+        request: Request,
+        user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    ) -> str | None:
+        version = await resource_cache.version(self.resource, user_data["user_id"])
+        if version is None:
+            return None
+
+        if self.daily:
+            version = f"{version}-{datetime.now(timezone.utc):%Y%m%d}"  # noqa: UP017 Not supported in Python 3.10
+        etag = f'W/"{version}"'
+
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(
+                status_code=304, headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+            )
+        request.state.etag = etag
+        return etag
@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
+
+from service.health_service import health_check
+from service.warmup_service import warmup
 
 router = APIRouter(prefix="/healthcheck", tags=["Healthcheck"])
 
@@ -6,3 +9,23 @@ router = APIRouter(prefix="/healthcheck", tags=["Healthcheck"])
 @router.get("")
 async def healthcheck():
     pass
+
+
+@router.get("/live")
+async def live():
+    """Liveness: the worker is up and its event loop is responding."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(response: Response):
+    """
+    Readiness: warm-up has finished and Postgres, Redis and any optional dependencies
+    answered their probes, with a 503 otherwise. Probe results are cached for a few seconds.
+    """
+    warm_up = warmup.report()
+    health = await health_check.check()
+    is_ready = warm_up["ready"] and health["healthy"]
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"ready": is_ready, "components": warm_up["components"], "checks": health["checks"]}
@@ -1,34 +1,95 @@
 from datetime import datetime, timezone
+from itertools import chain
 from typing import Annotated
 
 from dateutil.relativedelta import relativedelta
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse
-
-from auth.auth_bearer import get_authenticated_user_data
-from crud.activities_crud import get_activities_by_filters
-from schemas.activity import ActivityResponseSchema, UserActivityRequestSchema
-from service.activity_service import load_activities_data_in_sns
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+
+from auth.auth_bearer import get_authenticated_user_data, get_authenticated_user_data_async
+from crud.activities_crud import get_activities_page, stream_activities
+from crud.activity_rollup_crud import (
+    AsyncActivityRollupCRUD,
+    Granularity,
+    get_async_activity_rollup_crud,
+)
+from crud.outbox_crud import AsyncOutboxCRUD, get_async_outbox_crud
+from schemas.activity import (
+    ActivityResponseSchema,
+    ActivitySummaryResponseSchema,
+    UserActivityRequestSchema,
+)
+from service.activity_service import (
+    decode_activity_cursor,
+    encode_activity_cursor,
+    iter_json_array,
+    iter_ndjson,
+    load_activities_data_in_sns,
+)
 
 router = APIRouter(prefix="/activities", tags=["activities"])
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 @router.post("", status_code=201, response_class=JSONResponse)
 async def save_activity(
-    background_task: BackgroundTasks,
     activity_payload: UserActivityRequestSchema,
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    outbox_crud: Annotated[AsyncOutboxCRUD, Depends(get_async_outbox_crud)],
 ):
-    background_task.add_task(load_activities_data_in_sns, activity_payload, user_data["user_id"])
+    if not await load_activities_data_in_sns(activity_payload, user_data["user_id"], outbox_crud):
+        raise HTTPException(
+            status_code=503,
+            detail="Activity queue is full, please retry later",
+            headers={"Retry-After": "1"},
+        )
     return {"message": "Success"}
 
 
+@router.get("/summary", response_model=list[ActivitySummaryResponseSchema], status_code=200)
+async def get_activities_summary(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    rollup_crud: Annotated[AsyncActivityRollupCRUD, Depends(get_async_activity_rollup_crud)],
+    granularity: Annotated[Granularity, Query(description="Period to total over")] = "day",
+    start_date: int | None = Query(None, gt=0, description="Range start (UNIX timestamp)"),
+    end_date: int | None = Query(None, gt=0, description="Range end (UNIX timestamp)"),
+):
+    end = (
+        datetime.fromtimestamp(end_date, timezone.utc)  # noqa: UP017 Not supported in Python 3.10
+        if end_date
+        else datetime.now(timezone.utc)  # noqa: UP017 Not supported in Python 3.10
+    ).date()
+    start = (
+        datetime.fromtimestamp(start_date, timezone.utc).date()  # noqa: UP017 Not supported in Python 3.10
+        if start_date
+        else end - relativedelta(years=1)
+    )
+
+    if start > end:
+        raise HTTPException(status_code=400, detail="Start date cannot be greater than end date")
+
+    summary = await rollup_crud.get_summary(user_data["user_id"], granularity, start, end)
+
+    if not summary:
+        raise HTTPException(status_code=404, detail="Data not found")
+
+    return ORJSONResponse(summary)
+
+
 @router.get("", response_model=list[ActivityResponseSchema], status_code=200)
-def list_activities(
+def list_activities(  # noqa: PLR0913
     user_data: Annotated[dict, Depends(get_authenticated_user_data)],
     date: int | None = Query(None, gt=0, description="Filter by exact date (UNIX timestamp)"),
     start_date: int | None = Query(None, gt=0, description="Filter by start date (UNIX timestamp)"),
     end_date: int | None = Query(None, gt=0, description="Filter by end date (UNIX timestamp)"),
+    limit: int | None = Query(
+        None, gt=0, le=MAX_PAGE_SIZE, description="Page size, enables cursor pagination"
+    ),
+    cursor: str | None = Query(None, description="X-Next-Cursor value of the previous page"),
+    accept: Annotated[str | None, Header()] = None,
 ):
     if date and (start_date or end_date):
         raise HTTPException(
@@ -68,9 +129,34 @@ def list_activities(
         if v is not None
     }
 
-    activities = get_activities_by_filters(user_id=user_data["user_id"], filters=filters)
+    if limit or cursor:
+        return _list_activities_page(user_data["user_id"], filters, limit, cursor)
+
+    chunks = stream_activities(user_id=user_data["user_id"], filters=filters)
+    first_chunk = next(chunks, None)
+    if not first_chunk:
+        chunks.close()
+        raise HTTPException(status_code=404, detail="Data not found")
+
+    rows = chain([first_chunk], chunks)
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(iter_ndjson(rows), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(iter_json_array(rows), media_type="application/json")
 
-    if not activities:
+
+def _list_activities_page(user_id, filters: dict, limit: int | None, cursor: str | None):
+    limit = limit or DEFAULT_PAGE_SIZE
+    after = decode_activity_cursor(cursor) if cursor else None
+
+    # One extra row tells us whether another page follows without a COUNT query
+    activities = get_activities_page(user_id=user_id, filters=filters, limit=limit + 1, after=after)
+
+    if not activities and not cursor:
         raise HTTPException(status_code=404, detail="Data not found")
 
-    return activities
+    headers = {}
+    if len(activities) > limit:
+        activities = activities[:limit]
+        headers["X-Next-Cursor"] = encode_activity_cursor(activities[-1])
+
+    return ORJSONResponse(activities, headers=headers)
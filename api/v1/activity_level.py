@@ -2,31 +2,37 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 
-from auth.auth_bearer import get_authenticated_user_data
-from crud.activity_level_crud import UserActivityLevelCRUD
+from auth.auth_bearer import get_authenticated_user_data_async
+from crud.activity_level_crud import AsyncUserActivityLevelCRUD, get_async_activity_level_crud
 from schemas.activity_level import ActivityLevelRequestSchema, ActivityLevelResponseSchema
+from service.resource_cache_service import resource_cache
 
 router = APIRouter(prefix="/activity_level", tags=["activity level"])
 
+CACHE_RESOURCE = "activity_level"
+
 
 @router.get("/", response_model=list[ActivityLevelResponseSchema], status_code=200)
-def get_user_activity_levels_list(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    crud: Annotated[UserActivityLevelCRUD, Depends()],
+async def get_user_activity_levels_list(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    crud: Annotated[AsyncUserActivityLevelCRUD, Depends(get_async_activity_level_crud)],
 ):
-    activity_levels = crud.get_all_by_user(user_data["user_id"])
+    activity_levels = await resource_cache.get_or_load(
+        CACHE_RESOURCE, user_data["user_id"], lambda: crud.get_all_by_user(user_data["user_id"])
+    )
 
-    return activity_levels
+    return ORJSONResponse(activity_levels)
 
 
 @router.get("/{activity_level_id}", response_model=ActivityLevelResponseSchema, status_code=200)
-def get_user_activity_level(
+async def get_user_activity_level(
     activity_level_id: UUID,
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    crud: Annotated[UserActivityLevelCRUD, Depends()],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    crud: Annotated[AsyncUserActivityLevelCRUD, Depends(get_async_activity_level_crud)],
 ):
-    activity_level = crud.get_by_id(user_data["user_id"], activity_level_id)
+    activity_level = await crud.get_by_id(user_data["user_id"], activity_level_id)
 
     if not activity_level:
         raise HTTPException(status_code=404, detail="Data not found")
@@ -35,38 +41,41 @@ def get_user_activity_level(
 
 
 @router.post("/", response_model=ActivityLevelResponseSchema, status_code=200)
-def create_activity_level(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+async def create_activity_level(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     payload: ActivityLevelRequestSchema,
-    crud: Annotated[UserActivityLevelCRUD, Depends()],
+    crud: Annotated[AsyncUserActivityLevelCRUD, Depends(get_async_activity_level_crud)],
 ):
-    new_activity_level = crud.create(user_data["user_id"], payload=payload)
+    new_activity_level = await crud.create(user_data["user_id"], payload=payload)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
     return new_activity_level
 
 
 @router.put("/{activity_level_id}", response_model=ActivityLevelResponseSchema, status_code=200)
-def update_activity_level(
+async def update_activity_level(
     activity_level_id: UUID,
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     payload: ActivityLevelRequestSchema,
-    crud: Annotated[UserActivityLevelCRUD, Depends()],
+    crud: Annotated[AsyncUserActivityLevelCRUD, Depends(get_async_activity_level_crud)],
 ):
-    existing_level = crud.get_by_id(user_data["user_id"], activity_level_id)
+    existing_level = await crud.get_by_id(user_data["user_id"], activity_level_id)
     if not existing_level:
         raise HTTPException(status_code=404, detail="Data not found")
 
-    activity_level = crud.update(existing_level, payload)
+    activity_level = await crud.update(existing_level, payload)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
     return activity_level
 
 
 @router.delete("/{activity_level_id}", status_code=204)
-def delete_activity_level(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+async def delete_activity_level(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     activity_level_id: UUID,
-    crud: Annotated[UserActivityLevelCRUD, Depends()],
+    crud: Annotated[AsyncUserActivityLevelCRUD, Depends(get_async_activity_level_crud)],
 ):
-    existing_level = crud.get_by_id(user_data["user_id"], activity_level_id)
+    existing_level = await crud.get_by_id(user_data["user_id"], activity_level_id)
     if not existing_level:
         raise HTTPException(status_code=404, detail="Data not found")
 
-    crud.delete(existing_level)
+    await crud.delete(existing_level)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
@@ -2,22 +2,27 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
-from auth.auth_bearer import get_authenticated_user_data
-from crud.daily_target_crud import UserDailyTargetCRUD
+from api.etag import ETagged
+from auth.auth_bearer import get_authenticated_user_data_async
+from crud.daily_target_crud import AsyncUserDailyTargetCRUD, get_async_daily_target_crud
 from models.daily_target import UserDailyTarget
 from schemas.daily_target import DailyTargetRequestSchema, DailyTargetResponseSchema
+from service.resource_cache_service import resource_cache
 
 router = APIRouter(prefix="/daily_targets", tags=["daily target"])
 
+CACHE_RESOURCE = "daily_targets"
+
 
 @router.post("", response_model=DailyTargetResponseSchema, status_code=201)
-def create_daily_target(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+async def create_daily_target(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     payload: DailyTargetRequestSchema,
-    daily_target_crud: Annotated[UserDailyTargetCRUD, Depends()],
+    daily_target_crud: Annotated[AsyncUserDailyTargetCRUD, Depends(get_async_daily_target_crud)],
 ):
-    existing_target = daily_target_crud.get_user_target_by_payload_data(
+    existing_target = await daily_target_crud.get_user_target_by_payload_data(
         user_id=user_data["user_id"], data=payload
     )
 
@@ -31,14 +36,20 @@ def create_daily_target(
         date=payload.date,
         daily_target=payload.daily_target,
     )
-    created_daily_target = daily_target_crud.create_daily_target(new_daily_target)
+    created_daily_target = await daily_target_crud.create_daily_target(new_daily_target)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
     return created_daily_target
 
 
-@router.get("", response_model=list[DailyTargetResponseSchema], status_code=200)
-def get_user_daily_targets_list(  # noqa: PLR0913
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    daily_target_crud: Annotated[UserDailyTargetCRUD, Depends()],
+@router.get(
+    "",
+    response_model=list[DailyTargetResponseSchema],
+    status_code=200,
+    dependencies=[Depends(ETagged(CACHE_RESOURCE))],
+)
+async def get_user_daily_targets_list(  # noqa: PLR0913
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    daily_target_crud: Annotated[AsyncUserDailyTargetCRUD, Depends(get_async_daily_target_crud)],
     date: int | None = Query(None, description="Filter by exact date (UNIX timestamp)"),
     start_date: int | None = Query(None, description="Filter by start date (UNIX timestamp)"),
     end_date: int | None = Query(None, description="Filter by end date (UNIX timestamp)"),
@@ -55,21 +66,26 @@ def get_user_daily_targets_list(  # noqa: PLR0913
 
     filters = {k: v for k, v in filters.items() if v is not None}
 
-    daily_targets = daily_target_crud.get_daily_targets_by_filters(user_data["user_id"], filters)
+    daily_targets = await resource_cache.get_or_load(
+        CACHE_RESOURCE,
+        user_data["user_id"],
+        lambda: daily_target_crud.get_daily_targets_by_filters(user_data["user_id"], filters),
+        variant="&".join(f"{k}={v}" for k, v in sorted(filters.items())),
+    )
 
     if not daily_targets:
         raise HTTPException(status_code=404, detail="Data not found")
 
-    return daily_targets
+    return ORJSONResponse(daily_targets)
 
 
 @router.get("/{target_id}", response_model=DailyTargetResponseSchema, status_code=200)
-def get_user_daily_target(
+async def get_user_daily_target(
     target_id: UUID,
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    daily_target_crud: Annotated[UserDailyTargetCRUD, Depends()],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    daily_target_crud: Annotated[AsyncUserDailyTargetCRUD, Depends(get_async_daily_target_crud)],
 ):
-    daily_target = daily_target_crud.get_user_daily_target_by_id(
+    daily_target = await daily_target_crud.get_user_daily_target_by_id(
         user_id=user_data["user_id"], target_id=target_id
     )
 
@@ -80,34 +96,36 @@ def get_user_daily_target(
 
 
 @router.put("/{target_id}", response_model=DailyTargetResponseSchema, status_code=200)
-def update_daily_target(
+async def update_daily_target(
     target_id: UUID,
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     payload: DailyTargetRequestSchema,
-    daily_target_crud: Annotated[UserDailyTargetCRUD, Depends()],
+    daily_target_crud: Annotated[AsyncUserDailyTargetCRUD, Depends(get_async_daily_target_crud)],
 ):
-    user_daily_target = daily_target_crud.get_user_daily_target_by_id(
+    user_daily_target = await daily_target_crud.get_user_daily_target_by_id(
         user_id=user_data["user_id"], target_id=target_id
     )
 
     if not user_daily_target:
         raise HTTPException(status_code=404, detail="Data not found")
 
-    updated_daily_target = daily_target_crud.update_daily_target(user_daily_target, payload)
+    updated_daily_target = await daily_target_crud.update_daily_target(user_daily_target, payload)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
     return updated_daily_target
 
 
 @router.delete("/{target_id}", status_code=204)
-def delete_daily_target(
+async def delete_daily_target(
     target_id: UUID,
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    daily_target_crud: Annotated[UserDailyTargetCRUD, Depends()],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    daily_target_crud: Annotated[AsyncUserDailyTargetCRUD, Depends(get_async_daily_target_crud)],
 ):
-    user_daily_target = daily_target_crud.get_user_daily_target_by_id(
+    user_daily_target = await daily_target_crud.get_user_daily_target_by_id(
         user_id=user_data["user_id"], target_id=target_id
     )
 
     if not user_daily_target:
         raise HTTPException(status_code=404, detail="Data not found")
 
-    daily_target_crud.delete_daily_target(user_daily_target)
+    await daily_target_crud.delete_daily_target(user_daily_target)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
@@ -1,13 +1,23 @@
-import calendar
-from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from starlette.responses import JSONResponse
 
-from auth.auth_bearer import get_authenticated_user_data
-from schemas.migrations_schema import ActivitiesMigrationsRequestSchema
-from service.migrations_service import publish_bulk_activities_data_to_sns
+from auth.auth_bearer import get_authenticated_user_data_async
+from crud.activities_crud import upsert_bulk_activities
+from crud.outbox_crud import AsyncOutboxCRUD, get_async_outbox_crud
+from schemas.migrations_schema import (
+    ActivitiesBulkMigrationsRequestSchema,
+    ActivitiesBulkMigrationsResponseSchema,
+    ActivitiesMigrationsRequestSchema,
+)
+from service.migrations_service import (
+    activities_within_month,
+    publish_bulk_activities_data_to_sns,
+    queue_bulk_activities_data_in_outbox,
+)
+from utils.base_config import config as settings
 
 router = APIRouter(prefix="/migrations", tags=["migrations"])
 
@@ -16,31 +26,37 @@ router = APIRouter(prefix="/migrations", tags=["migrations"])
 async def save_bulk_activities(
     background_task: BackgroundTasks,
     data: ActivitiesMigrationsRequestSchema,
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    outbox_crud: Annotated[AsyncOutboxCRUD, Depends(get_async_outbox_crud)],
 ):
-    month_start = datetime.fromtimestamp(data.month).replace(
-        day=1, hour=0, minute=0, second=0, microsecond=0
-    )
-    month_end = month_start.replace(
-        day=calendar.monthrange(month_start.year, month_start.month)[1],
-        hour=23,
-        minute=59,
-        second=59,
-        microsecond=999999,
-    )
-
-    unix_month_start = int(month_start.timestamp())
-    unix_month_end = int(month_end.timestamp())
-
-    out_of_range_activities = [
-        activity
-        for activity in data.activities
-        if not unix_month_start <= activity.date <= unix_month_end
-    ]
-
-    if out_of_range_activities:
+    if not activities_within_month(data):
         raise HTTPException(status_code=400, detail="Some activities are out of the month range")
 
-    background_task.add_task(publish_bulk_activities_data_to_sns, data, user_data["user_id"])
+    if settings.activity_outbox_enabled:
+        await queue_bulk_activities_data_in_outbox(data, user_data["user_id"], outbox_crud)
+    else:
+        background_task.add_task(publish_bulk_activities_data_to_sns, data, user_data["user_id"])
 
     return {"message": "Success"}
+
+
+@router.post(
+    "/activities/bulk",
+    status_code=200,
+    response_model=ActivitiesBulkMigrationsResponseSchema,
+)
+async def upsert_bulk_activities_months(
+    data: ActivitiesBulkMigrationsRequestSchema,
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+):
+    """
+    Write any number of months of activities straight to the database.
+
+    Activities already stored for a date are overwritten, so a migration can be re-sent
+    safely. Returns how many activities were inserted and how many were updated.
+    """
+    if not all(activities_within_month(month) for month in data.months):
+        raise HTTPException(status_code=400, detail="Some activities are out of the month range")
+
+    activities = (activity for month in data.months for activity in month.activities)
+    return await run_in_threadpool(upsert_bulk_activities, activities, user_data["user_id"])
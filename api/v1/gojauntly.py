@@ -2,43 +2,53 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Path
 
-from auth.auth_bearer import get_authenticated_user_data
-from gojauntly.gojauntly import GoJauntlyApi
+from auth.auth_bearer import get_authenticated_user_data_async
+from gojauntly.cache import gojauntly_cache
+from gojauntly.gojauntly import gojauntly_client
 from schemas.gojauntly import (
     CuratedWalkRetrieve,
     CuratedWalksSearch,
     DynamicRoutesCircularCollection,
 )
-from utils.base_config import config
 
-router = APIRouter(dependencies=[Depends(get_authenticated_user_data)], tags=["GoJauntly"])
-
-
-client = GoJauntlyApi(
-    key_id=config.gojauntly_key_id,
-    secret_key=config.gojauntly_private_key,
-    issuer_id=config.gojauntly_issuer_id,
-)
+router = APIRouter(dependencies=[Depends(get_authenticated_user_data_async)], tags=["GoJauntly"])
 
 
 @router.post("/curated-walks/search")
-def curated_walk_search(data: CuratedWalksSearch):
-    response = client.curated_walk_search(data=data.model_dump())
+async def curated_walk_search(data: CuratedWalksSearch):
+    response = await gojauntly_cache.get_or_fetch(
+        "curated_walk_search",
+        data,
+        lambda: gojauntly_client.curated_walk_search(data=data.model_dump()),
+    )
 
     return response
 
 
 @router.post("/curated-walks/{id}")
-def curated_walk_retrieve(
+async def curated_walk_retrieve(
     id: Annotated[str, Path(description="ID of the walk")], data: CuratedWalkRetrieve
 ):
-    response = client.curated_walk_retrieve(id=id, data=data.model_dump())
+    response = await gojauntly_cache.get_or_fetch(
+        "curated_walk_retrieve",
+        data,
+        lambda: gojauntly_client.curated_walk_retrieve(id=id, data=data.model_dump()),
+        id,
+    )
 
     return response
 
 
 @router.post("/routing/circular/collection")
-def dynamic_routes_circular_collection(data: DynamicRoutesCircularCollection):
-    response = client.dynamic_routes_circular_collection(data=data.model_dump())
+async def dynamic_routes_circular_collection(data: DynamicRoutesCircularCollection):
+    if data.store:
+        # Stored routes are saved upstream, so each request has to reach GoJauntly
+        return await gojauntly_client.dynamic_routes_circular_collection(data=data.model_dump())
+
+    response = await gojauntly_cache.get_or_fetch(
+        "dynamic_routes_circular_collection",
+        data,
+        lambda: gojauntly_client.dynamic_routes_circular_collection(data=data.model_dump()),
+    )
 
     return response
@@ -2,43 +2,52 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 
-from auth.auth_bearer import get_authenticated_user_data
-from crud.motivation_crud import UserMotivationCRUD
+from auth.auth_bearer import get_authenticated_user_data_async
+from crud.motivation_crud import AsyncUserMotivationCRUD, get_async_motivation_crud
 from schemas.motivation import (
     CreateUpdateUserMotivationRequest,
     UserMotivationResponse,
 )
+from service.resource_cache_service import resource_cache
 from utils.base_config import logger
 
 router = APIRouter(prefix="/motivations", tags=["Motivations"])
 
+CACHE_RESOURCE = "motivations"
+
 
 @router.post("/", response_model=UserMotivationResponse, status_code=201)
-def create_user_motivation(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+async def create_user_motivation(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     payload: CreateUpdateUserMotivationRequest,
-    crud: Annotated[UserMotivationCRUD, Depends()],
+    crud: Annotated[AsyncUserMotivationCRUD, Depends(get_async_motivation_crud)],
 ):
-    new_motivation = crud.create_motivation(user_data["user_id"], payload)
+    new_motivation = await crud.create_motivation(user_data["user_id"], payload)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
     return new_motivation
 
 
 @router.get("/", response_model=list[UserMotivationResponse])
-def get_all_motivations(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    crud: Annotated[UserMotivationCRUD, Depends()],
+async def get_all_motivations(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    crud: Annotated[AsyncUserMotivationCRUD, Depends(get_async_motivation_crud)],
 ):
-    return crud.get_all_by_user(user_data["user_id"])
+    # Rows are already response-shaped, skip response_model validation
+    motivations = await resource_cache.get_or_load(
+        CACHE_RESOURCE, user_data["user_id"], lambda: crud.get_all_by_user(user_data["user_id"])
+    )
+    return ORJSONResponse(motivations)
 
 
 @router.get("/{motivation_id}", response_model=UserMotivationResponse)
-def get_motivation_by_id(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+async def get_motivation_by_id(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     motivation_id: UUID,
-    crud: Annotated[UserMotivationCRUD, Depends()],
+    crud: Annotated[AsyncUserMotivationCRUD, Depends(get_async_motivation_crud)],
 ):
-    motivation = crud.get_by_id(motivation_id)
+    motivation = await crud.get_by_id(motivation_id)
     logger.info(f"Motivation ID: {motivation.id}")
     logger.info(f"User ID: {user_data['user_id']}")
     logger.info(f"condition: {str(motivation.user_id) != user_data['user_id']}")
@@ -50,28 +59,30 @@ def get_motivation_by_id(
 
 
 @router.put("/{motivation_id}", response_model=UserMotivationResponse)
-def update_user_motivation(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+async def update_user_motivation(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     motivation_id: UUID,
     payload: CreateUpdateUserMotivationRequest,
-    crud: Annotated[UserMotivationCRUD, Depends()],
+    crud: Annotated[AsyncUserMotivationCRUD, Depends(get_async_motivation_crud)],
 ):
-    motivation = crud.get_by_id(motivation_id)
+    motivation = await crud.get_by_id(motivation_id)
     if not motivation or str(motivation.user_id) != user_data["user_id"]:
         raise HTTPException(status_code=404, detail="Motivation not found")
 
-    updated = crud.update_motivation(motivation, payload)
+    updated = await crud.update_motivation(motivation, payload)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
     return updated
 
 
 @router.delete("/{motivation_id}", status_code=204)
-def delete_user_motivation(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+async def delete_user_motivation(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     motivation_id: UUID,
-    crud: Annotated[UserMotivationCRUD, Depends()],
+    crud: Annotated[AsyncUserMotivationCRUD, Depends(get_async_motivation_crud)],
 ):
-    motivation = crud.get_by_id(motivation_id)
+    motivation = await crud.get_by_id(motivation_id)
     if not motivation or str(motivation.user_id) != user_data["user_id"]:
         raise HTTPException(status_code=404, detail="Motivation not found")
 
-    crud.delete_motivation(motivation)
+    await crud.delete_motivation(motivation)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
@@ -1,56 +1,72 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from starlette.responses import JSONResponse
 
-from auth.auth_bearer import get_authenticated_user_data
-from crud.subscription_crud import SubscriptionCRUD
+from api.etag import ETagged
+from auth.auth_bearer import get_authenticated_user_data_async
+from crud.subscription_crud import AsyncSubscriptionCRUD, get_async_subscription_crud
 from crud.user_crud import UserCRUD
 from schemas.user import EmailPreferenceRequest, EmailPreferenceRequestPublic
+from service.redis_service import USER_PROFILE_RESOURCE, RedisService, get_redis_service
 from service.user_service import UserService
 from utils.base_config import logger
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("/", response_class=JSONResponse)
+@router.get(
+    "/",
+    response_class=JSONResponse,
+    dependencies=[Depends(ETagged(USER_PROFILE_RESOURCE, daily=True))],
+)
 def get_user(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     user_service: Annotated[UserService, Depends()],
     user_crud: Annotated[UserCRUD, Depends()],
+    redis_service: Annotated[RedisService, Depends(get_redis_service)],
 ):
-    user = user_crud.get_user_by_id(user_data["user_id"])
-    user_details = user_service.get_user_profile(user)
+    user_id = user_data["user_id"]
+    user_details = redis_service.get_user_profile_cache(user_id)
+    if user_details is not None:
+        return user_details
+
+    profile = user_crud.get_user_profile(user_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user_details = user_service.get_user_profile(profile).model_dump(mode="json")
+    redis_service.set_user_profile_cache(user_id, user_details)
     return user_details
 
 
 @router.post("/email_preferences/subscribe", response_class=JSONResponse)
-def subscribe_email_preference(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    subscription_crud: Annotated[SubscriptionCRUD, Depends()],
+async def subscribe_email_preference(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    subscription_crud: Annotated[AsyncSubscriptionCRUD, Depends(get_async_subscription_crud)],
     payload: EmailPreferenceRequest,
 ):
-    subscription_crud.subscribe_email_preferences(user_data["user_id"], payload.name)
+    await subscription_crud.subscribe_email_preferences(user_data["user_id"], payload.name)
     logger.info(f"User (id = {user_data['user_id']}) is subscribed to email preferences")
 
     return JSONResponse(status_code=200, content={"message": "Subscribed to email preferences"})
 
 
 @router.post("/email_preferences/unsubscribe", response_class=JSONResponse)
-def unsubscribe_email_preference(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    subscription_crud: Annotated[SubscriptionCRUD, Depends()],
+async def unsubscribe_email_preference(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    subscription_crud: Annotated[AsyncSubscriptionCRUD, Depends(get_async_subscription_crud)],
     payload: EmailPreferenceRequest,
 ):
-    subscription_crud.unsubscribe_email_preferences(user_data["user_id"], payload.name)
+    await subscription_crud.unsubscribe_email_preferences(user_data["user_id"], payload.name)
     logger.info(f"User (id = {user_data['user_id']}) is unsubscribed from email preferences")
 
     return JSONResponse(status_code=200, content={"message": "Unsubscribed from email preferences"})
 
 
 @router.post("/public/email_preferences/unsubscribe/", response_class=JSONResponse)
-def public_unsubscribe_email_preference(
-    subscription_crud: Annotated[SubscriptionCRUD, Depends()],
+async def public_unsubscribe_email_preference(
+    subscription_crud: Annotated[AsyncSubscriptionCRUD, Depends(get_async_subscription_crud)],
     payload: EmailPreferenceRequestPublic,
 ):
     """
@@ -63,7 +79,7 @@ def public_unsubscribe_email_preference(
         JSONResponse: Success or error message.
     """
 
-    subscription_crud.unsubscribe_by_email(payload.email, payload.name)
+    await subscription_crud.unsubscribe_by_email(payload.email, payload.name)
     logger.info(
         f"User (email = {payload.email}) unsubscribed from email preferences with the name '{payload.name}'"  # noqa: E501
     )
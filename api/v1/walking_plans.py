@@ -2,21 +2,29 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
 
-from auth.auth_bearer import get_authenticated_user_data
-from crud.walking_plan_crud import UserWalkingPlanCRUD
+from api.etag import ETagged
+from auth.auth_bearer import get_authenticated_user_data_async
+from crud.walking_plan_crud import AsyncUserWalkingPlanCRUD, get_async_walking_plan_crud
 from models.walking_plan import UserWalkingPlan
 from schemas.walking_plan import UserWalkingPlanResponseSchema, WalkingPlanRequestSchema
+from service.resource_cache_service import resource_cache
 
 router = APIRouter(prefix="/walking_plans", tags=["walking plans"])
 
+CACHE_RESOURCE = "walking_plans"
+
+
+def _walking_plan_response(walking_plan: UserWalkingPlan) -> dict:
+    return {"id": walking_plan.id, "walking_plan_data": walking_plan.walking_plan_data}
+
 
 @router.post("", response_model=UserWalkingPlanResponseSchema, status_code=201)
-def create_walking_plan(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+async def create_walking_plan(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     payload: WalkingPlanRequestSchema,
-    walking_plan_crud: Annotated[UserWalkingPlanCRUD, Depends()],
+    walking_plan_crud: Annotated[AsyncUserWalkingPlanCRUD, Depends(get_async_walking_plan_crud)],
 ):
-    existing_plan = walking_plan_crud.get_walking_plan_by_user_id(user_data["user_id"])
+    existing_plan = await walking_plan_crud.get_walking_plan_by_user_id(user_data["user_id"])
 
     if existing_plan:
         raise HTTPException(status_code=400, detail="User walking plan already exists")
@@ -24,44 +32,62 @@ def create_walking_plan(
     new_walking_plan = UserWalkingPlan(
         user_id=user_data["user_id"], walking_plan_data=payload.walking_plan_data
     )
-    created_walking_plan = walking_plan_crud.create_walking_plan(new_walking_plan)
+    created_walking_plan = await walking_plan_crud.create_walking_plan(new_walking_plan)
+    await resource_cache.write(
+        CACHE_RESOURCE, user_data["user_id"], _walking_plan_response(created_walking_plan)
+    )
     return created_walking_plan
 
 
-@router.get("", response_model=UserWalkingPlanResponseSchema, status_code=200)
-def get_user_walking_plan(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    walking_plan_crud: Annotated[UserWalkingPlanCRUD, Depends()],
+@router.get(
+    "",
+    response_model=UserWalkingPlanResponseSchema,
+    status_code=200,
+    dependencies=[Depends(ETagged(CACHE_RESOURCE))],
+)
+async def get_user_walking_plan(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    walking_plan_crud: Annotated[AsyncUserWalkingPlanCRUD, Depends(get_async_walking_plan_crud)],
 ):
-    walking_plan = walking_plan_crud.get_walking_plan_by_user_id(user_data["user_id"])
+    async def load_walking_plan() -> dict | None:
+        walking_plan = await walking_plan_crud.get_walking_plan_by_user_id(user_data["user_id"])
+        return _walking_plan_response(walking_plan) if walking_plan else None
+
+    walking_plan = await resource_cache.get_or_load(
+        CACHE_RESOURCE, user_data["user_id"], load_walking_plan
+    )
     if not walking_plan:
         raise HTTPException(status_code=404, detail="User walking plan not found")
     return walking_plan
 
 
 @router.put("", response_model=UserWalkingPlanResponseSchema, status_code=200)
-def update_walking_plan(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+async def update_walking_plan(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
     payload: WalkingPlanRequestSchema,
-    walking_plan_crud: Annotated[UserWalkingPlanCRUD, Depends()],
+    walking_plan_crud: Annotated[AsyncUserWalkingPlanCRUD, Depends(get_async_walking_plan_crud)],
 ):
-    user_walking_plan = walking_plan_crud.get_walking_plan_by_user_id(user_data["user_id"])
+    user_walking_plan = await walking_plan_crud.get_walking_plan_by_user_id(user_data["user_id"])
 
     if not user_walking_plan:
         raise HTTPException(status_code=404, detail="User walking plan not found")
 
-    updated_walking_plan = walking_plan_crud.update_walking_plan(user_walking_plan, payload)
+    updated_walking_plan = await walking_plan_crud.update_walking_plan(user_walking_plan, payload)
+    await resource_cache.write(
+        CACHE_RESOURCE, user_data["user_id"], _walking_plan_response(updated_walking_plan)
+    )
     return updated_walking_plan
 
 
 @router.delete("", status_code=204)
-def delete_walking_plan(
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
-    walking_plan_crud: Annotated[UserWalkingPlanCRUD, Depends()],
+async def delete_walking_plan(
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    walking_plan_crud: Annotated[AsyncUserWalkingPlanCRUD, Depends(get_async_walking_plan_crud)],
 ):
-    user_walking_plan = walking_plan_crud.get_walking_plan_by_user_id(user_data["user_id"])
+    user_walking_plan = await walking_plan_crud.get_walking_plan_by_user_id(user_data["user_id"])
 
     if not user_walking_plan:
         raise HTTPException(status_code=404, detail="User walking plan not found")
 
-    walking_plan_crud.delete_walking_plan(user_walking_plan)
+    await walking_plan_crud.delete_walking_plan(user_walking_plan)
+    await resource_cache.invalidate(CACHE_RESOURCE, user_data["user_id"])
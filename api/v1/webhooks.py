@@ -1,34 +1,84 @@
+from typing import Any
+
+import orjson
 from fastapi import APIRouter, Request
-from fastapi.background import BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
-from service.webhook_service import handle_sendgrid_webhook
-from utils.base_config import logger
+from service.webhook_writer import webhook_writer
+from utils.base_config import config, logger
 from utils.webhook_utils import is_valid_webhook_signature
 
 router = APIRouter(prefix="/webhook", tags=["Webhooks"])
 
 
+class PayloadTooLarge(Exception):
+    pass
+
+
+async def _read_body(request: Request, max_bytes: int) -> bytes:
+    """
+    Read the request body, giving up as soon as it is known to exceed ``max_bytes``.
+
+    Raises:
+        PayloadTooLarge: If Content-Length or the bytes received so far exceed the limit.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise PayloadTooLarge()
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise PayloadTooLarge()
+    return bytes(body)
+
+
+def _parse_events(raw_payload: bytes) -> list[dict[str, Any]] | None:
+    """Parse the body once, returning None unless it is a non-empty list of events."""
+    try:
+        body = orjson.loads(raw_payload)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(body, list) or not body or not isinstance(body[0], dict):
+        return None
+    return body
+
+
 @router.post("/sendgrid", response_class=JSONResponse, status_code=200)
-async def handle_sendgrid_events_webhook(request: Request, background_job: BackgroundTasks):
+async def handle_sendgrid_events_webhook(request: Request):
     headers = request.headers
     webhook_signature = headers.get("x-twilio-email-event-webhook-signature")
     webhook_timestamp = headers.get("x-twilio-email-event-webhook-timestamp")
-    raw_payload = await request.body()
-    body = await request.json()
-    webhook_type = body[0].get("webhook_type", None)
 
     if not webhook_signature or not webhook_timestamp:
         return JSONResponse(content={"message": "Invalid request"}, status_code=400)
 
-    if not is_valid_webhook_signature(
-        raw_payload.decode("utf-8"), str(webhook_signature), str(webhook_timestamp)
+    try:
+        raw_payload = await _read_body(request, config.sendgrid_webhook_max_payload_bytes)
+    except PayloadTooLarge:
+        return JSONResponse(content={"message": "Payload too large"}, status_code=413)
+
+    # ECDSA verification is CPU bound, keep it off the event loop. Bytes that aren't
+    # UTF-8 can't match SendGrid's signature, so replacing them is safe.
+    if not await run_in_threadpool(
+        is_valid_webhook_signature,
+        raw_payload.decode("utf-8", errors="replace"),
+        str(webhook_signature),
+        str(webhook_timestamp),
     ):
         return JSONResponse(content={"message": "Invalid signature"}, status_code=400)
 
-    if webhook_type:
-        background_job.add_task(handle_sendgrid_webhook, body, webhook_type)
+    body = _parse_events(raw_payload)
+    if body is None:
+        return JSONResponse(content={"message": "Invalid request"}, status_code=400)
 
-    else:
+    webhook_type = body[0].get("webhook_type", None)
+    if not webhook_type:
         logger.error("Missing custom args ( webhook_type ) in payload.")
         return JSONResponse(content={"message": "OK"}, status_code=200)
+
+    # SendGrid retries non-2xx deliveries, and the writes are idempotent
+    if not webhook_writer.submit(webhook_type, body):
+        return JSONResponse(content={"message": "Service busy"}, status_code=503)
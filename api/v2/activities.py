@@ -1,9 +1,10 @@
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 
-from auth.auth_bearer import get_authenticated_user_data
+from auth.auth_bearer import get_authenticated_user_data_async
+from crud.outbox_crud import AsyncOutboxCRUD, get_async_outbox_crud
 from schemas.activity import UserActivityRequestSchema
 from service.activity_service import load_activities_data_in_sns
 
@@ -12,9 +13,14 @@ router = APIRouter(prefix="/activities", tags=["activities"])
 
 @router.post("", status_code=201, response_class=JSONResponse)
 async def save_activity(
-    background_task: BackgroundTasks,
     activity_payload: UserActivityRequestSchema,
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    outbox_crud: Annotated[AsyncOutboxCRUD, Depends(get_async_outbox_crud)],
 ):
-    background_task.add_task(load_activities_data_in_sns, activity_payload, user_data["user_id"])
+    if not await load_activities_data_in_sns(activity_payload, user_data["user_id"], outbox_crud):
+        raise HTTPException(
+            status_code=503,
+            detail="Activity queue is full, please retry later",
+            headers={"Retry-After": "1"},
+        )
     return {"message": "Success"}
@@ -1,13 +1,22 @@
-import calendar
-from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from pydantic import ValidationError
 from starlette.responses import JSONResponse
 
-from auth.auth_bearer import get_authenticated_user_data
+from auth.auth_bearer import get_authenticated_user_data_async
+from crud.outbox_crud import AsyncOutboxCRUD, get_async_outbox_crud
+from schemas.activity import UserActivityRequestSchema
 from schemas.migrations_schema import ActivitiesMigrationsRequestSchema
-from service.migrations_service import publish_bulk_activities_data_to_sns
+from service.migrations_service import (
+    MonthlyActivityBatcher,
+    activities_within_month,
+    publish_bulk_activities_data_to_sns,
+    publish_month_of_activities,
+    queue_bulk_activities_data_in_outbox,
+)
+from utils.base_config import config as settings
+from utils.ndjson_utils import LineTooLong, iter_ndjson_lines
 
 router = APIRouter(prefix="/migrations", tags=["migrations"])
 
@@ -16,31 +25,69 @@ router = APIRouter(prefix="/migrations", tags=["migrations"])
 async def save_bulk_activities(
     background_task: BackgroundTasks,
     data: ActivitiesMigrationsRequestSchema,
-    user_data: Annotated[dict, Depends(get_authenticated_user_data)],
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    outbox_crud: Annotated[AsyncOutboxCRUD, Depends(get_async_outbox_crud)],
 ):
-    month_start = datetime.fromtimestamp(data.month).replace(
-        day=1, hour=0, minute=0, second=0, microsecond=0
-    )
-    month_end = month_start.replace(
-        day=calendar.monthrange(month_start.year, month_start.month)[1],
-        hour=23,
-        minute=59,
-        second=59,
-        microsecond=999999,
+    if not activities_within_month(data):
+        raise HTTPException(status_code=400, detail="Some activities are out of the month range")
+
+    if settings.activity_outbox_enabled:
+        await queue_bulk_activities_data_in_outbox(data, user_data["user_id"], outbox_crud)
+    else:
+        background_task.add_task(publish_bulk_activities_data_to_sns, data, user_data["user_id"])
+
+    return {"message": "Success"}
+
+
+def _rejected_line(line_number: int, reason: str, published_batches: int) -> JSONResponse:
+    return JSONResponse(
+        content={
+            "detail": f"Activity on line {line_number} is {reason}",
+            "published_batches": published_batches,
+        },
+        status_code=400,
     )
 
-    unix_month_start = int(month_start.timestamp())
-    unix_month_end = int(month_end.timestamp())
 
-    out_of_range_activities = [
-        activity
-        for activity in data.activities
-        if not unix_month_start <= activity.date <= unix_month_end
-    ]
+@router.post("/activities/stream", status_code=201, response_class=JSONResponse)
+async def stream_bulk_activities(
+    request: Request,
+    user_data: Annotated[dict, Depends(get_authenticated_user_data_async)],
+    outbox_crud: Annotated[AsyncOutboxCRUD, Depends(get_async_outbox_crud)],
+):
+    """
+    Migrate any range of activities sent as NDJSON, one activity per line.
 
-    if out_of_range_activities:
-        raise HTTPException(status_code=400, detail="Some activities are out of the month range")
+    Lines are validated as they arrive and grouped by UTC month, and each month is sent
+    on as soon as it's complete, so memory doesn't grow with the upload. Sending the
+    activities ordered by date gives one payload per month. If a line is invalid the
+    upload stops there; months sent before it stay sent and are counted in the error.
+    """
+    user_id = user_data["user_id"]
+    batcher = MonthlyActivityBatcher(settings.activity_migration_stream_open_months)
+    activities = batches = 0
 
-    background_task.add_task(publish_bulk_activities_data_to_sns, data, user_data["user_id"])
+    async def publish(closed: list[ActivitiesMigrationsRequestSchema]) -> None:
+        nonlocal batches
+        for batch in closed:
+            await publish_month_of_activities(batch, user_id, outbox_crud)
+            batches += 1
 
-    return {"message": "Success"}
+    lines = iter_ndjson_lines(request.stream(), settings.activity_migration_stream_max_line_bytes)
+    try:
+        async for line_number, line in lines:
+            try:
+                activity = UserActivityRequestSchema.model_validate_json(line)
+                closed = batcher.add(activity)
+            except (ValidationError, ValueError):
+                return _rejected_line(line_number, "invalid", batches)
+            activities += 1
+            await publish(closed)
+    except LineTooLong as e:
+        return _rejected_line(e.args[0], "too long", batches)
+
+    await publish(batcher.flush())
+    if not activities:
+        raise HTTPException(status_code=400, detail="No activities sent")
+
+    return {"message": "Success", "activities": activities, "batches": batches}
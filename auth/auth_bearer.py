@@ -4,16 +4,78 @@ from typing import Annotated, Any
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from crud.user_crud import UserCRUD
+from crud.user_crud import AsyncUserCRUD, UserCRUD, get_async_user_crud
+from service.async_redis_service import AsyncRedisService, get_async_redis_service
+from service.auth_cache_service import local_auth_cache
 from service.open_telemetry_service import STEP_JWT_VALIDATION, auth_step_span
 from service.redis_service import RedisService, get_redis_service
 from utils.base_config import logger
 
-from .jwt_handler import decode_jwt
+from .jwt_handler import decode_jwt, get_token_expiry
 
 security = HTTPBearer()
 
 
+def _check_local_auth_cache(token_hash: str, span) -> dict[str, Any] | None:
+    local_auth_data = local_auth_cache.get(token_hash)
+    span.set_attribute("auth.local_cache_hit", local_auth_data is not None)
+
+    if local_auth_data:
+        span.set_attribute("auth.cache_hit", True)
+        if not local_auth_data["valid"]:
+            raise HTTPException(status_code=403, detail="Token is not valid")
+
+    return local_auth_data
+
+
+def _check_cached_auth_data(
+    token: str, token_hash: str, cached_auth_data: dict[str, Any] | None, span
+) -> dict[str, Any] | None:
+    span.set_attribute("auth.cache_hit", cached_auth_data is not None)
+
+    if cached_auth_data:
+        logger.info(f"Cache hit for auth - user_id: {cached_auth_data['user_id']}")
+        local_auth_cache.set(
+            token_hash,
+            cached_auth_data["user_id"],
+            get_token_expiry(token),
+            valid=cached_auth_data["valid"],
+        )
+        if not cached_auth_data["valid"]:
+            raise HTTPException(status_code=403, detail="Token is not valid")
+
+    return cached_auth_data
+
+
+def _decode_user_id(token: str) -> tuple[str, float]:
+    decoded_data = decode_jwt(token)
+    user_id = decoded_data.get("user_id")
+    if not user_id:
+        raise HTTPException(status_code=403, detail="Token is not valid")
+
+    return user_id, decoded_data.get("exp")
+
+
+def _get_user_token(user_crud: UserCRUD, user_id: str) -> str:
+    user = user_crud.get_user_by_id(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.token:
+        raise HTTPException(status_code=403, detail="Token is not valid")
+
+    return user.token.token
+
+
+async def _get_user_token_async(user_crud: AsyncUserCRUD, user_id: str) -> str:
+    user = await user_crud.get_user_with_token(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.token:
+        raise HTTPException(status_code=403, detail="Token is not valid")
+
+    return user.token
+
+
 def get_authenticated_user_data(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     user_crud: Annotated[UserCRUD, Depends()],
@@ -22,6 +84,8 @@ def get_authenticated_user_data(
     """
     Validate a JWT-based user token against cache and database.
 
+    Lookups go through the in-process auth cache first, then Redis, then the database.
+
     Args:
         token: Authorization token extracted from request.
         user_crud: Data access object for user retrieval.
@@ -35,50 +99,95 @@ def get_authenticated_user_data(
     """
     with auth_step_span(STEP_JWT_VALIDATION) as span:
         token_hash = redis_service.hash_token(token.credentials)
-        cached_auth_data = redis_service.get_auth_cache(token_hash)
-        span.set_attribute("auth.cache_hit", cached_auth_data is not None)
+        local_auth_data = _check_local_auth_cache(token_hash, span)
+        if local_auth_data:
+            return local_auth_data
 
+        cached_auth_data = _check_cached_auth_data(
+            token.credentials, token_hash, redis_service.get_auth_cache(token_hash), span
+        )
         if cached_auth_data:
-            logger.info(f"Cache hit for auth - user_id: {cached_auth_data['user_id']}")
-            if not cached_auth_data["valid"]:
-                raise HTTPException(status_code=403, detail="Token is not valid")
-
             return cached_auth_data
 
-        decoded_data = decode_jwt(token.credentials)
-        user_id = decoded_data.get("user_id")
-        if not user_id:
-            raise HTTPException(status_code=403, detail="Token is not valid")
+        user_id, expires_in = _decode_user_id(token.credentials)
 
         # User data not in cache, fetch from database
-        user = user_crud.get_user_by_id(user_id)
+        user_token_hash = redis_service.hash_token(_get_user_token(user_crud, user_id))
+        cache_ttl = max(0, int(expires_in - datetime.now(timezone.utc).timestamp()))  # noqa: UP017 Not supported in Python 3.10
+
+        # Ensure token match
+        if token_hash != user_token_hash:
+            logger.warning(f"Token mismatch for user_id={user_id}")
+            _ = redis_service.set_auth_cache(token_hash, user_id, cache_ttl, valid=False)
+            local_auth_cache.set(token_hash, user_id, expires_in, valid=False)
+            raise HTTPException(status_code=403, detail="Token is not valid")
 
-        if user:
-            user_token = user.token
+        # Cache valid token
+        auth_cached = redis_service.set_auth_cache(user_token_hash, user_id, cache_ttl)
+        local_auth_cache.set(user_token_hash, user_id, expires_in)
 
-            if user_token:
-                user_token_hash = redis_service.hash_token(user_token.token)
-                expires_in = decoded_data.get("exp")
-                cache_ttl = max(0, int(expires_in - datetime.now(timezone.utc).timestamp()))  # noqa: UP017 Not supported in Python 3.10
+        if auth_cached:
+            logger.debug(f"Auth cache set for user: {user_id}")
+        else:
+            logger.debug(f"Auth cache unable to set for user: {user_id}")
 
-                # Ensure token match
-                if token_hash != user_token_hash:
-                    logger.warning(f"Token mismatch for user_id={user_id}")
-                    _ = redis_service.set_auth_cache(token_hash, user_id, cache_ttl, valid=False)
-                    raise HTTPException(status_code=403, detail="Token is not valid")
+        return {"user_id": user_id, "valid": True}
 
-                # Cache valid token
-                auth_cached = redis_service.set_auth_cache(user_token_hash, user_id, cache_ttl)
 
-                if auth_cached:
-                    logger.debug(f"Auth cache set for user: {user_id}")
-                else:
-                    logger.debug(f"Auth cache unable to set for user: {user_id}")
+async def get_authenticated_user_data_async(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    user_crud: Annotated[AsyncUserCRUD, Depends(get_async_user_crud)],
+    redis_service: AsyncRedisService = Depends(get_async_redis_service),  # noqa: B008
+) -> dict[str, Any]:
+    """
+    Async variant of get_authenticated_user_data for async routes.
 
-                return {"user_id": user_id, "valid": True}
+    Cache and database lookups use the asyncio Redis client and the async session, so
+    the dependency never borrows a threadpool worker.
+
+    Args:
+        token: Authorization token extracted from request.
+        user_crud: Async data access object for user retrieval.
+        redis_service: Async service for caching token validation results.
 
-            else:
-                raise HTTPException(status_code=403, detail="Token is not valid")
+    Returns:
+        A dict containing authenticated user information.
 
+    Raises:
+        HTTPException: If the token is invalid, expired, or the user is not found.
+    """
+    with auth_step_span(STEP_JWT_VALIDATION) as span:
+        token_hash = redis_service.hash_token(token.credentials)
+        local_auth_data = _check_local_auth_cache(token_hash, span)
+        if local_auth_data:
+            return local_auth_data
+
+        cached_auth_data = _check_cached_auth_data(
+            token.credentials, token_hash, await redis_service.get_auth_cache(token_hash), span
+        )
+        if cached_auth_data:
+            return cached_auth_data
+
+        user_id, expires_in = _decode_user_id(token.credentials)
+
+        # User data not in cache, fetch from database
+        user_token_hash = redis_service.hash_token(await _get_user_token_async(user_crud, user_id))
+        cache_ttl = max(0, int(expires_in - datetime.now(timezone.utc).timestamp()))  # noqa: UP017 Not supported in Python 3.10
+
+        # Ensure token match
+        if token_hash != user_token_hash:
+            logger.warning(f"Token mismatch for user_id={user_id}")
+            _ = await redis_service.set_auth_cache(token_hash, user_id, cache_ttl, valid=False)
+            local_auth_cache.set(token_hash, user_id, expires_in, valid=False)
+            raise HTTPException(status_code=403, detail="Token is not valid")
+
+        # Cache valid token
+        auth_cached = await redis_service.set_auth_cache(user_token_hash, user_id, cache_ttl)
+        local_auth_cache.set(user_token_hash, user_id, expires_in)
+
+        if auth_cached:
+            logger.debug(f"Auth cache set for user: {user_id}")
         else:
-            raise HTTPException(status_code=404, detail="User not found")
+            logger.debug(f"Auth cache unable to set for user: {user_id}")
+
+        return {"user_id": user_id, "valid": True}
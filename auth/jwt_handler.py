@@ -41,3 +41,22 @@ def decode_jwt(token: str) -> dict:
     except Exception as err:
         logger.error(f"Error while decoding token: {err!s}")
         raise HTTPException(status_code=500, detail="Something went wrong") from err
+
+
+def get_token_expiry(token: str) -> float | None:
+    """
+    Read the exp claim of a JWT without verifying its signature.
+
+    Only use this for tokens that have already been validated, e.g. ones found in the
+    auth cache.
+
+    Args:
+        token (str): The JSON Web Token (JWT) string.
+
+    Returns:
+        float | None: The exp claim as a unix timestamp, or None if it cannot be read.
+    """
+    try:
+        return jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.InvalidTokenError:
+        return None
@@ -1,4 +1,11 @@
+from collections.abc import Iterable, Iterator
+from typing import Any
+from uuid import UUID
+
 from fastapi import HTTPException
+from psycopg.types.json import Json
+from sqlalchemy import Select, select, text, tuple_
+from sqlalchemy.orm import Session
 
 from db.session import get_db_context_session
 from models.activity import Activity
@@ -31,41 +38,207 @@ def create_activity(activity_payload: UserActivityRequestSchema, user_id: str) -
     return activity
 
 
-def create_bulk_activities(activities: list[UserActivityRequestSchema], user_id: str) -> None:
-    activities_list = []
+STAGING_COLUMNS = (
+    "date",
+    "user_postcode",
+    "user_age_range",
+    "brisk_minutes",
+    "walking_minutes",
+    "steps",
+    "rewards",
+)
+
+create_staging_sql = text(
+    """
+    CREATE TEMPORARY TABLE activities_staging (
+        position bigint NOT NULL,
+        date bigint NOT NULL,
+        user_postcode varchar(10) NOT NULL,
+        user_age_range varchar(50) NOT NULL,
+        brisk_minutes integer NOT NULL,
+        walking_minutes integer NOT NULL,
+        steps integer NOT NULL,
+        rewards json[]
+    ) ON COMMIT DROP
+    """
+)
 
-    for activity_payload in activities:
-        activity = Activity(
-            date=activity_payload.date,
-            rewards=activity_payload.rewards,
-            user_postcode=activity_payload.user_postcode,
-            user_age_range=activity_payload.user_age_range,
-            brisk_minutes=activity_payload.activity.brisk_minutes,
-            walking_minutes=activity_payload.activity.walking_minutes,
-            steps=activity_payload.activity.steps,
-            user_id=user_id,
+# The last row sent for a date wins, and rows come out ordered by date so consecutive
+# inserts land in the same monthly partition.
+DEDUPED_STAGING_SQL = """
+    SELECT DISTINCT ON (date) *
+    FROM activities_staging
+    ORDER BY date, position DESC
+"""
+
+merge_update_sql = text(
+    f"""
+    WITH staged AS ({DEDUPED_STAGING_SQL}),
+    updated AS (
+        UPDATE activities a SET
+            user_postcode = s.user_postcode,
+            user_age_range = s.user_age_range,
+            brisk_minutes = s.brisk_minutes,
+            walking_minutes = s.walking_minutes,
+            steps = s.steps,
+            rewards = s.rewards
+        FROM staged s
+        WHERE a.user_id = :user_id AND a.date = s.date
+        RETURNING a.date
+    )
+    SELECT count(DISTINCT date) FROM updated
+    """
+)
+
+merge_insert_sql = text(
+    f"""
+    WITH staged AS ({DEDUPED_STAGING_SQL}),
+    inserted AS (
+        INSERT INTO activities
+            (id, user_id, date, user_postcode, user_age_range,
+             brisk_minutes, walking_minutes, steps, rewards)
+        SELECT gen_random_uuid(), :user_id, s.date, s.user_postcode, s.user_age_range,
+            s.brisk_minutes, s.walking_minutes, s.steps, s.rewards
+        FROM staged s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM activities a WHERE a.user_id = :user_id AND a.date = s.date
         )
-        activities_list.append(activity)
+        RETURNING 1
+    )
+    SELECT count(*) FROM inserted
+    """
+)
+
+
+def _copy_to_staging(db: Session, activities: Iterable[UserActivityRequestSchema]) -> int:
+    cursor = db.connection().connection.driver_connection.cursor()
+    copy_sql = f"COPY activities_staging (position, {', '.join(STAGING_COLUMNS)}) FROM STDIN"
+    rows = 0
+    with cursor.copy(copy_sql) as copy:
+        copy.set_types(["int8", "int8", "varchar", "varchar", "int4", "int4", "int4", "json[]"])
+        for position, activity in enumerate(activities):
+            copy.write_row(
+                (
+                    position,
+                    activity.date,
+                    activity.user_postcode,
+                    activity.user_age_range,
+                    activity.activity.brisk_minutes,
+                    activity.activity.walking_minutes,
+                    activity.activity.steps,
+                    [Json(reward) for reward in activity.rewards]
+                    if activity.rewards is not None
+                    else None,
+                )
+            )
+            rows += 1
+    return rows
+
+
+def merge_bulk_activities(
+    db: Session, activities: Iterable[UserActivityRequestSchema], user_id: str
+) -> dict[str, int]:
+    """
+    Merge a user's activities into ``activities`` in the session's transaction.
+
+    Rows are streamed with COPY into a temporary staging table and merged from there
+    with one UPDATE and one INSERT, keyed on ``(user_id, date)``. Postgres routes each
+    inserted row to its monthly partition, or to the default partition until the
+    partition manager has created it. Merges for the same user are serialised with an
+    advisory lock, since ``activities`` has no unique constraint to resolve races with.
+    """
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtextextended(:user_id, 0))"),
+        {"user_id": str(user_id)},
+    )
+    db.execute(create_staging_sql)
+    updated = inserted = 0
+    if _copy_to_staging(db, activities):
+        updated = db.scalar(merge_update_sql, {"user_id": user_id})
+        inserted = db.scalar(merge_insert_sql, {"user_id": user_id})
+    db.execute(text("DROP TABLE activities_staging"))
+    return {"inserted": inserted, "updated": updated}
+
 
+def upsert_bulk_activities(
+    activities: Iterable[UserActivityRequestSchema], user_id: str
+) -> dict[str, int]:
+    """
+    Write a user's activities in one transaction, updating the ones already stored.
+
+    :param activities: activities to write, any number of months of them
+    :param user_id: user id
+    :return: the number of activities inserted and updated
+    """
     with get_db_context_session() as db:
         try:
-            db.bulk_save_objects(activities_list)
+            counts = merge_bulk_activities(db, activities, user_id)
             db.commit()
         except Exception as e:
             db.rollback()
-            logger.error("Error while adding bulk activities: ", str(e))
+            logger.error(f"Error while upserting bulk activities: {e}")
             raise HTTPException(status_code=500, detail="something went wrong")  # noqa: B904
 
+    return counts
+
+
+ACTIVITY_RESPONSE_COLUMNS = (
+    Activity.id,
+    Activity.date,
+    Activity.user_postcode,
+    Activity.user_age_range,
+    Activity.brisk_minutes,
+    Activity.walking_minutes,
+    Activity.steps,
+    Activity.rewards,
+    Activity.user_id,
+)
+
+
+def _select_activities(user_id, filters, after: tuple[int, UUID] | None = None) -> Select:
+    """
+    Build a keyset-ordered select of the activity response columns.
+
+    ``after`` is the ``(date, id)`` of the last row already returned. The plain
+    ``date >=`` bound is repeated next to the row comparison so Postgres can still
+    prune the ``activities`` RANGE (date) partitions that lie before the cursor.
+    """
+    query = select(*ACTIVITY_RESPONSE_COLUMNS).where(Activity.user_id == user_id)
 
-def get_activities_by_filters(user_id, filters) -> [list[Activity]]:
+    if "date" in filters:
+        query = query.where(Activity.date == filters["date"])
+    if "start_date" in filters:
+        query = query.where(Activity.date >= filters["start_date"])
+    if "end_date" in filters:
+        query = query.where(Activity.date <= filters["end_date"])
+    if after is not None:
+        query = query.where(
+            Activity.date >= after[0], tuple_(Activity.date, Activity.id) > tuple_(*after)
+        )
+
+    return query.order_by(Activity.date, Activity.id)
+
+
+def get_activities_page(
+    user_id, filters, limit: int, after: tuple[int, UUID] | None = None
+) -> list[dict[str, Any]]:
+    """Return up to ``limit`` activities after the ``(date, id)`` cursor as plain dicts."""
     with get_db_context_session() as db:
-        query = db.query(Activity).filter_by(user_id=user_id)
+        rows = db.execute(_select_activities(user_id, filters, after).limit(limit)).mappings()
+        return [dict(row) for row in rows]
+
 
-        if "date" in filters:
-            query = query.filter(Activity.date == filters["date"])
-        if "start_date" in filters:
-            query = query.filter(Activity.date >= filters["start_date"])
-        if "end_date" in filters:
-            query = query.filter(Activity.date <= filters["end_date"])
+def stream_activities(user_id, filters, chunk_size: int = 500) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yield the matching activities in ``(date, id)`` order, ``chunk_size`` rows at a time.
 
-        return query.all()
+    Rows come from a server-side cursor and are never turned into ORM objects, so memory
+    stays bounded by ``chunk_size`` whatever the size of the range. The session stays
+    open until the iterator is exhausted or closed.
+    """
+    with get_db_context_session() as db:
+        result = db.execute(
+            _select_activities(user_id, filters).execution_options(yield_per=chunk_size)
+        ).mappings()
+        for partition in result.partitions():
+            yield [dict(row) for row in partition]
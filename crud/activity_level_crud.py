@@ -1,12 +1,24 @@
 from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 
 from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db.session import get_db_session
+from db.session import get_async_db_session, get_db_session
 from models.activity_level import UserActivityLevel
 from schemas.activity_level import ActivityLevelRequestSchema
+from service.async_redis_service import AsyncRedisService
+from service.redis_service import RedisService
+
+ACTIVITY_LEVEL_RESPONSE_COLUMNS = (
+    UserActivityLevel.id,
+    UserActivityLevel.level,
+    UserActivityLevel.created_at,
+    UserActivityLevel.updated_at,
+)
 
 
 class UserActivityLevelCRUD:
@@ -50,6 +62,7 @@ class UserActivityLevelCRUD:
         self.db.add(new_activity_level)
         self.db.commit()
         self.db.refresh(new_activity_level)
+        RedisService.delete_user_profile_cache(user_id)
         return new_activity_level
 
     def update(
@@ -59,8 +72,79 @@ class UserActivityLevelCRUD:
         activity_level.level = payload.level
         self.db.commit()
         self.db.refresh(activity_level)
+        RedisService.delete_user_profile_cache(activity_level.user_id)
         return activity_level
 
     def delete(self, activity_level: UserActivityLevel) -> None:
+        user_id = activity_level.user_id
         self.db.delete(activity_level)
         self.db.commit()
+        RedisService.delete_user_profile_cache(user_id)
+
+
+class AsyncUserActivityLevelCRUD:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_latest_by_user(self, user_id: UUID) -> UserActivityLevel | None:
+        return await self.db.scalar(
+            select(UserActivityLevel)
+            .where(UserActivityLevel.user_id == user_id)
+            .order_by(UserActivityLevel.created_at.desc())
+            .limit(1)
+        )
+
+    async def get_by_id(self, user_id: UUID, activity_level_id: UUID) -> UserActivityLevel | None:
+        return await self.db.scalar(
+            select(UserActivityLevel)
+            .where(
+                UserActivityLevel.user_id == user_id,
+                UserActivityLevel.id == activity_level_id,
+            )
+            .limit(1)
+        )
+
+    async def get_all_by_user(self, user_id: UUID) -> list[dict[str, Any]]:
+        """Return the user's activity levels as response-shaped dicts, newest first."""
+        rows = await self.db.execute(
+            select(*ACTIVITY_LEVEL_RESPONSE_COLUMNS)
+            .where(UserActivityLevel.user_id == user_id)
+            .order_by(UserActivityLevel.created_at.desc())
+        )
+        return [dict(row) for row in rows.mappings()]
+
+    async def create(self, user_id: UUID, payload: ActivityLevelRequestSchema) -> UserActivityLevel:
+        current_timestamp = int(datetime.now(timezone.utc).timestamp())  # noqa: UP017 Not supported in Python 3.10
+        new_activity_level = UserActivityLevel(
+            user_id=user_id,
+            level=payload.level,
+            created_at=current_timestamp,
+            updated_at=current_timestamp,
+        )
+        self.db.add(new_activity_level)
+        await self.db.commit()
+        await self.db.refresh(new_activity_level)
+        await AsyncRedisService.delete_user_profile_cache(user_id)
+        return new_activity_level
+
+    async def update(
+        self, activity_level: UserActivityLevel, payload: ActivityLevelRequestSchema
+    ) -> UserActivityLevel | None:
+        activity_level.updated_at = int(datetime.now(timezone.utc).timestamp())  # noqa: UP017 Not supported in Python 3.10
+        activity_level.level = payload.level
+        await self.db.commit()
+        await self.db.refresh(activity_level)
+        await AsyncRedisService.delete_user_profile_cache(activity_level.user_id)
+        return activity_level
+
+    async def delete(self, activity_level: UserActivityLevel) -> None:
+        user_id = activity_level.user_id
+        await self.db.delete(activity_level)
+        await self.db.commit()
+        await AsyncRedisService.delete_user_profile_cache(user_id)
+
+
+async def get_async_activity_level_crud(
+    db: AsyncSession = Depends(get_async_db_session),  # noqa: B008
+) -> AsyncUserActivityLevelCRUD:
+    return AsyncUserActivityLevelCRUD(db)
@@ -0,0 +1,76 @@
+from datetime import date
+from typing import Any, Literal
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import get_async_db_session
+from models.activity_rollup import (
+    UserActivityDailyRollup,
+    UserActivityMonthlyRollup,
+    UserActivityWeeklyRollup,
+)
+
+Granularity = Literal["day", "week", "month"]
+
+ROLLUP_MODELS = {
+    "day": UserActivityDailyRollup,
+    "week": UserActivityWeeklyRollup,
+    "month": UserActivityMonthlyRollup,
+}
+
+
+class AsyncActivityRollupCRUD:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_summary(
+        self, user_id: UUID, granularity: Granularity, start: date, end: date
+    ) -> list[dict[str, Any]]:
+        """
+        Return the user's activity totals per period, oldest first.
+
+        Args:
+            user_id (UUID): The user ID.
+            granularity (str): One of "day", "week" or "month".
+            start (date): First day of the range; the period containing it is included.
+            end (date): Last day of the range.
+        """
+        rows = await self.db.execute(_select_summary(user_id, granularity, start, end))
+        return [dict(row) for row in rows.mappings()]
+
+
+def _select_summary(user_id: UUID, granularity: Granularity, start: date, end: date) -> Select:
+    model = ROLLUP_MODELS[granularity]
+    return (
+        select(
+            model.period_start,
+            model.brisk_minutes,
+            model.walking_minutes,
+            model.steps,
+            model.activity_count,
+        )
+        .where(
+            model.user_id == user_id,
+            model.period_start >= period_start(start, granularity),
+            model.period_start <= end,
+        )
+        .order_by(model.period_start)
+    )
+
+
+def period_start(day: date, granularity: Granularity) -> date:
+    """Return the first day of the day, ISO week or month containing ``day``."""
+    if granularity == "week":
+        return date.fromordinal(day.toordinal() - day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+async def get_async_activity_rollup_crud(
+    db: AsyncSession = Depends(get_async_db_session),  # noqa: B008
+) -> AsyncActivityRollupCRUD:
+    return AsyncActivityRollupCRUD(db)
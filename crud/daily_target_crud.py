@@ -1,10 +1,20 @@
+from typing import Any
+
 from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db.session import get_db_session
+from db.session import get_async_db_session, get_db_session
 from models.daily_target import UserDailyTarget
 from schemas.daily_target import DailyTargetRequestSchema
 
+DAILY_TARGET_RESPONSE_COLUMNS = (
+    UserDailyTarget.id,
+    UserDailyTarget.date,
+    UserDailyTarget.daily_target,
+)
+
 
 class UserDailyTargetCRUD:
     def __init__(self, db: Session = Depends(get_db_session)) -> None:  # noqa: B008
@@ -59,3 +69,71 @@ class UserDailyTargetCRUD:
             .filter_by(user_id=user_id, date=data.date, daily_target=data.daily_target)
             .first()
         )
+
+
+class AsyncUserDailyTargetCRUD:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def create_daily_target(self, daily_target) -> UserDailyTarget:
+        self.db.add(daily_target)
+        await self.db.commit()
+        await self.db.refresh(daily_target)
+
+        return daily_target
+
+    async def get_daily_targets_by_filters(
+        self, user_id: str, filters: dict
+    ) -> list[dict[str, Any]]:
+        """Return the matching daily targets as response-shaped dicts."""
+        query = select(*DAILY_TARGET_RESPONSE_COLUMNS).where(UserDailyTarget.user_id == user_id)
+
+        if "date" in filters:
+            query = query.where(UserDailyTarget.date == filters["date"])
+        if "start_date" in filters:
+            query = query.where(UserDailyTarget.date >= filters["start_date"])
+        if "end_date" in filters:
+            query = query.where(UserDailyTarget.date <= filters["end_date"])
+        if "min_daily_target" in filters:
+            query = query.where(UserDailyTarget.daily_target >= filters["min_daily_target"])
+        if "max_daily_target" in filters:
+            query = query.where(UserDailyTarget.daily_target <= filters["max_daily_target"])
+
+        return [dict(row) for row in (await self.db.execute(query)).mappings()]
+
+    async def get_daily_targets_by_user_id(self, uuid: str) -> [list[UserDailyTarget]]:
+        return (
+            await self.db.scalars(select(UserDailyTarget).where(UserDailyTarget.user_id == uuid))
+        ).all()
+
+    async def update_daily_target(
+        self, daily_target: UserDailyTarget, payload: DailyTargetRequestSchema
+    ) -> UserDailyTarget:
+        daily_target.daily_target = payload.daily_target
+        daily_target.date = payload.date
+        await self.db.commit()
+        await self.db.refresh(daily_target)
+
+        return daily_target
+
+    async def delete_daily_target(self, daily_target: UserDailyTarget) -> None:
+        await self.db.delete(daily_target)
+        await self.db.commit()
+
+    async def get_user_daily_target_by_id(self, user_id, target_id) -> UserDailyTarget | None:
+        return await self.db.scalar(
+            select(UserDailyTarget).filter_by(user_id=user_id, id=target_id).limit(1)
+        )
+
+    async def get_user_target_by_payload_data(self, user_id, data):
+        return await self.db.scalar(
+            select(UserDailyTarget)
+            .filter_by(user_id=user_id, date=data.date, daily_target=data.daily_target)
+            .limit(1)
+        )
+
+
+async def get_async_daily_target_crud(
+    db: AsyncSession = Depends(get_async_db_session),  # noqa: B008
+) -> AsyncUserDailyTargetCRUD:
+    return AsyncUserDailyTargetCRUD(db)
@@ -1,12 +1,24 @@
 from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 
 from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db.session import get_db_session
+from db.session import get_async_db_session, get_db_session
 from models.motivation import UserMotivation
 from schemas.motivation import CreateUpdateUserMotivationRequest
+from service.async_redis_service import AsyncRedisService
+from service.redis_service import RedisService
+
+MOTIVATION_RESPONSE_COLUMNS = (
+    UserMotivation.id,
+    UserMotivation.user_id,
+    UserMotivation.created_at,
+    UserMotivation.goals,
+)
 
 
 class UserMotivationCRUD:
@@ -36,6 +48,7 @@ class UserMotivationCRUD:
         self.db.add(new_motivation)
         self.db.commit()
         self.db.refresh(new_motivation)
+        RedisService.delete_user_profile_cache(user_id)
         return new_motivation
 
     def update_motivation(
@@ -45,8 +58,66 @@ class UserMotivationCRUD:
         motivation.goals = [goal.model_dump() for goal in payload.goals]
         self.db.commit()
         self.db.refresh(motivation)
+        RedisService.delete_user_profile_cache(motivation.user_id)
         return motivation
 
     def delete_motivation(self, motivation: UserMotivation) -> None:
+        user_id = motivation.user_id
         self.db.delete(motivation)
         self.db.commit()
+        RedisService.delete_user_profile_cache(user_id)
+
+
+class AsyncUserMotivationCRUD:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_by_id(self, motivation_id: UUID) -> UserMotivation | None:
+        return await self.db.get(UserMotivation, motivation_id)
+
+    async def get_all_by_user(self, user_id: UUID) -> list[dict[str, Any]]:
+        """Return the user's motivations as response-shaped dicts, newest first."""
+        rows = await self.db.execute(
+            select(*MOTIVATION_RESPONSE_COLUMNS)
+            .where(UserMotivation.user_id == user_id)
+            .order_by(UserMotivation.created_at.desc())
+        )
+        return [dict(row) for row in rows.mappings()]
+
+    async def create_motivation(
+        self, user_id: UUID, payload: CreateUpdateUserMotivationRequest
+    ) -> UserMotivation:
+        current_timestamp = int(datetime.now(timezone.utc).timestamp())  # noqa: UP017 Not supported in Python 3.10
+        new_motivation = UserMotivation(
+            user_id=user_id,
+            created_at=current_timestamp,
+            updated_at=current_timestamp,
+            goals=[goal.model_dump() for goal in payload.goals],
+        )
+        self.db.add(new_motivation)
+        await self.db.commit()
+        await self.db.refresh(new_motivation)
+        await AsyncRedisService.delete_user_profile_cache(user_id)
+        return new_motivation
+
+    async def update_motivation(
+        self, motivation: UserMotivation, payload: CreateUpdateUserMotivationRequest
+    ) -> UserMotivation:
+        motivation.updated_at = int(datetime.now(timezone.utc).timestamp())  # noqa: UP017 Not supported in Python 3.10
+        motivation.goals = [goal.model_dump() for goal in payload.goals]
+        await self.db.commit()
+        await self.db.refresh(motivation)
+        await AsyncRedisService.delete_user_profile_cache(motivation.user_id)
+        return motivation
+
+    async def delete_motivation(self, motivation: UserMotivation) -> None:
+        user_id = motivation.user_id
+        await self.db.delete(motivation)
+        await self.db.commit()
+        await AsyncRedisService.delete_user_profile_cache(user_id)
+
+
+async def get_async_motivation_crud(
+    db: AsyncSession = Depends(get_async_db_session),  # noqa: B008
+) -> AsyncUserMotivationCRUD:
+    return AsyncUserMotivationCRUD(db)
@@ -0,0 +1,78 @@
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi import Depends
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from db.session import get_async_db_session
+from models.outbox import OutboxDestination, OutboxEvent
+
+
+def _now() -> int:
+    return int(datetime.now(timezone.utc).timestamp())  # noqa: UP017 Not supported in Python 3.10
+
+
+class AsyncOutboxCRUD:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def append(
+        self,
+        destination: OutboxDestination,
+        target: str,
+        record: dict[str, Any],
+        subject: str | None = None,
+    ) -> None:
+        """
+        Append a message to the outbox and commit it.
+
+        Args:
+            destination (OutboxDestination): Whether the message goes to SNS or SQS.
+            target (str): SNS topic arn or SQS queue url.
+            record (dict): Data to be sent.
+            subject (str, optional): SNS message subject.
+        """
+        now = _now()
+        self.db.add(
+            OutboxEvent(
+                destination=destination.value,
+                target=target,
+                subject=subject,
+                message=json.dumps(record),
+                attempts=0,
+                available_at=now,
+                created_at=now,
+            )
+        )
+        await self.db.commit()
+
+
+async def get_async_outbox_crud(
+    db: AsyncSession = Depends(get_async_db_session),  # noqa: B008
+) -> AsyncOutboxCRUD:
+    return AsyncOutboxCRUD(db)
+
+
+def claim_outbox_events(db: Session, limit: int) -> list[OutboxEvent]:
+    """
+    Lock up to ``limit`` due outbox events, oldest first. Dead-lettered events are
+    never claimed.
+
+    Rows locked by another relay are skipped, so several relays can drain the outbox
+    concurrently. The locks are held until the caller's transaction ends.
+    """
+    return db.scalars(
+        select(OutboxEvent)
+        .where(OutboxEvent.available_at <= _now(), OutboxEvent.dead_lettered_at.is_(None))
+        .order_by(OutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def delete_outbox_events(db: Session, event_ids: list[int]) -> None:
+    if event_ids:
+        db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(event_ids)))
@@ -1,8 +1,12 @@
 from fastapi import Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db.session import get_db_session
+from db.session import get_async_db_session, get_db_session
 from models import EmailPreference, User
+from service.async_redis_service import AsyncRedisService
+from service.redis_service import RedisService
 
 
 class SubscriptionCRUD:
@@ -34,12 +38,14 @@ class SubscriptionCRUD:
                 email_preference.is_active = True
                 self.db.commit()
                 self.db.refresh(email_preference)
+                RedisService.delete_user_profile_cache(email_preference.user_id)
 
         else:
             email_preference = EmailPreference(user_id=user_id, name=name)
             self.db.add(email_preference)
             self.db.commit()
             self.db.refresh(email_preference)
+            RedisService.delete_user_profile_cache(email_preference.user_id)
 
     def unsubscribe_email_preferences(self, user_id: str, name: str) -> None:
         """
@@ -66,6 +72,7 @@ class SubscriptionCRUD:
             email_preference.is_active = False
             self.db.commit()
             self.db.refresh(email_preference)
+            RedisService.delete_user_profile_cache(email_preference.user_id)
         else:
             raise HTTPException(
                 status_code=400,
@@ -102,8 +109,122 @@ class SubscriptionCRUD:
             email_preference.is_active = False
             self.db.commit()
             self.db.refresh(email_preference)
+            RedisService.delete_user_profile_cache(email_preference.user_id)
         else:
             raise HTTPException(
                 status_code=404,
                 detail=f"No email preference found with the name '{name}' for the user with email '{email}'",  # noqa: E501
             )
+
+
+class AsyncSubscriptionCRUD:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def _get_email_preference(self, user_id, name: str) -> EmailPreference | None:
+        return await self.db.scalar(
+            select(EmailPreference).filter_by(user_id=user_id, name=name).limit(1)
+        )
+
+    async def subscribe_email_preferences(self, user_id: str, name: str) -> None:
+        """
+        Subscribe a user to email preferences.
+
+        Args:
+            user_id (str): The user ID.
+            name (str): The email preference name.
+
+        Raises:
+            HTTPException: If the user is already subscribed to email preferences with the same name.
+        """  # noqa: E501
+        email_preference = await self._get_email_preference(user_id, name)
+
+        if email_preference:
+            if email_preference.is_active:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"User is already subscribed to email preferences with the name '{name}'",  # noqa: E501
+                )
+            else:
+                email_preference.is_active = True
+                await self.db.commit()
+                await self.db.refresh(email_preference)
+                await AsyncRedisService.delete_user_profile_cache(email_preference.user_id)
+
+        else:
+            email_preference = EmailPreference(user_id=user_id, name=name)
+            self.db.add(email_preference)
+            await self.db.commit()
+            await self.db.refresh(email_preference)
+            await AsyncRedisService.delete_user_profile_cache(email_preference.user_id)
+
+    async def unsubscribe_email_preferences(self, user_id: str, name: str) -> None:
+        """
+        Unsubscribe a user from email preferences.
+
+        Args:
+            user_id (str): The user ID.
+            name (str): The email preference name.
+
+        Raises:
+            HTTPException: If the user is not subscribed to email preferences.
+        """
+        email_preference = await self._get_email_preference(user_id, name)
+
+        if email_preference:
+            if not email_preference.is_active:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"User is already unsubscribed from email preferences with the name '{name}'",  # noqa: E501
+                )
+
+            email_preference.is_active = False
+            await self.db.commit()
+            await self.db.refresh(email_preference)
+            await AsyncRedisService.delete_user_profile_cache(email_preference.user_id)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=f"User is not subscribed to email preferences with the name '{name}'",
+            )
+
+    async def unsubscribe_by_email(self, email: str, name: str) -> None:
+        """
+        Unsubscribe a user from email preferences based on their email.
+
+        Args:
+            email (str): The user's email address.
+            name (str): The email preference name.
+
+        Raises:
+            HTTPException: If the user or email preference is not found.
+        """
+        user = await self.db.scalar(select(User).filter_by(email=email).limit(1))
+
+        if not user:
+            raise HTTPException(status_code=404, detail=f"No user found with email '{email}'")
+
+        email_preference = await self._get_email_preference(user.id, name)
+
+        if email_preference:
+            if not email_preference.is_active:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"User with email '{email}' is already unsubscribed from email preferences with the name '{name}'",  # noqa: E501
+                )
+
+            email_preference.is_active = False
+            await self.db.commit()
+            await self.db.refresh(email_preference)
+            await AsyncRedisService.delete_user_profile_cache(email_preference.user_id)
+        else:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No email preference found with the name '{name}' for the user with email '{email}'",  # noqa: E501
+            )
+
+
+async def get_async_subscription_crud(
+    db: AsyncSession = Depends(get_async_db_session),  # noqa: B008
+) -> AsyncSubscriptionCRUD:
+    return AsyncSubscriptionCRUD(db)
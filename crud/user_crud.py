@@ -1,8 +1,88 @@
 from fastapi import Depends
+from sqlalchemy import Row, Select, func, literal_column, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db.session import get_db_session
-from models.user import User
+from db.session import get_async_db_session, get_db_session
+from models.activity_level import UserActivityLevel
+from models.motivation import UserMotivation
+from models.user import EmailPreference, User, UserToken
+from service.async_redis_service import AsyncRedisService
+from service.redis_service import RedisService
+
+
+def _select_user_profile(uuid: str) -> Select:
+    """
+    Select everything the profile response needs in one statement: the user, their latest
+    motivation and activity level through LATERAL joins, and their email preferences
+    aggregated into a JSON array.
+    """
+    latest_motivation = (
+        select(UserMotivation.id, UserMotivation.created_at, UserMotivation.goals)
+        .where(UserMotivation.user_id == User.id)
+        .order_by(UserMotivation.created_at.desc())
+        .limit(1)
+        .lateral("latest_motivation")
+    )
+    latest_activity_level = (
+        select(
+            UserActivityLevel.id,
+            UserActivityLevel.level,
+            UserActivityLevel.created_at,
+            UserActivityLevel.updated_at,
+        )
+        .where(UserActivityLevel.user_id == User.id)
+        .order_by(UserActivityLevel.created_at.desc())
+        .limit(1)
+        .lateral("latest_activity_level")
+    )
+    email_preferences = (
+        select(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            "id",
+                            EmailPreference.id,
+                            "name",
+                            EmailPreference.name,
+                            "is_active",
+                            EmailPreference.is_active,
+                        ),
+                        EmailPreference.created_at,
+                    )
+                ),
+                literal_column("'[]'::json"),
+            )
+        )
+        .where(EmailPreference.user_id == User.id)
+        .scalar_subquery()
+    )
+
+    return (
+        select(
+            User.id,
+            User.first_name,
+            User.email,
+            User.date_of_birth,
+            User.gender,
+            User.postcode,
+            User.identity_level,
+            email_preferences.label("email_preferences"),
+            latest_motivation.c.id.label("motivation_id"),
+            latest_motivation.c.created_at.label("motivation_created_at"),
+            latest_motivation.c.goals.label("motivation_goals"),
+            latest_activity_level.c.id.label("activity_level_id"),
+            latest_activity_level.c.level.label("activity_level"),
+            latest_activity_level.c.created_at.label("activity_level_created_at"),
+            latest_activity_level.c.updated_at.label("activity_level_updated_at"),
+        )
+        .select_from(User)
+        .outerjoin(latest_motivation, true())
+        .outerjoin(latest_activity_level, true())
+        .where(User.id == uuid)
+    )
 
 
 class UserCRUD:
@@ -21,6 +101,10 @@ class UserCRUD:
     def get_user_by_sub(self, uuid: str) -> User | None:
         return self.db.query(User).filter(User.unique_id == uuid).first()
 
+    def get_user_profile(self, uuid: str) -> Row | None:
+        """Fetch the user with their latest motivation, activity level and email preferences."""
+        return self.db.execute(_select_user_profile(uuid)).first()
+
     def update_user(self, user: User) -> User | None:
         existing_user = self.db.query(User).filter(User.id == user.id).first()
         if existing_user:
@@ -31,6 +115,7 @@ class UserCRUD:
             existing_user.postcode = user.postcode
             self.db.commit()
             self.db.refresh(existing_user)
+            RedisService.delete_user_profile_cache(existing_user.id)
             return existing_user
         else:
             return None
@@ -40,6 +125,7 @@ class UserCRUD:
         if user_to_delete:
             self.db.delete(user_to_delete)
             self.db.commit()
+            RedisService.delete_user_profile_cache(uuid)
             return user_to_delete
         else:
             return None
@@ -50,3 +136,51 @@ class UserCRUD:
         if user_to_update:
             user_to_update.current_token = token
             self.db.commit()
+
+
+class AsyncUserCRUD:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def create_user(self, user: User) -> User:
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def get_user_by_id(self, uuid: str) -> User | None:
+        return await self.db.scalar(select(User).where(User.id == uuid).limit(1))
+
+    async def get_user_by_sub(self, uuid: str) -> User | None:
+        return await self.db.scalar(select(User).where(User.unique_id == uuid).limit(1))
+
+    async def get_user_with_token(self, uuid: str) -> Row | None:
+        """Fetch the user's id and current token (None if they have none) in one query."""
+        result = await self.db.execute(
+            select(User.id, UserToken.token)
+            .outerjoin(UserToken, UserToken.user_id == User.id)
+            .where(User.id == uuid)
+            .limit(1)
+        )
+        return result.first()
+
+    async def update_user(self, user: User) -> User | None:
+        existing_user = await self.get_user_by_id(user.id)
+        if existing_user:
+            existing_user.first_name = user.first_name
+            existing_user.email = user.email
+            existing_user.date_of_birth = user.date_of_birth
+            existing_user.gender = user.gender
+            existing_user.postcode = user.postcode
+            await self.db.commit()
+            await self.db.refresh(existing_user)
+            await AsyncRedisService.delete_user_profile_cache(existing_user.id)
+            return existing_user
+        else:
+            return None
+
+
+async def get_async_user_crud(
+    db: AsyncSession = Depends(get_async_db_session),  # noqa: B008
+) -> AsyncUserCRUD:
+    return AsyncUserCRUD(db)
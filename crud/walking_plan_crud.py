@@ -1,7 +1,9 @@
 from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db.session import get_db_session
+from db.session import get_async_db_session, get_db_session
 from models.walking_plan import UserWalkingPlan
 from schemas.walking_plan import WalkingPlanRequestSchema
 
@@ -32,3 +34,39 @@ class UserWalkingPlanCRUD:
     def delete_walking_plan(self, walking_plan: UserWalkingPlan) -> None:
         self.db.delete(walking_plan)
         self.db.commit()
+
+
+class AsyncUserWalkingPlanCRUD:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def create_walking_plan(self, walking_plan) -> UserWalkingPlan:
+        self.db.add(walking_plan)
+        await self.db.commit()
+        await self.db.refresh(walking_plan)
+
+        return walking_plan
+
+    async def get_walking_plan_by_user_id(self, uuid: str) -> UserWalkingPlan | None:
+        return await self.db.scalar(
+            select(UserWalkingPlan).where(UserWalkingPlan.user_id == uuid).limit(1)
+        )
+
+    async def update_walking_plan(
+        self, walking_plan: UserWalkingPlan, payload: WalkingPlanRequestSchema
+    ) -> UserWalkingPlan:
+        walking_plan.walking_plan_data = payload.walking_plan_data
+        await self.db.commit()
+        await self.db.refresh(walking_plan)
+
+        return walking_plan
+
+    async def delete_walking_plan(self, walking_plan: UserWalkingPlan) -> None:
+        await self.db.delete(walking_plan)
+        await self.db.commit()
+
+
+async def get_async_walking_plan_crud(
+    db: AsyncSession = Depends(get_async_db_session),  # noqa: B008
+) -> AsyncUserWalkingPlanCRUD:
+    return AsyncUserWalkingPlanCRUD(db)
@@ -0,0 +1,51 @@
+"""outbox events
+
+Revision ID: 4e1f6a2b8c07
+Revises: b33e91c25011
+Create Date: 2026-10-18 10:12:41.503118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4e1f6a2b8c07"
+down_revision: Union[str, None] = "b33e91c25011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column(
+            "destination",
+            sa.Enum("sns", "sqs", name="outbox_destination_enum"),
+            nullable=False,
+        ),
+        sa.Column("target", sa.String(length=256), nullable=False),
+        sa.Column("subject", sa.String(length=100), nullable=True),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String(length=256), nullable=True),
+        sa.Column("available_at", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_outbox_events_available_at"),
+        "outbox_events",
+        ["available_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_outbox_events_available_at"), table_name="outbox_events")
+    op.drop_table("outbox_events")
+    sa.Enum(name="outbox_destination_enum").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,135 @@
+"""activity rollups
+
+Revision ID: 9b3d5e7f1a24
+Revises: 4e1f6a2b8c07
+Create Date: 2026-10-18 14:37:05.218460
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3d5e7f1a24"
+down_revision: Union[str, None] = "4e1f6a2b8c07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_TABLES = {
+    "user_activity_daily_rollup": "day",
+    "user_activity_weekly_rollup": "week",
+    "user_activity_monthly_rollup": "month",
+}
+
+
+def _upsert_deltas(table: str, period: str) -> str:
+    # Rows are upserted in key order so concurrent statements lock them in the same order
+    return f"""
+    INSERT INTO {table} AS r
+        (user_id, period_start, brisk_minutes, walking_minutes, steps, activity_count)
+    SELECT
+        user_id,
+        date_trunc('{period}', to_timestamp(date) AT TIME ZONE 'UTC')::date,
+        sum(brisk_minutes), sum(walking_minutes), sum(steps), sum(activity_count)
+    FROM unnest(deltas)
+    WHERE user_id IS NOT NULL
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (user_id, period_start) DO UPDATE SET
+        brisk_minutes = r.brisk_minutes + EXCLUDED.brisk_minutes,
+        walking_minutes = r.walking_minutes + EXCLUDED.walking_minutes,
+        steps = r.steps + EXCLUDED.steps,
+        activity_count = r.activity_count + EXCLUDED.activity_count;
+
+    DELETE FROM {table}
+    WHERE activity_count <= 0 AND user_id IN (SELECT user_id FROM unnest(deltas));
+    """
+
+
+apply_deltas_sql = f"""
+CREATE TYPE activity_rollup_delta AS (
+    user_id UUID,
+    date BIGINT,
+    brisk_minutes BIGINT,
+    walking_minutes BIGINT,
+    steps BIGINT,
+    activity_count INT
+);
+
+CREATE OR REPLACE FUNCTION apply_activity_rollup_deltas(deltas activity_rollup_delta[])
+RETURNS void AS $$
+{"".join(_upsert_deltas(table, period) for table, period in ROLLUP_TABLES.items())}
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION activities_rollup_trigger()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM apply_activity_rollup_deltas(ARRAY(
+            SELECT ROW(user_id, date, brisk_minutes, walking_minutes, steps, 1)::activity_rollup_delta
+            FROM new_rows
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM apply_activity_rollup_deltas(ARRAY(
+            SELECT ROW(user_id, date, -brisk_minutes, -walking_minutes, -steps, -1)::activity_rollup_delta
+            FROM old_rows
+        ));
+    ELSE
+        PERFORM apply_activity_rollup_deltas(ARRAY(
+            SELECT ROW(user_id, date, brisk_minutes, walking_minutes, steps, 1)::activity_rollup_delta
+            FROM new_rows
+            UNION ALL
+            SELECT ROW(user_id, date, -brisk_minutes, -walking_minutes, -steps, -1)::activity_rollup_delta
+            FROM old_rows
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER activities_rollup_insert
+AFTER INSERT ON activities REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION activities_rollup_trigger();
+
+CREATE TRIGGER activities_rollup_update
+AFTER UPDATE ON activities REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION activities_rollup_trigger();
+
+CREATE TRIGGER activities_rollup_delete
+AFTER DELETE ON activities REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION activities_rollup_trigger();
+"""
+
+
+def upgrade() -> None:
+    for table in ROLLUP_TABLES:
+        op.create_table(
+            table,
+            sa.Column("user_id", sa.UUID(), nullable=False),
+            sa.Column("period_start", sa.Date(), nullable=False),
+            sa.Column("brisk_minutes", sa.BigInteger(), nullable=False),
+            sa.Column("walking_minutes", sa.BigInteger(), nullable=False),
+            sa.Column("steps", sa.BigInteger(), nullable=False),
+            sa.Column("activity_count", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("user_id", "period_start"),
+        )
+
+    op.execute(text(apply_deltas_sql))
+
+
+def downgrade() -> None:
+    op.execute(text("DROP TRIGGER IF EXISTS activities_rollup_delete ON activities;"))
+    op.execute(text("DROP TRIGGER IF EXISTS activities_rollup_update ON activities;"))
+    op.execute(text("DROP TRIGGER IF EXISTS activities_rollup_insert ON activities;"))
+    op.execute(text("DROP FUNCTION IF EXISTS activities_rollup_trigger();"))
+    op.execute(
+        text("DROP FUNCTION IF EXISTS apply_activity_rollup_deltas(activity_rollup_delta[]);")
+    )
+    op.execute(text("DROP TYPE IF EXISTS activity_rollup_delta;"))
+    for table in reversed(ROLLUP_TABLES):
+        op.drop_table(table)
@@ -0,0 +1,28 @@
+"""outbox dead letter
+
+Revision ID: a6d2c8f0b914
+Revises: e3b8d1c6f052
+Create Date: 2026-10-18 16:42:07.215480
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a6d2c8f0b914"
+down_revision: Union[str, None] = "e3b8d1c6f052"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Set once an event will not be retried; the relay skips these rows.
+    op.add_column("outbox_events", sa.Column("dead_lettered_at", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("outbox_events", "dead_lettered_at")
@@ -0,0 +1,88 @@
+"""activities composite and brin indexes
+
+Revision ID: c5a7e2d94f18
+Revises: 9b3d5e7f1a24
+Create Date: 2026-10-18 11:20:37.214906
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5a7e2d94f18"
+down_revision: Union[str, None] = "9b3d5e7f1a24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Covers the user_id + date range lookups ordered by (date, id). rewards is left out of
+# INCLUDE since an unbounded JSON array can exceed the b-tree tuple size limit.
+USER_DATE_INDEX = (
+    "ix_activities_user_id_date",
+    "(user_id, date, id) INCLUDE "
+    "(user_postcode, user_age_range, brisk_minutes, walking_minutes, steps)",
+)
+DATE_BRIN_INDEX = ("ix_activities_date_brin", "USING brin (date) WITH (pages_per_range = 32)")
+
+OLD_INDEXES = (
+    ("ix_activities_date", "(date)"),
+    ("ix_activities_id", "(id)"),
+    ("ix_activities_user_id", "(user_id)"),
+)
+
+
+def _partitions() -> list[str]:
+    return list(
+        op.get_bind()
+        .execute(
+            text(
+                """
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'activities'::regclass
+                ORDER BY c.relname
+                """
+            )
+        )
+        .scalars()
+    )
+
+
+def _create_partitioned_index(name: str, definition: str) -> None:
+    """
+    Create the index on the parent only, build it on each partition concurrently and
+    attach it, so writes to activities are never blocked while the indexes build.
+    """
+    op.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY activities {definition}"))
+    for partition in _partitions():
+        partition_index = f"{partition}_{name.removeprefix('ix_activities_')}_idx"
+        with op.get_context().autocommit_block():
+            op.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} "
+                    f"ON {partition} {definition}"
+                )
+            )
+        op.execute(text(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}"))
+
+
+def upgrade() -> None:
+    _create_partitioned_index(*USER_DATE_INDEX)
+    _create_partitioned_index(*DATE_BRIN_INDEX)
+
+    # The primary key (id, date) serves id lookups and the new composite index serves
+    # user_id, including the ON DELETE CASCADE from users.
+    for name, _ in OLD_INDEXES:
+        op.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def downgrade() -> None:
+    for name, definition in OLD_INDEXES:
+        _create_partitioned_index(name, definition)
+
+    op.execute(text(f"DROP INDEX IF EXISTS {DATE_BRIN_INDEX[0]}"))
+    op.execute(text(f"DROP INDEX IF EXISTS {USER_DATE_INDEX[0]}"))
@@ -0,0 +1,42 @@
+"""email logs event id
+
+Revision ID: e3b8d1c6f052
+Revises: c5a7e2d94f18
+Create Date: 2026-10-18 14:05:19.338021
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b8d1c6f052"
+down_revision: Union[str, None] = "c5a7e2d94f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("logout_user_email_logs", "monthly_report_email_logs")
+
+
+def upgrade() -> None:
+    # SendGrid's sg_event_id, unique so retried webhook deliveries can't duplicate rows.
+    # Existing rows keep a NULL event id, which the unique index allows.
+    for table in TABLES:
+        op.add_column(table, sa.Column("event_id", sa.String(length=128), nullable=True))
+        with op.get_context().autocommit_block():
+            op.execute(
+                text(
+                    f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_event_id "
+                    f"ON {table} (event_id)"
+                )
+            )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(text(f"DROP INDEX IF EXISTS ix_{table}_event_id"))
+        op.drop_column(table, "event_id")
@@ -1,6 +1,8 @@
+from collections.abc import AsyncIterator
 from contextlib import contextmanager
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from utils.base_config import config
@@ -16,6 +18,17 @@ Engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=Engine)
 
+# psycopg 3 serves both engines; SQLAlchemy picks its async mode for create_async_engine.
+# Objects stay loaded after commit since lazy refreshes are not possible on AsyncSession.
+AsyncEngine = create_async_engine(
+    DATABASE_URL,
+    pool_size=config.db_async_pool_size,
+    max_overflow=config.db_async_max_overflow,
+    pool_recycle=config.db_pool_recycle,
+)
+
+AsyncSessionLocal = async_sessionmaker(bind=AsyncEngine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -34,3 +47,11 @@ def get_db_session() -> Session:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db_session() -> AsyncIterator[AsyncSession]:
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
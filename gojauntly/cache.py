@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import orjson
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+from pydantic import BaseModel
+
+from service.async_redis_service import AsyncRedisService
+from service.redis_codecs import get_codec
+from utils.base_config import config, logger
+
+GOJAUNTLY_CACHE_PREFIX = "gojauntly"
+
+meter = metrics.get_meter("active10.gojauntly")
+
+
+def request_hash(request: BaseModel, *parts: str) -> str:
+    """
+    Hash a request model canonically: defaults filled in, keys sorted and values in their
+    JSON form, so requests that mean the same thing hash the same.
+    """
+    payload = orjson.dumps([request.model_dump(mode="json"), *parts], option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+class GoJauntlyCache:
+    """
+    Shared cache of GoJauntly responses in Redis with stale-while-revalidate.
+
+    Entries are keyed by endpoint and a canonical hash of the request model. An entry is
+    fresh for the endpoint's TTL, then served stale for up to ``stale_ttl`` more seconds
+    while a background task replaces it; a Redis lock makes sure only one worker refreshes
+    a given entry. Identical requests that miss at the same time in this process share
+    one upstream call. Upstream errors are never cached.
+
+    Lookups are counted per endpoint and result (hit, stale, miss, coalesced, bypass) in
+    the ``gojauntly.cache.requests`` counter, and the process's hit ratio is reported by
+    the ``gojauntly.cache.hit_ratio`` gauge.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttls: dict[str, int] | None = None,
+        default_ttl: int = 300,
+        stale_ttl: int = 3600,
+    ) -> None:
+        """
+        Args:
+            enabled (bool): When False every call goes upstream.
+            ttls (dict[str, int] | None): Seconds an entry is fresh, per endpoint.
+            default_ttl (int): Seconds an entry is fresh for endpoints not in ``ttls``.
+            stale_ttl (int): Seconds an expired entry is still served while it refreshes.
+        """
+        self.enabled = enabled
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.codec = get_codec("orjson")
+        self.counts = {"hit": 0, "stale": 0, "miss": 0, "coalesced": 0, "bypass": 0}
+
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+        self._requests_counter = meter.create_counter(
+            "gojauntly.cache.requests",
+            unit="{request}",
+            description="GoJauntly cache lookups by endpoint and result",
+        )
+        meter.create_observable_gauge(
+            "gojauntly.cache.hit_ratio",
+            callbacks=[self._observe_hit_ratio],
+            description="Share of GoJauntly calls served from the cache",
+        )
+
+    def ttl(self, endpoint: str) -> int:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    async def get_or_fetch(
+        self,
+        endpoint: str,
+        request: BaseModel,
+        fetch: Callable[[], Awaitable[dict]],
+        *key_parts: str,
+    ) -> dict:
+        """
+        Return the cached response to a request, calling ``fetch`` on a miss.
+
+        Args:
+            endpoint (str): The endpoint name, which selects the TTL.
+            request (BaseModel): The request model the response depends on.
+            fetch (Callable): Coroutine function calling GoJauntly and returning the response.
+            key_parts (str): Anything else the response depends on, such as a path id.
+
+        Returns:
+            dict: The response.
+        """
+        if not self.enabled:
+            self._count(endpoint, "bypass")
+            return await fetch()
+
+        key = f"{GOJAUNTLY_CACHE_PREFIX}:{endpoint}:{request_hash(request, *key_parts)}"
+        entry = await AsyncRedisService.get(key)
+        if entry is not None:
+            if entry["fresh_until"] > time.time():
+                self._count(endpoint, "hit")
+            else:
+                self._count(endpoint, "stale")
+                self._refresh_in_background(key, endpoint, fetch)
+            return entry["data"]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._count(endpoint, "coalesced")
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # The request doing the fetch was cancelled, not this one
+                if not in_flight.cancelled():
+                    raise
+                return await fetch()
+
+        self._count(endpoint, "miss")
+        in_flight = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = in_flight
+        try:
+            data = await self._fetch_and_store(key, endpoint, fetch)
+        except asyncio.CancelledError:
+            in_flight.cancel()
+            raise
+        except Exception as e:
+            in_flight.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            in_flight.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+        in_flight.set_result(data)
+        return data
+
+    async def _fetch_and_store(
+        self, key: str, endpoint: str, fetch: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        data = await fetch()
+        ttl = self.ttl(endpoint)
+        entry = {"data": data, "fresh_until": time.time() + ttl}
+        await AsyncRedisService.set(key, entry, ttl + self.stale_ttl, codec=self.codec)
+        return data
+
+    def _refresh_in_background(
+        self, key: str, endpoint: str, fetch: Callable[[], Awaitable[dict]]
+    ) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, endpoint, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, endpoint: str, fetch: Callable[[], Awaitable[dict]]) -> None:
+        lock_key = f"{key}:refresh"
+        try:
+            if await AsyncRedisService.set_if_absent(lock_key, 1, max(self.ttl(endpoint), 1)):
+                await self._fetch_and_store(key, endpoint, fetch)
+        except Exception as e:
+            # The stale entry keeps being served, the next request after it tries again
+            await AsyncRedisService.delete(lock_key)
+            logger.warning(f"Error refreshing GoJauntly {endpoint} response: {e}")
+
+    def _count(self, endpoint: str, result: str) -> None:
+        self.counts[result] += 1
+        self._requests_counter.add(1, {"endpoint": endpoint, "result": result})
+
+    def stats(self) -> dict[str, Any]:
+        """Return the lookup counts of this process and its hit ratio."""
+        return {**self.counts, "hit_ratio": self.hit_ratio()}
+
+    def hit_ratio(self) -> float:
+        counts = self.counts
+        served = counts["hit"] + counts["stale"] + counts["coalesced"]
+        total = served + counts["miss"]
+        return served / total if total else 0.0
+
+    def _observe_hit_ratio(self, _options: CallbackOptions):
+        yield Observation(self.hit_ratio())
+
+    async def shutdown(self) -> None:
+        """Wait for the background refreshes that are still running."""
+        await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+
+
+gojauntly_cache = GoJauntlyCache(
+    enabled=config.gojauntly_cache_enabled,
+    ttls=config.gojauntly_cache_ttls,
+    default_ttl=config.gojauntly_cache_default_ttl,
+    stale_ttl=config.gojauntly_cache_stale_ttl,
+)
@@ -0,0 +1,61 @@
+import time
+from enum import Enum
+
+from utils.base_config import logger
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fails calls to a dependency fast while it is down, instead of queueing them up.
+
+    After ``failure_threshold`` failed calls in a row the circuit opens and calls are
+    refused for ``reset_timeout`` seconds. Then one trial call is let through (half-open):
+    if it succeeds the circuit closes, if it fails the circuit opens again. A trial that
+    never reports back lets another one through after ``reset_timeout``.
+
+    Meant for use from a single event loop, so it takes no locks.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            name (str): Name of the dependency, used in logs.
+            failure_threshold (int): Failed calls in a row that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before a trial call.
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    def allow_request(self) -> bool:
+        """Return whether a call may go ahead now."""
+        if self.state is CircuitState.CLOSED:
+            return True
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return False
+        self.state = CircuitState.HALF_OPEN
+        self._opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        if self.state is not CircuitState.CLOSED:
+            logger.info(f"{self.name} circuit closed")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state is CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state is not CircuitState.OPEN:
+                logger.warning(f"{self.name} circuit opened after {self.failures} failures")
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
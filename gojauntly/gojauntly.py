@@ -1,18 +1,26 @@
+import asyncio
 import json
+import random
 import time
 from datetime import datetime, timedelta
 from enum import Enum
 
+import httpx
 import jwt
-import requests
 from fastapi import HTTPException
-from requests.exceptions import HTTPError, RequestException
+from opentelemetry import trace
 
-from utils.base_config import logger
+from gojauntly.circuit_breaker import CircuitBreaker
+from utils.async_utils import close_on_loop
+from utils.base_config import config, logger
 
 ALGORITHM = "ES256"
 GOJAUNTLY_BASE_URL = "https://connect.gojauntly.com"
 TOKEN_EXPIRATION_MINUTES = 15
+# Responses worth another attempt: rate limited, or a gateway in front of GoJauntly failed
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+tracer = trace.get_tracer("active10.gojauntly")
 
 
 class HttpMethod(Enum):
@@ -23,25 +31,57 @@ class HttpMethod(Enum):
 class GoJauntlyApi:
     """Client for interacting with the GoJauntly API."""
 
-    def __init__(self, key_id: str, secret_key: str, issuer_id: str):
+    def __init__(  # noqa: PLR0913
+        self,
+        key_id: str,
+        secret_key: str,
+        issuer_id: str,
+        base_url: str = GOJAUNTLY_BASE_URL,
+        timeout: httpx.Timeout | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = True,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.2,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
         """
         Initialize the GoJauntlyApi client.
 
+        Requests share one pooled, keep-alive ``httpx.AsyncClient``. Idempotent calls that
+        fail with a transport error or a status in ``RETRY_STATUS_CODES`` are retried with
+        exponential backoff and full jitter, and a circuit breaker fails calls fast while
+        GoJauntly keeps failing.
+
         Args:
             key_id (str): The Key ID for JWT.
             secret_key (str): The secret key for JWT.
             issuer_id (str): The Issuer ID for JWT.
+            base_url (str): The GoJauntly API root URL.
+            timeout (httpx.Timeout | None): Connect, read, write and pool timeouts.
+            limits (httpx.Limits | None): Connection pool limits.
+            http2 (bool): Negotiate HTTP/2 when the server supports it.
+            max_retries (int): Retries of an idempotent call after its first attempt.
+            retry_base_delay (float): Base delay in seconds of the backoff.
+            circuit_breaker (CircuitBreaker | None): Breaker shared by every call.
         """
+        self.base_url = base_url
         self._token: str | None = None
         self.token_gen_date: datetime | None = None
         self.key_id = key_id
         self.secret_key = secret_key
         self.issuer_id = issuer_id
         self._debug: bool = False
-        self._initialize_token()
-
-    def _initialize_token(self):
-        """Generate the initial token."""
+        self.timeout = timeout or httpx.Timeout(15.0, connect=5.0)
+        self.limits = limits or httpx.Limits()
+        self.http2 = http2
+        self.max_retries = max(0, max_retries)
+        self.retry_base_delay = retry_base_delay
+        self.circuit_breaker = circuit_breaker or CircuitBreaker("GoJauntly")
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def warm_up(self) -> None:
+        """Generate the first token now rather than on the first call."""
         _ = self.token
 
     def _generate_token(self) -> str:
@@ -62,9 +102,43 @@ class GoJauntlyApi:
 
         return token
 
-    def _api_call(
-        self, url: str, method: HttpMethod, data: dict | None = None
-    ) -> dict | requests.Response:
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Return the pooled HTTP client, creating it for the running event loop if needed.
+
+        Pooled connections are bound to the loop that opened them, so the client is
+        rebuilt if it is used from a different loop, and the previous one is closed on its
+        own loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                close_on_loop(self._client.aclose, self._loop)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._loop = loop
+        return self._client
+
+    async def close(self) -> None:
+        """Close the HTTP client and its pooled connections, on the loop they use."""
+        if self._client is not None:
+            if self._loop is asyncio.get_running_loop():
+                await self._client.aclose()
+            else:
+                close_on_loop(self._client.aclose, self._loop)
+        self._client = None
+        self._loop = None
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, self.retry_base_delay * 2**attempt)
+
+    async def _api_call(
+        self, url: str, method: HttpMethod, data: dict | None = None, idempotent: bool = True
+    ) -> dict:
         """
         Make an API call to the specified endpoint.
 
@@ -72,54 +146,90 @@ class GoJauntlyApi:
             url (str): The endpoint URL.
             method (HttpMethod): The HTTP method to use.
             data (Optional[Dict]): Data to be sent in the request body.
+            idempotent (bool): Whether the call may be retried.
 
         Returns:
-            Union[Dict, requests.Response]: The response from the API call.
+            Dict: The response from the API call.
         """
-        url = f"{GOJAUNTLY_BASE_URL}{url}"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json" if method == HttpMethod.POST else None,
-        }
+        if not self.circuit_breaker.allow_request():
+            logger.warning(f"GoJauntly circuit is open, refusing {method.value} {url}")
+            raise HTTPException(status_code=503, detail="GoJauntly is unavailable")
+
+        headers = {"Authorization": f"Bearer {self.token}"}
+        if method == HttpMethod.POST:
+            headers["Content-Type"] = "application/json"
 
         if self._debug:
-            logger.info(f"Making {method.value} request to {url}")
+            logger.info(f"Making {method.value} request to {self.base_url}{url}")
 
         try:
-            response = requests.request(
-                method.value,
-                url,
-                headers=headers,
-                data=json.dumps(data) if data else None,
-            )
-            response.raise_for_status()
-
-            content_type = response.headers.get("content-type", "")
-
-            if content_type in ["application/json", "application/vnd.api+json"]:
-                data = response.json()
-
-                if "errors" in data:
-                    error_message = data.get("errors", [])[0].get("detail", "Unknown error")
-                    logger.error(f"API error: {error_message}")
-                    raise HTTPException(status_code=500, detail=error_message)
-
-                return data
-
-            logger.error(f"Unexpected content type: {content_type}")
-            raise HTTPException(status_code=500, detail="Unexpected content type")
-
-        except HTTPError as http_err:
-            logger.error(f"HTTP error occurred: {http_err}")
-            raise HTTPException(  # noqa: B904
-                status_code=http_err.response.status_code,
-                detail=http_err.response.json(),
+            response = await self._send(
+                url, method, headers, json.dumps(data) if data else None, idempotent
             )
-
-        except RequestException as req_err:
-            logger.error(f"Request error occurred: {req_err}")
+        except httpx.TransportError as req_err:
+            self.circuit_breaker.record_failure()
+            if isinstance(req_err, httpx.TimeoutException):
+                raise HTTPException(status_code=504, detail="GoJauntly timed out")  # noqa: B904
             raise HTTPException(status_code=500, detail="Internal server error")  # noqa: B904
 
+        if response.status_code >= 500:  # noqa: PLR2004
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+        if response.is_error:
+            logger.error(f"HTTP error occurred: {response.status_code} for {method.value} {url}")
+            try:
+                detail = response.json()
+            except ValueError:
+                detail = response.text
+            raise HTTPException(status_code=response.status_code, detail=detail)
+
+        content_type = response.headers.get("content-type", "")
+
+        if content_type in ["application/json", "application/vnd.api+json"]:
+            data = response.json()
+
+            if "errors" in data:
+                error_message = data.get("errors", [])[0].get("detail", "Unknown error")
+                logger.error(f"API error: {error_message}")
+                raise HTTPException(status_code=500, detail=error_message)
+
+            return data
+
+        logger.error(f"Unexpected content type: {content_type}")
+        raise HTTPException(status_code=500, detail="Unexpected content type")
+
+    async def _send(
+        self,
+        url: str,
+        method: HttpMethod,
+        headers: dict[str, str],
+        content: str | None,
+        idempotent: bool,
+    ) -> httpx.Response:
+        """Send a request, retrying transport errors and retryable statuses if idempotent."""
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        with tracer.start_as_current_span(f"gojauntly {method.value} {url}") as span:
+            span.set_attribute("http.request.method", method.value)
+            span.set_attribute("url.path", url)
+            for attempt in range(1, attempts + 1):
+                span.set_attribute("gojauntly.attempts", attempt)
+                try:
+                    response = await self.get_client().request(
+                        method.value, url, headers=headers, content=content
+                    )
+                except httpx.TransportError as req_err:
+                    logger.error(f"Request error occurred: {req_err!r}")
+                    if attempt == attempts:
+                        raise
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == attempts:
+                        span.set_attribute("http.response.status_code", response.status_code)
+                        return response
+                    logger.warning(f"GoJauntly returned {response.status_code}, retrying")
+                await asyncio.sleep(self._backoff(attempt))
+
     @property
     def token(self) -> str:
         """Return the current token, generating a new one if needed."""
@@ -130,7 +240,7 @@ class GoJauntlyApi:
 
         return self._token
 
-    def curated_walk_search(self, data: dict) -> dict:
+    async def curated_walk_search(self, data: dict) -> dict:
         """Search for curated walks.
 
         Args:
@@ -139,9 +249,9 @@ class GoJauntlyApi:
         Returns:
             Dict: The search results.
         """
-        return self._api_call(url="/curated-walks/search", method=HttpMethod.POST, data=data)
+        return await self._api_call(url="/curated-walks/search", method=HttpMethod.POST, data=data)
 
-    def curated_walk_retrieve(self, id: str, data: dict) -> dict:
+    async def curated_walk_retrieve(self, id: str, data: dict) -> dict:
         """Retrieve a specific curated walk by ID.
 
         Args:
@@ -151,9 +261,9 @@ class GoJauntlyApi:
         Returns:
             Dict: The details of the curated walk.
         """
-        return self._api_call(url=f"/curated-walks/{id}", method=HttpMethod.POST, data=data)
+        return await self._api_call(url=f"/curated-walks/{id}", method=HttpMethod.POST, data=data)
 
-    def dynamic_routes_route(self, data: dict) -> dict:
+    async def dynamic_routes_route(self, data: dict) -> dict:
         """Get dynamic route.
 
         Args:
@@ -162,9 +272,9 @@ class GoJauntlyApi:
         Returns:
             Dict: The route details.
         """
-        return self._api_call(url="/routing/route", method=HttpMethod.POST, data=data)
+        return await self._api_call(url="/routing/route", method=HttpMethod.POST, data=data)
 
-    def dynamic_routes_circular(self, data: dict) -> dict:
+    async def dynamic_routes_circular(self, data: dict) -> dict:
         """Get dynamic circular route.
 
         Args:
@@ -173,15 +283,41 @@ class GoJauntlyApi:
         Returns:
             Dict: The circular route details.
         """
-        return self._api_call(url="/routing/circular", method=HttpMethod.POST, data=data)
+        return await self._api_call(url="/routing/circular", method=HttpMethod.POST, data=data)
 
-    def dynamic_routes_circular_collection(self, data: dict) -> dict:
+    async def dynamic_routes_circular_collection(self, data: dict) -> dict:
         """Get dynamic circular collection route.
 
         Args:
-            data (Dict): Circular collection route parameters.
+            data (Dict): Circular collection route parameters. Requests that ``store``
+                the routes are never retried, since each one saves routes upstream.
 
         Returns:
             Dict: The circular collection route details.
         """
-        return self._api_call(url="/routing/circular/collection", method=HttpMethod.POST, data=data)
+        return await self._api_call(
+            url="/routing/circular/collection",
+            method=HttpMethod.POST,
+            data=data,
+            idempotent=not data.get("store"),
+        )
+
+
+gojauntly_client = GoJauntlyApi(
+    key_id=config.gojauntly_key_id,
+    secret_key=config.gojauntly_private_key,
+    issuer_id=config.gojauntly_issuer_id,
+    timeout=httpx.Timeout(config.gojauntly_timeout, connect=config.gojauntly_connect_timeout),
+    limits=httpx.Limits(
+        max_connections=config.gojauntly_max_connections,
+        max_keepalive_connections=config.gojauntly_max_keepalive_connections,
+    ),
+    http2=config.gojauntly_http2,
+    max_retries=config.gojauntly_max_retries,
+    retry_base_delay=config.gojauntly_retry_base_delay,
+    circuit_breaker=CircuitBreaker(
+        "GoJauntly",
+        failure_threshold=config.gojauntly_circuit_failure_threshold,
+        reset_timeout=config.gojauntly_circuit_reset_timeout,
+    ),
+)
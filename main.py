@@ -1,16 +1,29 @@
+from contextlib import asynccontextmanager
 from functools import lru_cache
 
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from fastapi_cprofile.profiler import CProfileMiddleware
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
+from api.etag import ETAG_CACHE_CONTROL
 from api.healthcheck import router as healthcheck
 from api.nhs_login import router as nhs_login
 from api.unsubscribe import router as unsubscribe
 from api.v1 import router as api_v1
 from api.v2 import router as api_v2
+from gojauntly.cache import gojauntly_cache
+from gojauntly.gojauntly import gojauntly_client
+from service.activity_partition_manager import manage_activity_partitions
+from service.async_redis_service import AsyncRedisService
+from service.aws_sns_service import get_sns_client
+from service.aws_sqs_service import get_sqs_client
+from service.nhs_login_service import auth_nhs
 from service.open_telemetry_service import setup_telemetry
+from service.sns_batch_publisher import activity_publisher
+from service.warmup_service import warmup
+from service.webhook_writer import webhook_writer
 from utils.base_config import config
 
 setup_telemetry()
@@ -19,10 +32,36 @@ APP_VERSION = config.app_version
 APP_CODE_COMMIT_HASH = config.app_code_commit_hash
 
 
+def _register_warmup() -> None:
+    warmup.register("nhs_login", auth_nhs.warm_up)
+    warmup.register("gojauntly", gojauntly_client.warm_up)
+    warmup.register("sns", get_sns_client)
+    warmup.register("sqs", get_sqs_client)
+    if not config.activity_outbox_enabled:
+        warmup.register("sns_publisher", lambda: activity_publisher.client)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.activity_partitions_manage_on_startup:
+        await run_in_threadpool(manage_activity_partitions)
+    if config.warmup_enabled:
+        _register_warmup()
+        warmup.start()
+    yield
+    await warmup.stop()
+    await run_in_threadpool(activity_publisher.stop, config.sns_publisher_shutdown_timeout)
+    await run_in_threadpool(webhook_writer.stop, config.sendgrid_webhook_shutdown_timeout)
+    await gojauntly_cache.shutdown()
+    await gojauntly_client.close()
+    await AsyncRedisService.close()
+
+
 app = FastAPI(
     title="Active 10 NHS Login Backend Service",
     description=("Backend NHS Login service for Active 10 application.\n\n"),
     version=APP_VERSION,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -80,6 +119,11 @@ async def apply_security_headers(request: Request, call_next):
     response.headers["X-Content-Type-Options"] = "nosniff"
     if request.url.path in NO_CACHE_PATHS:
         response.headers["Cache-Control"] = "no-cache"
+    # Set by the ETagged dependency of conditional routes
+    etag = getattr(request.state, "etag", None)
+    if etag and response.status_code == 200:  # noqa: PLR2004
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
     return response
 
 
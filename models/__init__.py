@@ -6,3 +6,5 @@ from .daily_target import *  # noqa
 from .email_notification import *  # noqa
 from .motivation import *  # noqa
 from .activity_level import *  # noqa
+from .outbox import *  # noqa
+from .activity_rollup import *  # noqa
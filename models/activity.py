@@ -7,6 +7,7 @@ from sqlalchemy import (
     BigInteger,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
 )
@@ -16,10 +17,31 @@ from db.session import Base
 
 class Activity(Base):
     __tablename__ = "activities"
-    __table_args__ = {"postgresql_partition_by": "RANGE (date)"}  # noqa: RUF012
+    __table_args__ = (
+        Index(
+            "ix_activities_user_id_date",
+            "user_id",
+            "date",
+            "id",
+            postgresql_include=[
+                "user_postcode",
+                "user_age_range",
+                "brisk_minutes",
+                "walking_minutes",
+                "steps",
+            ],
+        ),
+        Index(
+            "ix_activities_date_brin",
+            "date",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
 
-    id = Column(UUID(as_uuid=True), default=uuid4, primary_key=True, index=True)
-    date = Column(BigInteger, nullable=False, primary_key=True, index=True)
+    id = Column(UUID(as_uuid=True), default=uuid4, primary_key=True)
+    date = Column(BigInteger, nullable=False, primary_key=True)
     user_postcode = Column(String(10), nullable=False)
     user_age_range = Column(String(50), nullable=False)
     brisk_minutes = Column(Integer, nullable=False)
@@ -27,4 +49,4 @@ class Activity(Base):
     steps = Column(Integer, nullable=False)
     rewards = Column(ARRAY(JSON), nullable=True)
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
@@ -0,0 +1,41 @@
+from sqlalchemy import UUID, BigInteger, Column, Date, ForeignKey, Integer
+from sqlalchemy.orm import declared_attr
+
+from db.session import Base
+
+
+class ActivityRollupMixin:
+    """
+    Totals of a user's activities over one UTC period.
+
+    Rows are maintained by statement-level triggers on ``activities``, see the
+    ``activity_rollups`` migration, and rebuilt by ``scripts/backfill_activity_rollups``.
+    """
+
+    @declared_attr
+    def user_id(cls):
+        return Column(
+            UUID(as_uuid=True),
+            ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+
+    period_start = Column(Date, primary_key=True)
+    brisk_minutes = Column(BigInteger, nullable=False, default=0)
+    walking_minutes = Column(BigInteger, nullable=False, default=0)
+    steps = Column(BigInteger, nullable=False, default=0)
+    activity_count = Column(Integer, nullable=False, default=0)
+
+
+class UserActivityDailyRollup(ActivityRollupMixin, Base):
+    __tablename__ = "user_activity_daily_rollup"
+
+
+class UserActivityWeeklyRollup(ActivityRollupMixin, Base):
+    """Weeks start on Monday (ISO weeks)."""
+
+    __tablename__ = "user_activity_weekly_rollup"
+
+
+class UserActivityMonthlyRollup(ActivityRollupMixin, Base):
+    __tablename__ = "user_activity_monthly_rollup"
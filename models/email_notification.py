@@ -46,6 +46,7 @@ class LogoutUserEmailLogs(Base):
     )
     failure_reason = Column(String(length=128), nullable=True)
     message_id = Column(String(length=128), nullable=True)
+    event_id = Column(String(length=128), nullable=True, index=True, unique=True)
     timestamp = Column(Integer, nullable=False, index=True)
 
     created_at = Column(
@@ -76,6 +77,7 @@ class MonthlyReportEmailLogs(Base):
     )
     failure_reason = Column(String(length=128), nullable=True)
     message_id = Column(String(length=128), nullable=True)
+    event_id = Column(String(length=128), nullable=True, index=True, unique=True)
     timestamp = Column(Integer, nullable=False, index=True)
 
     created_at = Column(
@@ -0,0 +1,42 @@
+from enum import Enum as PyEnum
+
+from sqlalchemy import BigInteger, Column, Identity, Integer, String, Text
+from sqlalchemy import Enum as SQLAlchemyEnum
+
+from db.session import Base
+
+
+class OutboxDestination(PyEnum):
+    SNS = "sns"
+    SQS = "sqs"
+
+    @classmethod
+    def value_choices(cls):
+        return [e.value for e in cls]
+
+
+class OutboxEvent(Base):
+    """
+    Message accepted by the API and waiting to be relayed to SNS or SQS.
+
+    Rows are appended in the request path and deleted by the outbox relay once the
+    message has been delivered, so the table only holds the undelivered backlog. Events
+    that will never be delivered are kept with ``dead_lettered_at`` set and are no longer
+    relayed.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    destination = Column(
+        SQLAlchemyEnum(*OutboxDestination.value_choices(), name="outbox_destination_enum"),
+        nullable=False,
+    )
+    target = Column(String(length=256), nullable=False)
+    subject = Column(String(length=100), nullable=True)
+    message = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String(length=256), nullable=True)
+    available_at = Column(Integer, nullable=False, index=True)
+    created_at = Column(Integer, nullable=False)
+    dead_lettered_at = Column(Integer, nullable=True)
@@ -1,24 +1,104 @@
+import threading
+import time
 import uuid
 
 import jwt
+import requests
 from oic import rndstr
 from oic.oauth2 import AuthorizationResponse
 from oic.oic import Client
 from oic.oic.message import Claims, ClaimsRequest
 from oic.utils.authn.client import CLIENT_AUTHN_METHOD
+from oic.utils.keyio import KeyBundle, KeyJar
+from oic.utils.settings import OicClientSettings
 from oic.utils.time_util import utc_time_sans_frac
+from requests.adapters import HTTPAdapter
 
+from nhs.pds import get_signing_key
 from utils.base_config import config as settings
+from utils.base_config import logger
+
+
+class ProviderKeyBundle(KeyBundle):
+    """
+    The provider's JWKS, kept for ``nhs_login_jwks_cache_ttl`` seconds.
+
+    An ID token signed with a key id the bundle doesn't know means the provider has rotated
+    its keys, so the JWKS is fetched again straight away, but at most once every
+    ``nhs_login_jwks_min_refresh_interval`` seconds so tokens with made-up key ids can't
+    make us hammer the provider.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._refreshed_at: float | None = None
+        kwargs.setdefault("cache_time", settings.nhs_login_jwks_cache_ttl)
+        super().__init__(*args, **kwargs)
+
+    def update(self):
+        self._refreshed_at = time.monotonic()
+        return super().update()
+
+    def get_key_with_kid(self, kid):
+        for key in self._keys:
+            if key.kid == kid:
+                return key
+
+        if (
+            self._refreshed_at is not None
+            and time.monotonic() - self._refreshed_at < settings.nhs_login_jwks_min_refresh_interval
+        ):
+            return None
+
+        logger.info(f"Unknown NHS Login key id {kid}, refreshing JWKS")
+        self.update()
+        for key in self._keys:
+            if key.kid == kid:
+                return key
+        return None
 
 
 class Authenticator:
     def __init__(self, client_id: str, authority_url: str, scopes: str, redirect_uri: str):
-        self.client = self._get_client(client_id, authority_url)
+        self.client_id = client_id
+        self.authority_url = authority_url
+        self.session = self._get_session()
         self.callback_url = redirect_uri
         self.scopes = scopes
+        self._client: Client | None = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> Client:
+        """
+        The OIDC client, built on first use since provider discovery is a network call.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._get_client(self.client_id, self.authority_url)
+        return self._client
+
+    def warm_up(self) -> None:
+        """Run provider discovery now rather than on the first login."""
+        _ = self.client
+
+    @staticmethod
+    def _get_session() -> requests.Session:
+        # One pooled session for every call to NHS Login, so calls reuse TLS connections
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def _get_client(self, client_id, authority_url):
-        client = Client(client_id=client_id, client_authn_method=CLIENT_AUTHN_METHOD)
+        timeout = (settings.nhs_login_connect_timeout, settings.nhs_login_read_timeout)
+        client = Client(
+            client_id=client_id,
+            client_authn_method=CLIENT_AUTHN_METHOD,
+            keyjar=KeyJar(keybundle_cls=ProviderKeyBundle, timeout=timeout),
+            settings=OicClientSettings(requests_session=self.session, timeout=timeout),
+        )
         client.provider_config(authority_url)
         return client
 
@@ -79,7 +159,7 @@ class Authenticator:
             "exp": _now + lifetime,
         }
 
-        token = jwt.encode(payload, key=settings.nhs_pds_jwt_private_key, algorithm="RS512")
+        token = jwt.encode(payload, key=get_signing_key(), algorithm="RS512")
 
         return token
 
@@ -1,20 +1,61 @@
+import threading
 import uuid
-from time import time
+from functools import lru_cache
+from time import monotonic, time
 
 import jwt
 import requests
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from requests.adapters import HTTPAdapter
 
 from utils.base_config import config as settings
+from utils.base_config import logger
 
 PDS_API_PATH = "personal-demographics/FHIR/R4"
 APP_KID = "better-health-app"
 
 
+@lru_cache(maxsize=1)
+def get_signing_key() -> RSAPrivateKey:
+    """
+    Parse the private key JWTs to the NHS APIs are signed with, once per process.
+
+    Parsing an RSA key is far slower than signing with it, so callers pass the parsed key
+    to ``jwt.encode`` instead of the PEM string.
+    """
+    return load_pem_private_key(settings.nhs_pds_jwt_private_key.encode(), password=None)
+
+
 class PDSClient:
-    def __init__(self, api_key, nhs_api_url) -> None:
+    """
+    Client for the Personal Demographics Service, shared by the whole process.
+
+    Requests go through one pooled ``requests.Session`` with a timeout, and the
+    client-credentials access token is kept until ``token_refresh_margin`` seconds before
+    it expires. Token exchanges are per user and are never cached.
+    """
+
+    def __init__(
+        self,
+        api_key,
+        nhs_api_url,
+        timeout: float = 10,
+        token_refresh_margin: int = 60,
+        pool_maxsize: int = 10,
+    ) -> None:
         self.api_key = api_key
         self.nhs_api_url = nhs_api_url
+        self.timeout = timeout
+        self.token_refresh_margin = token_refresh_margin
         self.access_data = None
+        self._access_expires_at = 0.0
+        self._token_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def generate_and_sign_jwt(self):
         claims = {
@@ -28,12 +69,25 @@ class PDSClient:
 
         return jwt.encode(
             claims,
-            settings.nhs_pds_jwt_private_key,
+            get_signing_key(),
             algorithm="RS512",
             headers=additional_headers,
         )
 
-    def __get_pds_access_token(self):
+    def get_pds_access_token(self):
+        """
+        Return the client-credentials access token, requesting a new one only when the
+        cached one is missing or about to expire.
+        """
+        with self._token_lock:
+            if self.access_data is None or monotonic() >= self._access_expires_at:
+                requested_at = monotonic()
+                self.access_data = self.__request_pds_access_token()
+                expires_in = int(self.access_data.get("expires_in", 0))
+                self._access_expires_at = requested_at + expires_in - self.token_refresh_margin
+            return self.access_data
+
+    def __request_pds_access_token(self):
         signed_token = self.generate_and_sign_jwt()
         url = f"{self.nhs_api_url}/oauth2/token"
         headers = {"content-type": "application/x-www-form-urlencoded"}
@@ -43,10 +97,20 @@ class PDSClient:
             "client_assertion": signed_token,
         }
 
-        resp = requests.post(url, headers=headers, data=post_data)
+        resp = self.session.post(url, headers=headers, data=post_data, timeout=self.timeout)
+        resp.raise_for_status()
         return resp.json()
 
     def __token_exchange(self, id_token_jwt):
+        """
+        Exchange the user's ID token for a PDS access token.
+
+        The client is shared by concurrent logins, so the result is returned and never
+        stored on the instance.
+
+        Raises:
+            requests.HTTPError: If the exchange does not succeed.
+        """
         url = f"{self.nhs_api_url}/oauth2/token"
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         post_data = {
@@ -56,15 +120,15 @@ class PDSClient:
             "subject_token": id_token_jwt,
             "client_assertion": self.generate_and_sign_jwt(),
         }
-        resp = requests.post(url, headers=headers, data=post_data)
+        resp = self.session.post(url, headers=headers, data=post_data, timeout=self.timeout)
 
-        if resp.status_code == 200:  # noqa: PLR2004
-            self.token_data = resp.json()
-            return self.token_data
-        else:
-            print(f"!!! returned response ({resp.status_code}): {resp.json()}\n")
+        if resp.status_code != 200:  # noqa: PLR2004
+            logger.error(f"PDS token exchange returned {resp.status_code}: {resp.text}")
+            raise requests.HTTPError(
+                f"PDS token exchange returned {resp.status_code}", response=resp
+            )
 
-        return self.token_data
+        return resp.json()
 
     def __get_user_details(self, token, id):
         url = f"{self.nhs_api_url}/{PDS_API_PATH}/Patient/{id}"
@@ -73,7 +137,7 @@ class PDSClient:
             "X-Request-ID": str(uuid.uuid4()),
         }
 
-        resp = requests.get(url, headers=headers)
+        resp = self.session.get(url, headers=headers, timeout=self.timeout)
         return resp.json()
 
     def __get_user_postcode(self, user_data):
@@ -95,3 +159,11 @@ class PDSClient:
             "gender": patient_info.get("gender") or "",
             "postcode": self.__get_user_postcode(patient_info),
         }
+
+
+pds_client = PDSClient(
+    settings.nhs_api_key,
+    settings.nhs_api_url,
+    timeout=settings.nhs_pds_timeout,
+    token_refresh_margin=settings.nhs_pds_token_refresh_margin,
+)
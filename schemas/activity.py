@@ -1,3 +1,4 @@
+from datetime import date
 from typing import Any
 from uuid import UUID
 
@@ -28,3 +29,11 @@ class ActivityResponseSchema(BaseModel):
     steps: int
     rewards: list[dict[str, Any]] | None = []
     user_id: UUID
+
+
+class ActivitySummaryResponseSchema(BaseModel):
+    period_start: date
+    brisk_minutes: int
+    walking_minutes: int
+    steps: int
+    activity_count: int
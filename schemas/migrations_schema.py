@@ -6,6 +6,8 @@ from pydantic import BaseModel, Field, model_validator
 
 from schemas.activity import UserActivityRequestSchema
 
+MAX_MONTH_ACTIVITIES = 31
+
 
 class ActivitiesMigrationsRequestSchema(BaseModel):
     month: int = Field(..., gt=0, description="First date (unix timestamp) of data month")
@@ -15,7 +17,18 @@ class ActivitiesMigrationsRequestSchema(BaseModel):
     def check_activities_length(self) -> Self:
         activities = self.get("activities")
 
-        if not 1 <= len(activities) < 32:  # noqa: PLR2004
-            raise ValueError("activities list must have between 1 and 31 items")
+        if not 1 <= len(activities) <= MAX_MONTH_ACTIVITIES:
+            raise ValueError(
+                f"activities list must have between 1 and {MAX_MONTH_ACTIVITIES} items"
+            )
 
         return self
+
+
+class ActivitiesBulkMigrationsRequestSchema(BaseModel):
+    months: List[ActivitiesMigrationsRequestSchema] = Field(..., min_length=1, max_length=120)  # noqa: UP006
+
+
+class ActivitiesBulkMigrationsResponseSchema(BaseModel):
+    inserted: int
+    updated: int
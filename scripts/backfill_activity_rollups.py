@@ -0,0 +1,174 @@
+"""
+Rebuild the daily, weekly and monthly activity rollups from the activities table.
+
+Each partition of ``activities`` is handled by its own worker: the days it holds are
+recomputed from the raw rows, then the weeks and months overlapping those days are
+recomputed from the daily rollup. Workers run in REPEATABLE READ and retry on
+serialization failures, so the backfill is safe while the ingest triggers keep
+updating the same rollup rows. It is idempotent and can be re-run at any time.
+
+Usage: python -m scripts.backfill_activity_rollups [workers]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+
+from dateutil.relativedelta import relativedelta
+from psycopg.errors import DeadlockDetected, SerializationFailure
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import OperationalError
+
+from crud.activity_rollup_crud import period_start
+from db.session import Engine as DefaultEngine
+
+MAX_ATTEMPTS = 10
+
+list_partitions_sql = text(
+    """
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'activities'::regclass
+    ORDER BY c.relname
+    """
+)
+
+OVERWRITE_ON_CONFLICT_SQL = """
+    ON CONFLICT (user_id, period_start) DO UPDATE SET
+        brisk_minutes = EXCLUDED.brisk_minutes,
+        walking_minutes = EXCLUDED.walking_minutes,
+        steps = EXCLUDED.steps,
+        activity_count = EXCLUDED.activity_count
+"""
+
+
+def _clear_sql(table: str) -> str:
+    return f"DELETE FROM {table} WHERE period_start >= :lo_day AND period_start < :hi_day"
+
+
+rebuild_daily_sql = (
+    text(_clear_sql("user_activity_daily_rollup")),
+    text(
+        """
+    INSERT INTO user_activity_daily_rollup
+        (user_id, period_start, brisk_minutes, walking_minutes, steps, activity_count)
+    SELECT
+        user_id,
+        (to_timestamp(date) AT TIME ZONE 'UTC')::date,
+        sum(brisk_minutes), sum(walking_minutes), sum(steps), count(*)
+    FROM activities
+    WHERE date >= :lo_epoch AND date < :hi_epoch AND user_id IS NOT NULL
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    """
+        + OVERWRITE_ON_CONFLICT_SQL
+    ),
+)
+
+
+def _rebuild_from_daily_sql(table: str, period: str) -> tuple:
+    return text(_clear_sql(table)), text(
+        f"""
+    INSERT INTO {table}
+        (user_id, period_start, brisk_minutes, walking_minutes, steps, activity_count)
+    SELECT
+        user_id,
+        date_trunc('{period}', period_start)::date,
+        sum(brisk_minutes), sum(walking_minutes), sum(steps), sum(activity_count)
+    FROM user_activity_daily_rollup
+    WHERE period_start >= :lo_day AND period_start < :hi_day
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    """
+        + OVERWRITE_ON_CONFLICT_SQL
+    )
+
+
+rebuild_weekly_sql = _rebuild_from_daily_sql("user_activity_weekly_rollup", "week")
+rebuild_monthly_sql = _rebuild_from_daily_sql("user_activity_monthly_rollup", "month")
+
+
+def _epoch(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())  # noqa: UP017 Not supported in Python 3.10
+
+
+def _utc_day(unix: int) -> date:
+    return datetime.fromtimestamp(unix, timezone.utc).date()  # noqa: UP017 Not supported in Python 3.10
+
+
+def _rebuild_partition(engine: Engine, partition: str) -> int:
+    with engine.connect() as connection:
+        bounds = connection.execute(
+            text(f'SELECT min(date), max(date), count(*) FROM "{partition}"')
+        ).one()
+    if not bounds[2]:
+        return 0
+
+    lo_day, hi_day = _utc_day(bounds[0]), _utc_day(bounds[1]) + timedelta(days=1)
+    week_lo = period_start(lo_day, "week")
+    week_hi = period_start(hi_day - timedelta(days=1), "week") + timedelta(days=7)
+    month_lo = period_start(lo_day, "month")
+    month_hi = period_start(hi_day - timedelta(days=1), "month") + relativedelta(months=1)
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            with (
+                engine.connect().execution_options(isolation_level="REPEATABLE READ") as connection,
+                connection.begin(),
+            ):
+                steps = (
+                    (
+                        rebuild_daily_sql,
+                        {
+                            "lo_day": lo_day,
+                            "hi_day": hi_day,
+                            "lo_epoch": _epoch(lo_day),
+                            "hi_epoch": _epoch(hi_day),
+                        },
+                    ),
+                    (rebuild_weekly_sql, {"lo_day": week_lo, "hi_day": week_hi}),
+                    (rebuild_monthly_sql, {"lo_day": month_lo, "hi_day": month_hi}),
+                )
+                for statements, params in steps:
+                    for statement in statements:
+                        connection.execute(statement, params)
+            return bounds[2]
+        except OperationalError as e:
+            if not isinstance(e.orig, SerializationFailure | DeadlockDetected):
+                raise
+            if attempt == MAX_ATTEMPTS:
+                raise
+            time.sleep(0.1 * attempt)
+    return 0
+
+
+def backfill_activity_rollups(workers: int = 4, engine: Engine = DefaultEngine) -> int:
+    """
+    Rebuild the rollups for every activities partition, ``workers`` partitions at a time.
+
+    Returns:
+        int: Number of activity rows aggregated.
+    """
+    with engine.connect() as connection:
+        partitions = connection.execute(list_partitions_sql).scalars().all()
+
+    total = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_rebuild_partition, engine, partition): partition
+            for partition in partitions
+        }
+        for future in as_completed(futures):
+            rows = future.result()
+            total += rows
+            print(f"Rebuilt rollups for {futures[future]}: {rows} activities")
+
+    return total
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    count = backfill_activity_rollups(*(int(arg) for arg in sys.argv[1:2]))
+    print(f"Aggregated {count} activities in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,109 @@
+"""
+Load benchmark comparing threadpool saturation of the sync and async auth dependencies.
+
+Drives an in-process app with concurrent authenticated requests whose token is already
+in Redis, so every request exercises the Redis-hit path (the in-process auth cache is
+disabled). For each path it reports throughput, latency percentiles and how many of the
+threadpool's worker tokens were borrowed while the load ran.
+
+Needs a reachable Redis (REDIS_HOST/REDIS_PORT); no database is used.
+
+Usage: python -m scripts.benchmark_auth_threadpool [requests] [concurrency] [threads]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from typing import Annotated
+
+import anyio.to_thread
+import httpx
+from fastapi import Depends, FastAPI
+
+from auth.auth_bearer import get_authenticated_user_data, get_authenticated_user_data_async
+from auth.jwt_handler import sign_jwt
+from service.auth_cache_service import local_auth_cache
+from service.redis_service import RedisService
+
+USER_ID = "3a8d2869-0b2e-485a-9e67-8a906e6194ce"
+
+app = FastAPI()
+
+
+@app.get("/sync")
+async def sync_auth(user_data: Annotated[dict, Depends(get_authenticated_user_data)]):
+    return user_data
+
+
+@app.get("/async")
+async def async_auth(user_data: Annotated[dict, Depends(get_authenticated_user_data_async)]):
+    return user_data
+
+
+async def _sample_threadpool(limiter, samples: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        samples.append(limiter.borrowed_tokens)
+        await asyncio.sleep(0.001)
+
+
+async def _run_path(path: str, token: str, requests: int, concurrency: int, threads: int):
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = threads
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    samples: list[int] = []
+    stop = asyncio.Event()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def _one() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        sampler = asyncio.create_task(_sample_threadpool(limiter, samples, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(_one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "threads_peak": max(samples, default=0),
+        "threads_mean": statistics.fmean(samples) if samples else 0.0,
+    }
+
+
+def run_benchmark(requests: int = 5000, concurrency: int = 200, threads: int = 40) -> None:
+    token = sign_jwt(USER_ID)
+    token_hash = RedisService.hash_token(token)
+    if not RedisService.set_auth_cache(token_hash, USER_ID, ttl=600):
+        raise SystemExit("Redis is not reachable, check REDIS_HOST/REDIS_PORT")
+    local_auth_cache.max_size = 0
+
+    print(f"{requests} requests, concurrency {concurrency}, threadpool size {threads}")
+    print(
+        f"{'path':<8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'peak thr':>10} {'mean thr':>10}"
+    )
+    for path in ("/sync", "/async"):
+        result = asyncio.run(_run_path(path, token, requests, concurrency, threads))
+        print(
+            f"{path:<8} {result['rps']:>10.0f} {result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f}"
+            f" {result['threads_peak']:>10} {result['threads_mean']:>10.1f}"
+        )
+
+    RedisService.delete(token_hash)
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:4]))
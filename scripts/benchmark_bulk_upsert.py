@@ -0,0 +1,122 @@
+"""
+Benchmark the old ORM bulk insert against the COPY and merge upsert for migrations.
+
+Seeds one throwaway user inside a transaction that is rolled back at the end. For a
+month and for five years of daily activities it times the old path (one ORM object per
+row saved with ``bulk_save_objects``) against ``merge_bulk_activities`` writing the
+same rows into an empty range, and again over rows already stored, where every row is
+an update. Each run is rolled back to a savepoint so runs start from the same state.
+Reports rows per second.
+
+Needs the database from DB_HOST/DB_PORT/DB_NAME with migrations applied.
+
+Usage: python -m scripts.benchmark_bulk_upsert [repeats]
+"""
+
+import sys
+import time
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from crud.activities_crud import merge_bulk_activities
+from db.session import Engine
+from models import Activity, User
+from schemas.activity import UserActivityRequestSchema
+
+START_DATE = 1420070400  # 2015-01-01
+CASES = (("1 month", 31), ("5 years", 5 * 365 + 1))
+
+
+def _seed_user(db: Session):
+    user = User(
+        id=uuid4(),
+        unique_id=str(uuid4()),
+        nhs_number="0000000000",
+        first_name="Benchmark",
+        gender="na",
+        identity_level="P9",
+    )
+    db.add(user)
+    db.flush()
+    return user.id
+
+
+def _activities(rows: int) -> list[UserActivityRequestSchema]:
+    return [
+        UserActivityRequestSchema(
+            date=START_DATE + day * 86400,
+            user_postcode="HD81",
+            user_age_range="23-39",
+            rewards=[{"earned": 1, "slug": "high_five"}],
+            activity={"brisk_minutes": 20, "walking_minutes": 40, "steps": 4000},
+        )
+        for day in range(rows)
+    ]
+
+
+def _orm_bulk_save(db: Session, activities: list[UserActivityRequestSchema], user_id) -> None:
+    db.bulk_save_objects(
+        [
+            Activity(
+                date=activity.date,
+                rewards=activity.rewards,
+                user_postcode=activity.user_postcode,
+                user_age_range=activity.user_age_range,
+                brisk_minutes=activity.activity.brisk_minutes,
+                walking_minutes=activity.activity.walking_minutes,
+                steps=activity.activity.steps,
+                user_id=user_id,
+            )
+            for activity in activities
+        ]
+    )
+    db.flush()
+
+
+def _rows_per_second(db: Session, fn, rows: int, repeats: int) -> float:
+    elapsed = 0.0
+    for _ in range(repeats):
+        savepoint = db.begin_nested()
+        start = time.perf_counter()
+        fn()
+        elapsed += time.perf_counter() - start
+        savepoint.rollback()
+    return rows * repeats / elapsed
+
+
+def run_benchmark(repeats: int = 5) -> None:
+    with Engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        user_id = _seed_user(db)
+
+        print(f"{repeats} repeats, rows per second")
+        print(
+            f"{'backfill':<10} {'rows':>6} {'orm insert':>12} {'merge new':>12} {'merge same':>12}"
+        )
+        for name, rows in CASES:
+            activities = _activities(rows)
+
+            orm = _rows_per_second(
+                db, lambda a=activities: _orm_bulk_save(db, a, user_id), rows, repeats
+            )
+            merge_insert = _rows_per_second(
+                db, lambda a=activities: merge_bulk_activities(db, a, user_id), rows, repeats
+            )
+
+            savepoint = db.begin_nested()
+            merge_bulk_activities(db, activities, user_id)
+            merge_update = _rows_per_second(
+                db, lambda a=activities: merge_bulk_activities(db, a, user_id), rows, repeats
+            )
+            savepoint.rollback()
+
+            print(f"{name:<10} {rows:>6} {orm:>12.0f} {merge_insert:>12.0f} {merge_update:>12.0f}")
+
+        db.close()
+        transaction.rollback()
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,111 @@
+"""
+Benchmark ORM hydration against column-projected reads for the list endpoints.
+
+Seeds one throwaway user with N daily targets and N activities inside a transaction
+that is rolled back at the end. For each table it times the old read path (ORM
+instances validated and serialised through the Pydantic response model, as FastAPI
+does with response_model) against the projected path (select of the response columns,
+mappings turned into dicts and serialised with orjson), and reports the CPU per row.
+
+Needs the database from DB_HOST/DB_PORT/DB_NAME with migrations applied.
+
+Usage: python -m scripts.benchmark_read_projection [rows] [repeats]
+"""
+
+import sys
+import time
+from uuid import uuid4
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from crud.activities_crud import ACTIVITY_RESPONSE_COLUMNS
+from crud.daily_target_crud import DAILY_TARGET_RESPONSE_COLUMNS
+from db.session import Engine
+from models import Activity, User, UserDailyTarget
+from schemas.activity import ActivityResponseSchema
+from schemas.daily_target import DailyTargetResponseSchema
+
+START_DATE = 1704067200  # 2024-01-01
+
+
+def _seed(db: Session, rows: int):
+    user = User(
+        id=uuid4(),
+        unique_id=str(uuid4()),
+        nhs_number="0000000000",
+        first_name="Benchmark",
+        gender="na",
+        identity_level="P9",
+    )
+    db.add(user)
+    db.flush()
+    for day in range(rows):
+        date = START_DATE + day * 86400
+        db.add(UserDailyTarget(user_id=user.id, date=date, daily_target=30))
+        db.add(
+            Activity(
+                date=date,
+                user_id=user.id,
+                user_postcode="HD81",
+                user_age_range="23-39",
+                brisk_minutes=20,
+                walking_minutes=40,
+                steps=4000,
+                rewards=[{"earned": 1, "slug": "high_five"}],
+            )
+        )
+    db.flush()
+    return user.id
+
+
+def _cpu_per_row(fn, rows: int, repeats: int) -> float:
+    fn()
+    start = time.process_time()
+    for _ in range(repeats):
+        fn()
+    return (time.process_time() - start) / repeats / rows * 1e6
+
+
+def run_benchmark(rows: int = 365, repeats: int = 50) -> None:
+    with Engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection)
+        user_id = _seed(db, rows)
+
+        cases = (
+            (
+                "daily_targets",
+                UserDailyTarget,
+                DAILY_TARGET_RESPONSE_COLUMNS,
+                DailyTargetResponseSchema,
+            ),
+            ("activities", Activity, ACTIVITY_RESPONSE_COLUMNS, ActivityResponseSchema),
+        )
+        print(f"{rows} rows, {repeats} repeats, CPU time per row")
+        print(f"{'table':<16} {'orm us':>10} {'projected us':>14} {'saved':>8}")
+        for name, model, columns, schema in cases:
+            adapter = TypeAdapter(list[schema])
+
+            def orm_path(model=model, adapter=adapter):
+                db.expunge_all()
+                items = db.scalars(select(model).where(model.user_id == user_id)).all()
+                return adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+
+            def projected_path(columns=columns, model=model):
+                result = db.execute(select(*columns).where(model.user_id == user_id))
+                return orjson.dumps([dict(row) for row in result.mappings()])
+
+            orm_us = _cpu_per_row(orm_path, rows, repeats)
+            projected_us = _cpu_per_row(projected_path, rows, repeats)
+            saved = 1 - projected_us / orm_us
+            print(f"{name:<16} {orm_us:>10.2f} {projected_us:>14.2f} {saved:>8.0%}")
+
+        db.close()
+        transaction.rollback()
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,54 @@
+"""
+Benchmark the per-call cost and payload size of the Redis value codecs.
+
+Compares the legacy pickle format against each codec for the auth cache entry and for a
+small profile-like dict. Runs without a Redis server; only serialization is measured.
+
+Usage: python -m scripts.benchmark_redis_codecs
+"""
+
+import pickle
+import timeit
+from uuid import uuid4
+
+from service.redis_codecs import CODECS, decode, encode
+
+ITERATIONS = 200_000
+
+AUTH_ENTRY = {"user_id": str(uuid4()), "valid": True}
+PROFILE_ENTRY = {
+    "id": str(uuid4()),
+    "first_name": "Default",
+    "email": "def...@example.com",
+    "gender": "na",
+    "age": 34,
+    "age_range": "25 to 34",
+    "postcode": "na",
+    "identity_level": "P9",
+    "email_preferences": [{"id": str(uuid4()), "name": "active10_mailing_list", "is_active": True}],
+}
+
+
+def _report(label: str, dumps, loads) -> None:
+    payload = dumps()
+    dumps_us = timeit.timeit(dumps, number=ITERATIONS) / ITERATIONS * 1e6
+    loads_us = timeit.timeit(lambda: loads(payload), number=ITERATIONS) / ITERATIONS * 1e6
+    print(f"{label:<24} {len(payload):>6} B {dumps_us:>10.3f} us {loads_us:>10.3f} us")
+
+
+def run_benchmark() -> None:
+    print(f"{'codec':<24} {'size':>8} {'dumps':>13} {'loads':>13}")
+    for entry_name, entry in (("auth", AUTH_ENTRY), ("profile", PROFILE_ENTRY)):
+        _report(f"{entry_name}/pickle", lambda e=entry: pickle.dumps(e), pickle.loads)
+        for codec in CODECS.values():
+            if codec.name == "auth" and entry is not AUTH_ENTRY:
+                continue
+            _report(
+                f"{entry_name}/{codec.name}",
+                lambda e=entry, c=codec: encode(e, c),
+                decode,
+            )
+
+
+if __name__ == "__main__":
+    run_benchmark()
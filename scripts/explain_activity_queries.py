@@ -0,0 +1,188 @@
+"""
+Record EXPLAIN (ANALYZE, BUFFERS) plans of the main activity endpoint queries.
+
+Seeds a fixed dataset into monthly partitions for the year 2000 inside a transaction that is
+rolled back at the end: one user with a daily activity and a crowd of other users. Each query
+is built by the same CRUD code the endpoints use. Plans are written to db/query_plans/ with
+timings dropped and buffer counts summed, so the files only change when a plan does. Commit
+them with any change to the activities schema or queries so the change shows up in review.
+With --check the plans are compared with the recorded ones instead, ignoring the numbers,
+and the script exits non-zero if any plan changed shape.
+
+It also reports, per activities partition, the size and the physical correlation of ``date``
+that decides whether the BRIN index on ``date`` can skip anything.
+
+Needs the database from DB_HOST/DB_PORT/DB_NAME with migrations applied.
+
+Usage: python -m scripts.explain_activity_queries [--check] [other_users]
+"""
+
+import re
+import sys
+from datetime import date
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import Connection, Select, text
+
+from crud.activities_crud import _select_activities
+from crud.activity_rollup_crud import _select_summary
+from db.session import Engine
+from service.activity_partition_manager import month_bounds, partition_name
+
+PLANS_DIR = Path(__file__).resolve().parent.parent / "db" / "query_plans"
+YEAR = 2000
+USER_ID = UUID(int=1)
+BRIN_MIN_PAGES = 1024
+BRIN_MIN_CORRELATION = 0.9
+
+BUFFERS_PATTERN = re.compile(r"Buffers: (.*)")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def _seed(connection: Connection, other_users: int) -> list[int]:
+    for month in range(1, 13):
+        lo, hi = month_bounds(date(YEAR, month, 1))
+        connection.execute(
+            text(
+                f"CREATE TABLE {partition_name(date(YEAR, month, 1))} PARTITION OF activities "
+                f"FOR VALUES FROM ({lo}) TO ({hi})"
+            )
+        )
+
+    start, _ = month_bounds(date(YEAR, 1, 1))
+    # One statement each, so the rollup triggers fire once. The uuids built here read the
+    # same as UUID(int=n), and rows go in by date as they would in production.
+    connection.execute(
+        text(
+            """
+            INSERT INTO users (id, unique_id, nhs_number, first_name, gender, identity_level)
+            SELECT id, id::text, '0000000000', 'Explain', 'na', 'P9'
+            FROM (
+                SELECT ('00000000-0000-0000-0000-' || lpad(to_hex(n), 12, '0'))::uuid AS id
+                FROM generate_series(1, :users) n
+            ) u
+            """
+        ),
+        {"users": other_users + 1},
+    )
+    connection.execute(
+        text(
+            """
+            INSERT INTO activities (id, date, user_id, user_postcode, user_age_range,
+                brisk_minutes, walking_minutes, steps, rewards)
+            SELECT
+                ('00000000-0000-0000-0000-' || lpad(to_hex(n * 1000 + day), 12, '0'))::uuid,
+                :start + day * 86400 + 43200,
+                ('00000000-0000-0000-0000-' || lpad(to_hex(n), 12, '0'))::uuid,
+                'HD81', '23-39', 20, 40, 4000,
+                ARRAY['{"earned": 1, "slug": "high_five"}'::json]
+            FROM generate_series(0, 365) day, generate_series(1, :users) n
+            ORDER BY day, n
+            """
+        ),
+        {"start": start, "users": other_users + 1},
+    )
+    connection.execute(text("ANALYZE activities"))
+    connection.execute(text("ANALYZE user_activity_daily_rollup"))
+    connection.execute(text("ANALYZE user_activity_weekly_rollup"))
+    connection.execute(text("ANALYZE user_activity_monthly_rollup"))
+    return [start + day * 86400 + 43200 for day in range(366)]
+
+
+def _queries(dates: list[int]) -> dict[str, Select]:
+    year = {"start_date": dates[0], "end_date": dates[-1]}
+    cursor = (dates[99], UUID(int=1000 + 99))
+    first_day, last_day = date(YEAR, 1, 1), date(YEAR, 12, 31)
+    return {
+        "activities_stream": _select_activities(USER_ID, year),
+        "activities_first_page": _select_activities(USER_ID, year).limit(101),
+        "activities_next_page": _select_activities(USER_ID, year, cursor).limit(101),
+        "activities_single_date": _select_activities(USER_ID, {"date": dates[180]}),
+        "activity_summary_day": _select_summary(USER_ID, "day", first_day, last_day),
+        "activity_summary_week": _select_summary(USER_ID, "week", first_day, last_day),
+        "activity_summary_month": _select_summary(USER_ID, "month", first_day, last_day),
+    }
+
+
+def _explain(connection: Connection, query: Select) -> str:
+    compiled = query.compile(dialect=connection.dialect)
+    rows = connection.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, COSTS OFF, TIMING OFF, SUMMARY OFF) {compiled}",
+        compiled.params,
+    ).scalars()
+
+    lines = []
+    for line in rows:
+        if line.strip() == "Planning:":
+            break
+        lines.append(
+            BUFFERS_PATTERN.sub(
+                lambda m: f"Buffers: {sum(map(int, NUMBER_PATTERN.findall(m[1])))}", line
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _partition_report(connection: Connection) -> None:
+    rows = connection.execute(
+        text(
+            """
+            SELECT c.relname, pg_relation_size(c.oid) / current_setting('block_size')::int,
+                   s.correlation
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            LEFT JOIN pg_stats s
+                ON s.tablename = c.relname AND s.attname = 'date' AND NOT s.inherited
+            WHERE i.inhparent = 'activities'::regclass AND c.relname NOT LIKE :seeded
+            ORDER BY c.relname
+            """
+        ),
+        {"seeded": f"activities_{YEAR}_%"},
+    ).all()
+
+    print(f"\n{'partition':<24} {'pages':>10} {'date corr':>10}  brin on date")
+    for name, pages, correlation in rows:
+        if pages < BRIN_MIN_PAGES:
+            verdict = "not needed, partition is small"
+        elif correlation is None:
+            verdict = "unknown, run ANALYZE"
+        elif abs(correlation) >= BRIN_MIN_CORRELATION:
+            verdict = "effective"
+        else:
+            verdict = "ineffective, rows are not stored in date order"
+        corr = "-" if correlation is None else f"{correlation:.2f}"
+        print(f"{name:<24} {pages:>10} {corr:>10}  {verdict}")
+
+
+def run(check: bool = False, other_users: int = 50) -> int:
+    changed = []
+    with Engine.connect() as connection:
+        transaction = connection.begin()
+        dates = _seed(connection, other_users)
+
+        for name, query in _queries(dates).items():
+            plan = _explain(connection, query)
+            path = PLANS_DIR / f"{name}.txt"
+            recorded = path.read_text() if path.exists() else ""
+            if check:
+                if NUMBER_PATTERN.sub("N", plan) != NUMBER_PATTERN.sub("N", recorded):
+                    changed.append(name)
+                    print(f"Plan changed for {name}:\n{plan}")
+            else:
+                PLANS_DIR.mkdir(exist_ok=True)
+                path.write_text(plan)
+                print(f"{name}:\n{plan}")
+
+        transaction.rollback()
+        _partition_report(connection)
+
+    if changed:
+        print(f"\n{len(changed)} plan(s) changed: {', '.join(changed)}")
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    check = "--check" in args
+    sys.exit(run(check, *(int(arg) for arg in args if arg != "--check")))
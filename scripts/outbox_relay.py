@@ -0,0 +1,22 @@
+"""
+Run the outbox relay, draining queued activity events to SNS and SQS.
+
+Runs until SIGINT or SIGTERM, finishing the current cycle before exiting. Several
+relays can run side by side.
+
+Usage: python -m scripts.outbox_relay
+"""
+
+import signal
+
+from service.outbox_relay import outbox_relay
+
+
+def main() -> None:
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: outbox_relay.stop())
+    outbox_relay.run_forever()
+
+
+if __name__ == "__main__":
+    main()
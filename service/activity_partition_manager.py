@@ -0,0 +1,283 @@
+import re
+import time
+from datetime import date, datetime, timezone
+
+from dateutil.relativedelta import relativedelta
+from psycopg.errors import LockNotAvailable
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import OperationalError
+
+from db.session import Engine as DefaultEngine
+from utils.base_config import config, logger
+from utils.month_buckets import month_bounds
+
+PARENT_TABLE = "activities"
+DEFAULT_PARTITION = "activities_default"
+PARTITION_MANAGER_LOCK_ID = 7264101
+LOCK_ATTEMPTS = 5
+
+PARTITION_BOUND_PATTERN = re.compile(r"FROM \('?([^')]+)'?\) TO \('?([^')]+)'?\)")
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+
+def _bound(value: str) -> float:
+    if value == "MINVALUE":
+        return float("-inf")
+    if value == "MAXVALUE":
+        return float("inf")
+    return int(value)
+
+
+class ActivityPartitionManager:
+    """
+    Keeps the monthly (UTC) partitions of the activities table ahead of the data.
+
+    Each run creates the partitions for the current month and the next ``months_ahead``
+    months, moves any month that has landed in the default partition out into its own
+    partition, and detaches partitions that ended more than ``retention_months`` ago.
+
+    New partitions are built as standalone tables with the parent's indexes, foreign
+    keys and a CHECK constraint matching their bounds, then attached. The default
+    partition gets a NOT VALID constraint excluding the month, validated separately,
+    so neither ATTACH nor the constraint has to scan a table while holding an ACCESS
+    EXCLUSIVE lock. While a month is being moved out of the default partition, writes
+    for that month are rejected until it is attached. Every DDL transaction runs with
+    a lock timeout and is retried, so the manager never queues behind long queries.
+    Only one manager runs at a time, guarded by an advisory lock.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        engine: Engine = DefaultEngine,
+        months_ahead: int = 3,
+        retention_months: int = 0,
+        archive_schema: str | None = "archive",
+        lock_timeout_ms: int = 5000,
+        dry_run: bool = False,
+    ) -> None:
+        """
+        Args:
+            engine (Engine): Engine to run the DDL with.
+            months_ahead (int): Number of months after the current one to create.
+            retention_months (int): Full months kept before the current one; 0 keeps all.
+            archive_schema (str | None): Schema detached partitions are moved to.
+                ``None`` leaves them in place.
+            lock_timeout_ms (int): Lock timeout of each DDL transaction.
+            dry_run (bool): Log the statements instead of running them.
+        """
+        self.engine = engine
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.archive_schema = archive_schema
+        self.lock_timeout_ms = lock_timeout_ms
+        self.dry_run = dry_run
+
+    def run(self, today: date | None = None) -> list[str]:
+        """
+        Bring the partitions in line with ``today``, which defaults to the current UTC day.
+
+        Returns:
+            list[str]: The statements run, or that would be run in dry-run mode.
+        """
+        today = today or datetime.now(timezone.utc).date()  # noqa: UP017 Not supported in Python 3.10
+        with self.engine.connect() as lock_connection:
+            locked = lock_connection.scalar(
+                text("SELECT pg_try_advisory_lock(:id)"), {"id": PARTITION_MANAGER_LOCK_ID}
+            )
+            lock_connection.commit()
+            if not locked:
+                logger.info("Activity partitions are being managed elsewhere, skipping")
+                return []
+            try:
+                return self._manage(today.replace(day=1))
+            finally:
+                lock_connection.execute(
+                    text("SELECT pg_advisory_unlock(:id)"), {"id": PARTITION_MANAGER_LOCK_ID}
+                )
+                lock_connection.commit()
+
+    def _manage(self, current_month: date) -> list[str]:
+        partitions = self._attached_partitions()
+        months_in_default = self._months_in_default()
+        months = {current_month + relativedelta(months=i) for i in range(self.months_ahead + 1)}
+
+        statements: list[str] = []
+        for month in sorted(months | months_in_default):
+            lo, hi = month_bounds(month)
+            overlapping = [
+                name for name, (p_lo, p_hi) in partitions.items() if lo < p_hi and p_lo < hi
+            ]
+            if overlapping:
+                if month in months_in_default:
+                    logger.warning(
+                        f"Rows for {month:%Y-%m} in {DEFAULT_PARTITION} overlap "
+                        f"{', '.join(overlapping)} and were left in place"
+                    )
+                continue
+            statements += self._create_partition(month, lo, hi, month in months_in_default)
+
+        if self.retention_months:
+            cutoff, _ = month_bounds(current_month - relativedelta(months=self.retention_months))
+            for name, (_, p_hi) in sorted(partitions.items()):
+                if p_hi <= cutoff:
+                    statements += self._retire_partition(name)
+
+        return statements
+
+    def _attached_partitions(self) -> dict[str, tuple[float, float]]:
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text(
+                    """
+                    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+                    FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    WHERE i.inhparent = CAST(:parent AS regclass)
+                    """
+                ),
+                {"parent": PARENT_TABLE},
+            ).all()
+
+        partitions = {}
+        for name, bound in rows:
+            match = PARTITION_BOUND_PATTERN.search(bound)
+            if match:
+                partitions[name] = (_bound(match[1]), _bound(match[2]))
+        return partitions
+
+    def _months_in_default(self) -> set[date]:
+        with self.engine.connect() as connection:
+            return set(
+                connection.execute(
+                    text(
+                        f"""
+                        SELECT DISTINCT
+                            CAST(date_trunc('month', to_timestamp(date) AT TIME ZONE 'UTC') AS date)
+                        FROM {DEFAULT_PARTITION}
+                        """
+                    )
+                ).scalars()
+            )
+
+    def _constraints(self, table: str) -> dict[str, str]:
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text(
+                    """
+                    SELECT con.conname, con.contype
+                    FROM pg_constraint con
+                    JOIN pg_class c ON c.oid = con.conrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE c.relname = :table AND n.nspname = current_schema()
+                    """
+                ),
+                {"table": table},
+            ).all()
+        return dict(rows)
+
+    def _foreign_keys(self) -> list[str]:
+        with self.engine.connect() as connection:
+            return list(
+                connection.execute(
+                    text(
+                        """
+                        SELECT pg_get_constraintdef(oid)
+                        FROM pg_constraint
+                        WHERE conrelid = CAST(:parent AS regclass) AND contype = 'f'
+                        ORDER BY conname
+                        """
+                    ),
+                    {"parent": PARENT_TABLE},
+                ).scalars()
+            )
+
+    def _create_partition(self, month: date, lo: int, hi: int, move_rows: bool) -> list[str]:
+        name = partition_name(month)
+        bounds_check = f"{name}_date_bounds"
+        exclusion = f"{DEFAULT_PARTITION}_not_{month:%Y_%m}"
+        constraints = self._constraints(name)
+        default_constraints = self._constraints(DEFAULT_PARTITION)
+
+        prepare = []
+        if move_rows:
+            prepare.append(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE")
+        prepare.append(f"CREATE TABLE IF NOT EXISTS {name} (LIKE {PARENT_TABLE} INCLUDING ALL)")
+        if "f" not in constraints.values():
+            prepare += [f"ALTER TABLE {name} ADD {fk}" for fk in self._foreign_keys()]
+        if bounds_check not in constraints:
+            prepare.append(
+                f"ALTER TABLE {name} ADD CONSTRAINT {bounds_check} "
+                f"CHECK (date >= {lo} AND date < {hi})"
+            )
+        if move_rows:
+            prepare.append(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                f"WHERE date >= {lo} AND date < {hi} RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            )
+        if exclusion not in default_constraints:
+            prepare.append(
+                f"ALTER TABLE {DEFAULT_PARTITION} ADD CONSTRAINT {exclusion} "
+                f"CHECK (date < {lo} OR date >= {hi}) NOT VALID"
+            )
+
+        return [
+            *self._apply(prepare),
+            *self._apply([f"ALTER TABLE {DEFAULT_PARTITION} VALIDATE CONSTRAINT {exclusion}"]),
+            *self._apply(
+                [
+                    f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ({lo}) TO ({hi})",
+                    f"ALTER TABLE {DEFAULT_PARTITION} DROP CONSTRAINT {exclusion}",
+                ]
+            ),
+        ]
+
+    def _retire_partition(self, name: str) -> list[str]:
+        statements = [f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"]
+        if self.archive_schema:
+            statements += [
+                f"CREATE SCHEMA IF NOT EXISTS {self.archive_schema}",
+                f"ALTER TABLE {name} SET SCHEMA {self.archive_schema}",
+            ]
+        return self._apply(statements)
+
+    def _apply(self, statements: list[str]) -> list[str]:
+        """Run ``statements`` in one transaction, retrying when a lock is not granted in time."""
+        for statement in statements:
+            logger.info(f"{'[dry run] ' if self.dry_run else ''}{statement}")
+        if self.dry_run:
+            return statements
+
+        for attempt in range(1, LOCK_ATTEMPTS + 1):
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(text(f"SET LOCAL lock_timeout = {self.lock_timeout_ms:d}"))
+                    for statement in statements:
+                        connection.execute(text(statement))
+                return statements
+            except OperationalError as e:
+                if not isinstance(e.orig, LockNotAvailable) or attempt == LOCK_ATTEMPTS:
+                    raise
+                logger.warning(f"Lock not granted for activity partition DDL, retry {attempt}")
+                time.sleep(attempt)
+        return statements
+
+
+def manage_activity_partitions() -> None:
+    """Run the configured partition manager, logging instead of raising on failure."""
+    try:
+        activity_partition_manager.run()
+    except Exception as e:
+        logger.error(f"Error occurred while managing activity partitions: {e}")
+
+
+activity_partition_manager = ActivityPartitionManager(
+    months_ahead=config.activity_partitions_months_ahead,
+    retention_months=config.activity_partitions_retention_months,
+    archive_schema=config.activity_partitions_archive_schema or None,
+    lock_timeout_ms=config.activity_partitions_lock_timeout_ms,
+)
@@ -1,6 +1,17 @@
+import base64
+import binascii
+from collections.abc import Iterable, Iterator
+from typing import Any
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException
+
+from crud.outbox_crud import AsyncOutboxCRUD
+from models.outbox import OutboxDestination
 from schemas.activity import UserActivityRequestSchema
-from service.aws_sns_service import send_message_to_sns_topic
 from service.aws_sqs_service import send_message_to_sqs_queue
+from service.sns_batch_publisher import DEFAULT_SUBJECT, activity_publisher
 from utils.base_config import config as settings
 
 
@@ -12,9 +23,73 @@ def load_activity_data(activity: UserActivityRequestSchema, user_id) -> None:
     send_message_to_sqs_queue(sqs_target_url=target_sqs_url, record=activity_payload)
 
 
-def load_activities_data_in_sns(activity: UserActivityRequestSchema, user_id) -> None:
+async def load_activities_data_in_sns(
+    activity: UserActivityRequestSchema, user_id, outbox_crud: AsyncOutboxCRUD
+) -> bool:
+    """
+    Queue an activity for the SNS activity topic.
+
+    The activity is written to the outbox and relayed by the outbox relay, or handed to
+    the in-process batched publisher when the outbox is disabled.
+
+    :param activity: activity from request payload
+    :param user_id: user id
+    :param outbox_crud: outbox data access object
+
+    :return: False if the publisher queue is full and the activity was not queued.
+    """
     activity_payload = activity.model_dump()
     activity_payload["user_id"] = str(user_id)
     target_sns_topic_arn = settings.aws_sns_activity_topic_arn
 
-    send_message_to_sns_topic(topic=target_sns_topic_arn, record=activity_payload)
+    if settings.activity_outbox_enabled:
+        await outbox_crud.append(
+            OutboxDestination.SNS, target_sns_topic_arn, activity_payload, subject=DEFAULT_SUBJECT
+        )
+        return True
+
+    return activity_publisher.submit(topic=target_sns_topic_arn, record=activity_payload)
+
+
+def encode_activity_cursor(activity: dict[str, Any]) -> str:
+    """
+    Encode the ``(date, id)`` keyset position of an activity as an opaque cursor.
+
+    :param activity: last activity row of a page
+
+    :return: url-safe cursor string
+    """
+    raw = f"{activity['date']}:{activity['id']}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_activity_cursor(cursor: str) -> tuple[int, UUID]:
+    """
+    Decode a cursor produced by encode_activity_cursor.
+
+    :param cursor: cursor from the request
+
+    :return: (date, id) of the last activity already returned
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date, activity_id = raw.split(":", 1)
+        return int(date), UUID(activity_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def iter_ndjson(chunks: Iterable[list[dict[str, Any]]]) -> Iterator[bytes]:
+    """Serialise row chunks as newline-delimited JSON, one write per chunk."""
+    for chunk in chunks:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in chunk)
+
+
+def iter_json_array(chunks: Iterable[list[dict[str, Any]]]) -> Iterator[bytes]:
+    """Serialise row chunks as a single JSON array, one write per chunk."""
+    separator = b"["
+    for chunk in chunks:
+        if chunk:
+            yield separator + b",".join(orjson.dumps(row) for row in chunk)
+            separator = b","
+    yield b"[]" if separator == b"[" else b"]"
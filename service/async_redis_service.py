@@ -0,0 +1,299 @@
+import asyncio
+from typing import Any
+
+import redis.asyncio as aioredis
+from redis.asyncio.connection import Connection, SSLConnection
+
+from service.auth_cache_service import AUTH_INVALIDATION_CHANNEL, local_auth_cache
+from service.redis_codecs import AuthCodec, RedisCodec, decode, encode, get_codec
+from service.redis_service import (
+    DEFAULT_AUTH_TTL,
+    USER_PROFILE_RESOURCE,
+    RedisService,
+    new_resource_version,
+    resource_version_key,
+    user_profile_cache_key,
+)
+from utils.async_utils import close_on_loop
+from utils.base_config import config, logger
+
+
+class AsyncRedisService:
+    """
+    AsyncRedisService mirrors RedisService on top of redis.asyncio so async routes and
+    dependencies can talk to Redis without borrowing a threadpool worker.
+
+    It keeps its own connection pool. asyncio connections are bound to the event loop
+    that created them, so the pool is rebuilt if it is used from a different loop, and
+    the previous pool is disconnected on its own loop.
+    """
+
+    _pool: aioredis.ConnectionPool | None = None
+    _client: aioredis.Redis | None = None
+    _loop: asyncio.AbstractEventLoop | None = None
+    codec: RedisCodec = get_codec(config.redis_codec)
+    auth_codec: RedisCodec = AuthCodec()
+
+    hash_token = staticmethod(RedisService.hash_token)
+
+    @classmethod
+    def initialize_pool(cls) -> None:
+        """
+        Initialize the asyncio Redis connection pool and client for the running loop.
+
+        Connections are opened lazily on first command, so this does no network I/O.
+        """
+        try:
+            cls._pool = aioredis.ConnectionPool(
+                connection_class=SSLConnection if config.redis_use_ssl else Connection,
+                host=config.redis_host,
+                port=config.redis_port,
+                db=config.redis_db,
+                password=config.redis_password if config.redis_password else None,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                retry_on_timeout=True,
+                decode_responses=False,
+            )
+            # The client owns the pool, so closing it disconnects the pooled connections
+            cls._client = aioredis.Redis.from_pool(cls._pool)
+            cls._loop = asyncio.get_running_loop()
+            logger.info("Async Redis connection pool and client created successfully")
+        except Exception as e:
+            logger.error(f"Failed to create async Redis connection pool: {e}")
+            cls._pool = None
+            cls._client = None
+            cls._loop = None
+
+    @classmethod
+    def get_client(cls) -> aioredis.Redis | None:
+        """
+        Retrieve the asyncio Redis client, creating it for the running loop if needed.
+
+        Returns:
+            Async Redis client instance if available, else None.
+        """
+        if cls._client is None or cls._loop is not asyncio.get_running_loop():
+            if cls._client is not None:
+                close_on_loop(cls._client.aclose, cls._loop)
+            cls.initialize_pool()
+        return cls._client
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the client and disconnect every pooled connection, on the loop they use."""
+        if cls._client is not None:
+            if cls._loop is asyncio.get_running_loop():
+                await cls._client.aclose()
+            else:
+                close_on_loop(cls._client.aclose, cls._loop)
+        cls._pool = None
+        cls._client = None
+        cls._loop = None
+
+    @classmethod
+    async def set(
+        cls,
+        key: str,
+        value: Any,
+        ttl: int | None = DEFAULT_AUTH_TTL,
+        codec: RedisCodec | None = None,
+    ) -> bool:
+        """
+        Set a key-value pair in Redis with optional expiration time (TTL).
+
+        Args:
+            key (str): The Redis key to set.
+            value (Any): The Python object to serialize and store.
+            ttl (int, optional): Time-to-live in seconds. If None, no expiry.
+            codec (RedisCodec, optional): Codec to serialize with. Defaults to cls.codec.
+
+        Returns:
+            bool: True if operation succeeded, False on failure.
+        """
+        client = cls.get_client()
+        if client is None:
+            return False
+        try:
+            serialized_value = encode(value, codec or cls.codec)
+            if ttl:
+                return bool(await client.setex(key, ttl, serialized_value))
+            else:
+                return bool(await client.set(key, serialized_value))
+        except Exception as e:
+            logger.error(f"Error setting Redis key {key}: {e}")
+            return False
+
+    @classmethod
+    async def get(cls, key: str) -> Any | None:
+        """
+        Retrieve and deserialize a value stored by key from Redis.
+
+        Args:
+            key (str): The Redis key to fetch.
+
+        Returns:
+            Any: The deserialized value, or None if key does not exist or on error.
+        """
+        client = cls.get_client()
+        if client is None:
+            return None
+        try:
+            serialized_value = await client.get(key)
+            if serialized_value is None:
+                return None
+            return decode(serialized_value, config.redis_allow_legacy_pickle)
+        except Exception as e:
+            logger.error(f"Error getting Redis key {key}: {e}")
+            return None
+
+    @classmethod
+    async def delete(cls, key: str) -> bool:
+        """
+        Delete a key from Redis.
+
+        Args:
+            key (str): The Redis key to delete.
+
+        Returns:
+            bool: True if key was deleted, False otherwise or on error.
+        """
+        client = cls.get_client()
+        if client is None:
+            return False
+        try:
+            return bool(await client.delete(key))
+        except Exception as e:
+            logger.error(f"Error deleting Redis key {key}: {e}")
+            return False
+
+    @classmethod
+    async def set_if_absent(cls, key: str, value: Any, ttl: int) -> bool:
+        """
+        Set a key only if it does not exist yet, e.g. to take a short-lived lock.
+
+        Args:
+            key (str): The Redis key to set.
+            value (Any): The Python object to serialize and store.
+            ttl (int): Time-to-live in seconds.
+
+        Returns:
+            bool: True if the key was set, False if it already existed or on failure.
+        """
+        client = cls.get_client()
+        if client is None:
+            return False
+        try:
+            return bool(await client.set(key, encode(value, cls.codec), ex=ttl, nx=True))
+        except Exception as e:
+            logger.error(f"Error setting Redis key {key}: {e}")
+            return False
+
+    @classmethod
+    async def publish(cls, channel: str, message: str) -> bool:
+        """
+        Publish a message on a Redis pub/sub channel.
+
+        Args:
+            channel (str): The channel to publish on.
+            message (str): The message payload.
+
+        Returns:
+            bool: True if the message was published, False on failure.
+        """
+        client = cls.get_client()
+        if client is None:
+            return False
+        try:
+            await client.publish(channel, message)
+            return True
+        except Exception as e:
+            logger.error(f"Error publishing to Redis channel {channel}: {e}")
+            return False
+
+    @classmethod
+    async def set_auth_cache(
+        cls, token_hash: str, user_id: str, ttl: int = DEFAULT_AUTH_TTL, valid: bool = True
+    ) -> bool:
+        """
+        Store authentication data in the cache using a hashed token as the key.
+
+        Args:
+            token_hash (str): The hashed authentication token.
+            user_id (str): The identifier of the user associated with the token.
+            ttl (int, optional): Time-to-live in seconds for the cache entry.
+            valid (bool, optional): Whether the token should be valid (True) or not (False).
+
+        Returns:
+            bool: True if the data was successfully cached, False otherwise.
+        """
+        cache_data = {"user_id": user_id, "valid": valid}
+        return await cls.set(token_hash, cache_data, ttl, codec=cls.auth_codec)
+
+    @classmethod
+    async def get_auth_cache(cls, token_hash: str) -> Any | None:
+        """
+        Retrieve authentication data from the cache.
+
+        Args:
+            token_hash (str): The hashed authentication token.
+
+        Returns:
+            Any: Cached user data if found, otherwise None.
+        """
+        return await cls.get(token_hash)
+
+    @classmethod
+    async def delete_auth_cache(cls, token_hash: str, user_id: str | None) -> bool:
+        """
+        Remove authentication data from the cache and invalidate it on every worker.
+
+        Args:
+            token_hash (str): The hashed authentication token.
+            user_id (str, optional): The identifier of the user associated
+                with the token. Defaults to None.
+
+        Returns:
+            bool: True if the cache entry was deleted successfully.
+        """
+        try:
+            deleted_cache = await cls.delete(token_hash)
+            local_auth_cache.invalidate(token_hash)
+            _ = await cls.publish(AUTH_INVALIDATION_CHANNEL, token_hash)
+            logger.info(f"Deleted Cache for user {user_id}: token_cache={deleted_cache}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting user session {user_id}: {e}")
+            raise
+
+    @classmethod
+    async def delete_user_profile_cache(cls, user_id: str) -> bool:
+        """
+        Drop a user's cached profile after a write to the user or their motivations,
+        activity levels or email preferences, and give the profile a new version so its
+        ETag changes.
+
+        Args:
+            user_id (str): The user ID.
+
+        Returns:
+            bool: True if a cached profile was deleted, False otherwise.
+        """
+        await cls.set(
+            resource_version_key(USER_PROFILE_RESOURCE, user_id),
+            new_resource_version(),
+            config.user_profile_cache_ttl,
+        )
+        return await cls.delete(user_profile_cache_key(user_id))
+
+
+async def get_async_redis_service() -> AsyncRedisService:
+    """
+    FastAPI dependency function to provide the AsyncRedisService singleton.
+
+    Declared async so FastAPI resolves it on the event loop, not in the threadpool.
+
+    Returns:
+        AsyncRedisService: The AsyncRedisService class for Redis operations.
+    """
+    return AsyncRedisService()
@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from utils.base_config import config
+
+AUTH_INVALIDATION_CHANNEL = "auth-cache-invalidation"
+
+meter = metrics.get_meter("active10.auth-cache")
+
+
+class LocalAuthCache:
+    """
+    Bounded, in-process LRU cache of auth results that sits in front of Redis.
+
+    Entries expire after a short TTL, which is further capped by the JWT ``exp`` claim,
+    so a token can never outlive its own expiry in the local tier. Negative entries
+    (``valid=False``) are cached the same way so known-bad tokens are rejected without
+    a Redis round trip. Cross-worker invalidation is delivered via Redis pub/sub, see
+    ``RedisService.start_auth_invalidation_listener``.
+
+    Lookups are counted by result (hit, miss) in the ``auth.local_cache.requests``
+    counter, invalidations in ``auth.local_cache.invalidations``, and the number of
+    entries is reported by the ``auth.local_cache.size`` gauge.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        """
+        Args:
+            max_size (int): Maximum number of entries held. 0 disables the cache.
+            ttl (int): Maximum lifetime of an entry in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self._requests_counter = meter.create_counter(
+            "auth.local_cache.requests",
+            unit="{request}",
+            description="Local auth cache lookups by result",
+        )
+        self._invalidations_counter = meter.create_counter(
+            "auth.local_cache.invalidations",
+            unit="{entry}",
+            description="Entries dropped from the local auth cache by invalidation",
+        )
+        meter.create_observable_gauge(
+            "auth.local_cache.size",
+            callbacks=[self._observe_size],
+            unit="{entry}",
+            description="Entries held in the local auth cache",
+        )
+
+    def get(self, token_hash: str) -> dict[str, Any] | None:
+        """
+        Retrieve authentication data for a hashed token.
+
+        Args:
+            token_hash (str): The hashed authentication token.
+
+        Returns:
+            dict: A copy of the cached auth data, or None on a miss or expired entry.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[token_hash]
+                self.misses += 1
+                data = None
+            else:
+                self._entries.move_to_end(token_hash)
+                self.hits += 1
+                data = dict(entry[1])
+
+        self._requests_counter.add(1, {"result": "miss" if data is None else "hit"})
+        return data
+
+    def set(
+        self, token_hash: str, user_id: str, token_exp: float | None = None, valid: bool = True
+    ) -> bool:
+        """
+        Store authentication data for a hashed token.
+
+        Args:
+            token_hash (str): The hashed authentication token.
+            user_id (str): The identifier of the user associated with the token.
+            token_exp (float, optional): The JWT ``exp`` claim (unix timestamp). When given,
+                the entry never outlives it.
+            valid (bool, optional): Whether the token is valid (True) or not (False).
+
+        Returns:
+            bool: True if the entry was stored, False if caching is disabled or the
+                token has already expired.
+        """
+        if self.max_size <= 0:
+            return False
+
+        ttl = float(self.ttl)
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return False
+
+        with self._lock:
+            self._entries[token_hash] = (
+                time.monotonic() + ttl,
+                {"user_id": str(user_id), "valid": valid},
+            )
+            self._entries.move_to_end(token_hash)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self, token_hash: str) -> None:
+        """
+        Drop a single entry from the cache.
+
+        Args:
+            token_hash (str): The hashed authentication token.
+        """
+        with self._lock:
+            invalidated = self._entries.pop(token_hash, None) is not None
+            if invalidated:
+                self.invalidations += 1
+        if invalidated:
+            self._invalidations_counter.add(1)
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. when invalidation messages may have been missed."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Report hit/miss counters for the local tier.
+
+        Returns:
+            dict: Hits, misses, invalidations and the current number of entries.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+    def _observe_size(self, _options: CallbackOptions):
+        yield Observation(len(self._entries))
+
+
+local_auth_cache = LocalAuthCache(
+    max_size=config.auth_local_cache_max_size,
+    ttl=config.auth_local_cache_ttl,
+)
@@ -1,10 +1,21 @@
 import json
+from functools import lru_cache
+from typing import Any
 
 import boto3
 
 from utils.base_config import logger
 
-sns = boto3.client("sns")
+
+@lru_cache(maxsize=1)
+def get_sns_client() -> Any:
+    """
+    Return the boto3 SNS client, created on first use.
+
+    The client comes from its own session because creating clients from the default
+    session isn't thread safe, and warm-up creates clients concurrently.
+    """
+    return boto3.session.Session().client("sns")
 
 
 def send_message_to_sns_topic(topic, record) -> None:
@@ -17,7 +28,7 @@ def send_message_to_sns_topic(topic, record) -> None:
     return None
     """
     try:
-        response = sns.publish(
+        response = get_sns_client().publish(
             TopicArn=topic, Message=json.dumps(record), Subject="activity-daily-data"
         )
 
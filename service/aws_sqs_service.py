@@ -1,10 +1,16 @@
 import json
+from functools import lru_cache
+from typing import Any
 
 import boto3
 
 from utils.base_config import logger
 
-sqs = boto3.client("sqs")
+
+@lru_cache(maxsize=1)
+def get_sqs_client() -> Any:
+    """Return the boto3 SQS client, created on first use, see ``get_sns_client``."""
+    return boto3.session.Session().client("sqs")
 
 
 def send_message_to_sqs_queue(sqs_target_url, record) -> None:
@@ -17,7 +23,7 @@ def send_message_to_sqs_queue(sqs_target_url, record) -> None:
     return None
     """
     try:
-        response = sqs.send_message(
+        response = get_sqs_client().send_message(
             QueueUrl=sqs_target_url,
             MessageBody=json.dumps(record),
             MessageGroupId="Active10-Data",
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from db.session import AsyncEngine as AppAsyncEngine
+from db.session import Engine as AppEngine
+from service.aws_sqs_service import get_sqs_client
+from service.redis_service import RedisService
+from utils.base_config import config, logger
+
+Probe = Callable[[], Awaitable[dict[str, Any]]]
+
+
+def pool_stats(engine: Engine, max_overflow: int) -> dict[str, Any]:
+    """
+    Return how much of an engine's connection pool is in use.
+
+    Args:
+        engine (Engine): The engine, sync or the ``sync_engine`` of an async one.
+        max_overflow (int): The ``max_overflow`` the engine was created with.
+
+    Returns:
+        dict: Pool size, connections checked out, overflow and utilisation (0 to 1).
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {}
+    capacity = pool.size() + max_overflow
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "utilisation": round(checked_out / capacity, 3) if capacity else None,
+    }
+
+
+def postgres_probe(engine: Engine, max_overflow: int) -> Probe:
+    """Probe that runs ``SELECT 1`` on a sync engine's pool and reports its utilisation."""
+
+    def _select_one() -> None:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    async def probe() -> dict[str, Any]:
+        stats = pool_stats(engine, max_overflow)
+        # Waiting on an exhausted pool would only add to the queue
+        if stats and stats["checked_out"] >= stats["capacity"]:
+            raise RuntimeError("Connection pool exhausted")
+        await run_in_threadpool(_select_one)
+        return pool_stats(engine, max_overflow)
+
+    return probe
+
+
+def async_postgres_probe(engine: AsyncEngine, max_overflow: int) -> Probe:
+    """Probe that runs ``SELECT 1`` on an async engine's pool and reports its utilisation."""
+
+    async def probe() -> dict[str, Any]:
+        stats = pool_stats(engine.sync_engine, max_overflow)
+        if stats and stats["checked_out"] >= stats["capacity"]:
+            raise RuntimeError("Connection pool exhausted")
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        return pool_stats(engine.sync_engine, max_overflow)
+
+    return probe
+
+
+async def redis_probe() -> dict[str, Any]:
+    """Probe that pings Redis through the RedisService connection pool."""
+
+    def _ping() -> None:
+        client = RedisService.get_client()
+        if client is None:
+            raise RuntimeError("Redis unavailable")
+        client.ping()
+
+    await run_in_threadpool(_ping)
+    return {}
+
+
+async def sqs_probe() -> dict[str, Any]:
+    """Probe that reads the activity queue's attributes with the SQS client."""
+    await run_in_threadpool(
+        get_sqs_client().get_queue_attributes,
+        QueueUrl=config.aws_sqs_queue_url,
+        AttributeNames=["QueueArn"],
+    )
+    return {}
+
+
+class HealthCheck:
+    """
+    Dependency probes behind the readiness endpoint.
+
+    Probes run concurrently, each bounded by ``timeout``. The result is cached for
+    ``cache_ttl`` seconds and concurrent checks share one run, so however often the load
+    balancer asks, each dependency is probed at most once per ``cache_ttl``.
+    """
+
+    def __init__(self, timeout: float = 2.0, cache_ttl: float = 5.0) -> None:
+        """
+        Args:
+            timeout (float): Seconds a probe may take before it's reported failed.
+            cache_ttl (float): Seconds a result is reused for.
+        """
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.probes: dict[str, Probe] = {}
+        self._result: dict[str, Any] | None = None
+        self._checked_at = 0.0
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def register(self, name: str, probe: Probe) -> None:
+        self.probes[name] = probe
+
+    async def check(self) -> dict[str, Any]:
+        """
+        Return the latest probe results, probing again if they're older than ``cache_ttl``.
+
+        Returns:
+            dict: ``healthy`` and, per probe, its status, duration and details.
+        """
+        # asyncio.Lock is bound to the loop it's first used on
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._lock:
+            if self._result is None or time.monotonic() - self._checked_at >= self.cache_ttl:
+                self._result = await self._run()
+                self._checked_at = time.monotonic()
+            return self._result
+
+    async def _run(self) -> dict[str, Any]:
+        names = list(self.probes)
+        results = await asyncio.gather(*(self._run_probe(name) for name in names))
+        checks = dict(zip(names, results, strict=True))
+        return {
+            "healthy": all(check["status"] == "ok" for check in checks.values()),
+            "checks": checks,
+        }
+
+    async def _run_probe(self, name: str) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(self.probes[name](), self.timeout)
+        except asyncio.TimeoutError:  # noqa: UP041 Not supported in Python 3.10
+            result = {"status": "timeout"}
+        except Exception as e:
+            logger.warning(f"Health probe {name} failed: {e!r}")
+            result = {"status": "error", "error": type(e).__name__}
+        else:
+            result = {"status": "ok", **details}
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+
+health_check = HealthCheck(timeout=config.health_probe_timeout, cache_ttl=config.health_cache_ttl)
+health_check.register("postgres", postgres_probe(AppEngine, config.db_max_overflow))
+health_check.register(
+    "postgres_async", async_postgres_probe(AppAsyncEngine, config.db_async_max_overflow)
+)
+health_check.register("redis", redis_probe)
+if config.health_probe_aws:
+    health_check.register("sqs", sqs_probe)
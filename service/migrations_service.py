@@ -1,7 +1,25 @@
-from schemas.migrations_schema import ActivitiesMigrationsRequestSchema
+from fastapi.concurrency import run_in_threadpool
+
+from crud.outbox_crud import AsyncOutboxCRUD
+from models.outbox import OutboxDestination
+from schemas.activity import UserActivityRequestSchema
+from schemas.migrations_schema import MAX_MONTH_ACTIVITIES, ActivitiesMigrationsRequestSchema
 from service.aws_sns_service import send_message_to_sns_topic
 from service.aws_sqs_service import send_message_to_sqs_queue
+from service.sns_batch_publisher import DEFAULT_SUBJECT
 from utils.base_config import config as settings
+from utils.month_buckets import all_in_month, month_start
+
+
+def activities_within_month(data: ActivitiesMigrationsRequestSchema) -> bool:
+    """
+    Check every activity falls in the UTC month containing ``data.month``.
+
+    :param data: migration data from request payload
+
+    :return: True if no activity is out of the month range
+    """
+    return all_in_month([activity.date for activity in data.activities], data.month)
 
 
 def load_bulk_activities_data(data: ActivitiesMigrationsRequestSchema, user_id: str) -> None:
@@ -36,3 +54,105 @@ def publish_bulk_activities_data_to_sns(
     target_sns_topic_arn = settings.aws_sns_activities_migration_topic_arn
 
     send_message_to_sns_topic(topic=target_sns_topic_arn, record=activities_migration_payload)
+
+
+async def queue_bulk_activities_data_in_outbox(
+    data: ActivitiesMigrationsRequestSchema, user_id: str, outbox_crud: AsyncOutboxCRUD
+) -> None:
+    """
+    Write bulk activities data to the outbox for the SNS migration topic.
+
+    :param data: migration data from request payload
+    :param user_id: user id
+    :param outbox_crud: outbox data access object
+
+    :return: None
+    """
+    activities_migration_payload = data.model_dump()
+    activities_migration_payload["user_id"] = str(user_id)
+    target_sns_topic_arn = settings.aws_sns_activities_migration_topic_arn
+
+    await outbox_crud.append(
+        OutboxDestination.SNS,
+        target_sns_topic_arn,
+        activities_migration_payload,
+        subject=DEFAULT_SUBJECT,
+    )
+
+
+async def publish_month_of_activities(
+    data: ActivitiesMigrationsRequestSchema, user_id: str, outbox_crud: AsyncOutboxCRUD
+) -> None:
+    """
+    Send one month of migrated activities on, through the outbox when it's enabled.
+
+    :param data: migration data for one month
+    :param user_id: user id
+    :param outbox_crud: outbox data access object
+
+    :return: None
+    """
+    if settings.activity_outbox_enabled:
+        await queue_bulk_activities_data_in_outbox(data, user_id, outbox_crud)
+    else:
+        await run_in_threadpool(publish_bulk_activities_data_to_sns, data, user_id)
+
+
+class MonthlyActivityBatcher:
+    """
+    Groups a stream of activities into the per-month payloads migrations are sent as.
+
+    Activities are buffered per UTC month. A month's batch is closed once it holds
+    ``MAX_MONTH_ACTIVITIES`` activities. While the stream is ordered by date, the open
+    month is closed as soon as a later month starts, so each month is sent in one payload
+    as early as possible. Once an activity goes back to an earlier month, months are kept
+    open until more than ``max_open_months`` are open, and then the earliest is closed.
+    An unordered stream therefore still only ever buffers ``max_open_months`` months; its
+    months are just sent in more than one payload.
+    """
+
+    def __init__(self, max_open_months: int = 2) -> None:
+        self.max_open_months = max(1, max_open_months)
+        self._open: dict[int, list[UserActivityRequestSchema]] = {}
+        self._latest_month: int | None = None
+        self._ordered = True
+
+    def add(self, activity: UserActivityRequestSchema) -> list[ActivitiesMigrationsRequestSchema]:
+        """
+        Buffer an activity.
+
+        :param activity: the next activity of the stream
+
+        :return: the batches the activity closed, usually none
+
+        :raises ValueError: if the activity's date is not in a month a migration can be
+            sent for, i.e. before February 1970 or beyond what ``datetime`` supports
+        """
+        try:
+            month = month_start(activity.date)
+        except (OverflowError, OSError, ValueError) as e:
+            raise ValueError(f"Activity date {activity.date} is out of range") from e
+        if month <= 0:
+            raise ValueError(f"Activity date {activity.date} is out of range")
+
+        closed = []
+        if self._latest_month is not None and month < self._latest_month:
+            self._ordered = False
+        elif self._ordered and month != self._latest_month:
+            closed += [self._close(open_month) for open_month in sorted(self._open)]
+        self._latest_month = max(month, self._latest_month or month)
+
+        batch = self._open.setdefault(month, [])
+        batch.append(activity)
+        if len(batch) >= MAX_MONTH_ACTIVITIES:
+            closed.append(self._close(month))
+        if len(self._open) > self.max_open_months:
+            closed.append(self._close(min(self._open)))
+        return closed
+
+    def flush(self) -> list[ActivitiesMigrationsRequestSchema]:
+        """Close every open batch, earliest month first."""
+        return [self._close(month) for month in sorted(self._open)]
+
+    def _close(self, month: int) -> ActivitiesMigrationsRequestSchema:
+        return ActivitiesMigrationsRequestSchema(month=month, activities=self._open.pop(month))
@@ -9,7 +9,7 @@ from crud.user_crud import UserCRUD
 from models import UserStatus
 from models.user import User
 from nhs.authenticator import Authenticator
-from nhs.pds import PDSClient
+from nhs.pds import pds_client
 from schemas.user import NHSUser
 from service.open_telemetry_service import (
     STEP_AUTHORIZATION_RESPONSE,
@@ -17,6 +17,7 @@ from service.open_telemetry_service import (
     STEP_SESSION_WRITE,
     STEP_TOKEN_EXCHANGE,
     STEP_USERINFO,
+    LatencyBudget,
     auth_step_span,
 )
 from utils.base_config import config
@@ -37,7 +38,7 @@ class NHSLoginService:
     ) -> None:
         self.userCRUD = user_crud
         self.token_crud = user_token_crud
-        self.pds_client = PDSClient(config.nhs_api_key, config.nhs_api_url)
+        self.pds_client = pds_client
 
     def get_nhs_login_url(self, app_name: str, app_internal_id: str) -> HttpUrl:
         """
@@ -78,8 +79,10 @@ class NHSLoginService:
             if error == "access_denied":
                 return f"{config.app_uri}nhs_noconsent"
 
+        budget = LatencyBudget(config.nhs_login_callback_budget_ms)
+
         # Extract logged-in user information from NHS
-        user_info = self.get_user_info(req_args)
+        user_info = self.get_user_info(req_args, budget)
 
         if not user_info:
             raise ValueError("Failed to retrieve user information from NHS Login.")
@@ -95,7 +98,7 @@ class NHSLoginService:
             identity_level=user_info["identity_proofing_level"],
         )
 
-        with auth_step_span(STEP_SESSION_WRITE) as span:
+        with budget.step(STEP_SESSION_WRITE) as span:
             # Check if the user already exists
             existing_user = self.userCRUD.get_user_by_sub(user.unique_id)
             span.set_attribute("auth.user_exists", existing_user is not None)
@@ -123,19 +126,23 @@ class NHSLoginService:
 
         return generated_data.get("redirect_url")
 
-    def get_user_info(self, req_args: dict) -> NHSUser:
+    def get_user_info(self, req_args: dict, budget: LatencyBudget | None = None) -> NHSUser:
         """
         Retrieve user info from NHS Login Service and get user gender and
         postcode by making second call to PDS API.
 
+        Each call needs the result of the one before it, so they run in order.
+
         :param req_args: The request arguments from the NHS login callback.
+        :param budget: Latency budget of the callback the steps are charged to.
         :return: A NHSUser instance with user information.
         """
-        with auth_step_span(STEP_AUTHORIZATION_RESPONSE):
+        budget = budget or LatencyBudget(config.nhs_login_callback_budget_ms)
+        with budget.step(STEP_AUTHORIZATION_RESPONSE):
             auth_resp = auth_nhs.get_authorization_response(req_args)
-        with auth_step_span(STEP_TOKEN_EXCHANGE):
+        with budget.step(STEP_TOKEN_EXCHANGE):
             data = auth_nhs.get_access_token(auth_resp)
-        with auth_step_span(STEP_USERINFO):
+        with budget.step(STEP_USERINFO):
             user_info = auth_nhs.get_userinfo(data["access_token"])
         # TODO: gender and postcode needs to come from Mobile App now.
         user_info["gender"] = "na"
@@ -1,3 +1,4 @@
+import time
 from contextlib import contextmanager
 from urllib.parse import urlsplit, urlunsplit
 
@@ -12,10 +13,13 @@ from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.trace import Status, StatusCode
 
-from utils.base_config import config
+from utils.base_config import config, logger
 
 AUTH_FLOW_KEY = "auth.flow"
 AUTH_STEP_KEY = "auth.step"
+AUTH_STEP_DURATION_KEY = "auth.step.duration_ms"
+AUTH_BUDGET_REMAINING_KEY = "auth.budget.remaining_ms"
+AUTH_BUDGET_EXCEEDED_KEY = "auth.budget.exceeded"
 
 NHS_LOGIN_FLOW = "nhs-login"
 
@@ -77,3 +81,53 @@ def auth_step_span(step: str, flow: str = NHS_LOGIN_FLOW):
         except Exception as exc:
             span.set_status(Status(StatusCode.ERROR, type(exc).__name__))
             raise
+
+
+class LatencyBudget:
+    """
+    End-to-end latency budget shared by the steps of an auth flow.
+
+    Each step runs in an ``auth_step_span`` that records how long the step took and how
+    much of the budget was left when it finished. Steps that finish over budget are
+    flagged on their span, and the first one is logged.
+    """
+
+    def __init__(self, budget_ms: float, flow: str = NHS_LOGIN_FLOW):
+        """
+        :param budget_ms: Milliseconds the whole flow should take.
+        :param flow: Flow name recorded in the auth.flow annotation.
+        """
+        self.budget_ms = budget_ms
+        self.flow = flow
+        self.exceeded = False
+        self._started = time.perf_counter()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def remaining_ms(self) -> float:
+        return self.budget_ms - self.elapsed_ms()
+
+    @contextmanager
+    def step(self, step: str):
+        """
+        Open a span around one step of the flow and charge its duration to the budget.
+
+        :param step: Step name, one of the STEP_* constants above.
+        """
+        started = time.perf_counter()
+        with auth_step_span(step, self.flow) as span:
+            try:
+                yield span
+            finally:
+                remaining = self.remaining_ms()
+                span.set_attribute(AUTH_STEP_DURATION_KEY, (time.perf_counter() - started) * 1000)
+                span.set_attribute(AUTH_BUDGET_REMAINING_KEY, remaining)
+                if remaining < 0:
+                    span.set_attribute(AUTH_BUDGET_EXCEEDED_KEY, True)
+                    if not self.exceeded:
+                        logger.warning(
+                            f"{self.flow} exceeded its {self.budget_ms}ms latency budget "
+                            f"during {step} ({self.elapsed_ms():.0f}ms)"
+                        )
+                    self.exceeded = True
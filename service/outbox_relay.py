@@ -0,0 +1,242 @@
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
+from itertools import groupby
+from typing import Any
+
+import boto3
+from sqlalchemy.orm import Session
+
+from crud.outbox_crud import claim_outbox_events, delete_outbox_events
+from db.session import get_db_context_session
+from models.outbox import OutboxDestination, OutboxEvent
+from service.sns_batch_publisher import SNS_MAX_BATCH_BYTES, SNS_MAX_BATCH_ENTRIES
+from utils.base_config import config, logger
+
+SQS_MESSAGE_GROUP_ID = "Active10-Data"
+
+
+class OutboxRelay:
+    """
+    Drains the outbox table to SNS and SQS in batches.
+
+    Each cycle locks a page of due events with ``FOR UPDATE SKIP LOCKED``, sends them
+    grouped by destination with ``PublishBatch`` / ``SendMessageBatch`` and deletes the
+    delivered rows in the same transaction. Undelivered rows stay in the outbox with an
+    exponential, jittered ``available_at`` delay, so a slow or failing AWS endpoint
+    only grows the backlog and never loses a message. Several relays can run at once.
+
+    Events that cannot succeed are dead-lettered instead of retried: those rejected as a
+    sender fault, those larger than the 256 KiB message limit and those that have failed
+    ``max_attempts`` times. They keep their row with ``dead_lettered_at`` set.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        session_factory: Callable[[], AbstractContextManager[Session]] = get_db_context_session,
+        sns_client: Any | None = None,
+        sqs_client: Any | None = None,
+        batch_limit: int = 100,
+        poll_interval: float = 0.5,
+        retry_base_delay: int = 1,
+        retry_max_delay: int = 300,
+        max_attempts: int = 10,
+    ) -> None:
+        """
+        Args:
+            session_factory: Context manager factory yielding a database session.
+            sns_client: boto3 SNS client. Created lazily if not given.
+            sqs_client: boto3 SQS client. Created lazily if not given.
+            batch_limit (int): Maximum number of events claimed per cycle.
+            poll_interval (float): Seconds to sleep when the outbox is empty.
+            retry_base_delay (int): Base delay in seconds before an event is retried.
+            retry_max_delay (int): Upper bound in seconds of the retry delay.
+            max_attempts (int): Failed attempts after which an event is dead-lettered.
+        """
+        self.session_factory = session_factory
+        self._sns_client = sns_client
+        self._sqs_client = sqs_client
+        self.batch_limit = batch_limit
+        self.poll_interval = poll_interval
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_attempts = max(1, max_attempts)
+        self._stop = threading.Event()
+
+    @property
+    def sns_client(self) -> Any:
+        if self._sns_client is None:
+            self._sns_client = boto3.client("sns")
+        return self._sns_client
+
+    @property
+    def sqs_client(self) -> Any:
+        if self._sqs_client is None:
+            self._sqs_client = boto3.client("sqs")
+        return self._sqs_client
+
+    def run_forever(self) -> None:
+        """Relay events until ``stop`` is called, sleeping while the outbox is empty."""
+        logger.info("Outbox relay started")
+        while not self._stop.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                logger.error(f"Outbox relay cycle failed: {e}")
+                claimed = 0
+            if claimed < self.batch_limit:
+                self._stop.wait(self.poll_interval)
+        logger.info("Outbox relay stopped")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run_once(self) -> int:
+        """
+        Relay one page of due events.
+
+        Returns:
+            int: Number of events claimed in this cycle.
+        """
+        with self.session_factory() as db:
+            events = claim_outbox_events(db, self.batch_limit)
+            if not events:
+                db.rollback()
+                return 0
+
+            delivered: list[int] = []
+            failed: dict[int, str] = {}
+            rejected: dict[int, str] = {}
+            events.sort(key=lambda event: (event.destination, event.target, event.id))
+            for (destination, target), group in groupby(
+                events, key=lambda event: (event.destination, event.target)
+            ):
+                sendable = []
+                for event in group:
+                    if self._size(event) > SNS_MAX_BATCH_BYTES:
+                        rejected[event.id] = "Message exceeds the 256 KiB limit"
+                    else:
+                        sendable.append(event)
+                for chunk in self._chunks(sendable):
+                    errors = self._send(destination, target, chunk)
+                    for event_id, (error, sender_fault) in errors.items():
+                        (rejected if sender_fault else failed)[event_id] = error
+                    delivered.extend(event.id for event in chunk if event.id not in errors)
+
+            delete_outbox_events(db, delivered)
+            dead_lettered = self._record_failures(events, failed, rejected)
+            db.commit()
+
+        if len(failed) + len(rejected) > dead_lettered:
+            logger.error(
+                f"Outbox relay failed to deliver {len(failed) + len(rejected) - dead_lettered} "
+                "event(s), will retry"
+            )
+        if dead_lettered:
+            logger.error(f"Outbox relay dead-lettered {dead_lettered} event(s)")
+        logger.debug(f"Outbox relay delivered {len(delivered)} event(s)")
+        return len(events)
+
+    def _record_failures(
+        self, events: list[OutboxEvent], failed: dict[int, str], rejected: dict[int, str]
+    ) -> int:
+        """
+        Reschedule failed events, dead-lettering rejected ones and those out of attempts.
+
+        Returns:
+            int: Number of events dead-lettered.
+        """
+        now = int(time.time())
+        dead_lettered = 0
+        for event in events:
+            error = rejected.get(event.id) or failed.get(event.id)
+            if error is None:
+                continue
+            event.attempts += 1
+            event.last_error = error[:256]
+            if event.id in rejected or event.attempts >= self.max_attempts:
+                event.dead_lettered_at = now
+                dead_lettered += 1
+            else:
+                event.available_at = now + self._backoff(event.attempts)
+        return dead_lettered
+
+    @staticmethod
+    def _size(event: OutboxEvent) -> int:
+        return len(event.message.encode()) + len(event.subject or "")
+
+    def _chunks(self, events: list[OutboxEvent]) -> Iterator[list[OutboxEvent]]:
+        chunk: list[OutboxEvent] = []
+        chunk_bytes = 0
+        for event in events:
+            size = self._size(event)
+            if chunk and (
+                len(chunk) >= SNS_MAX_BATCH_ENTRIES or chunk_bytes + size > SNS_MAX_BATCH_BYTES
+            ):
+                yield chunk
+                chunk, chunk_bytes = [], 0
+            chunk.append(event)
+            chunk_bytes += size
+        if chunk:
+            yield chunk
+
+    def _send(
+        self, destination: str, target: str, events: list[OutboxEvent]
+    ) -> dict[int, tuple[str, bool]]:
+        """
+        Send one batch of events.
+
+        Returns:
+            dict: Error message and sender fault flag of each event that was not delivered.
+        """
+        try:
+            if destination == OutboxDestination.SNS.value:
+                response = self.sns_client.publish_batch(
+                    TopicArn=target,
+                    PublishBatchRequestEntries=[
+                        {"Id": str(event.id), "Message": event.message}
+                        | ({"Subject": event.subject} if event.subject else {})
+                        for event in events
+                    ],
+                )
+            else:
+                fifo = target.endswith(".fifo")
+                response = self.sqs_client.send_message_batch(
+                    QueueUrl=target,
+                    Entries=[
+                        {"Id": str(event.id), "MessageBody": event.message}
+                        | (
+                            {
+                                "MessageGroupId": SQS_MESSAGE_GROUP_ID,
+                                "MessageDeduplicationId": str(event.id),
+                            }
+                            if fifo
+                            else {}
+                        )
+                        for event in events
+                    ],
+                )
+        except Exception as e:
+            logger.error(f"Error occurred while relaying outbox events to {target}: {e}")
+            return {event.id: (str(e), False) for event in events}
+
+        return {
+            int(failure["Id"]): (
+                f"{failure.get('Code')}: {failure.get('Message')}",
+                bool(failure.get("SenderFault")),
+            )
+            for failure in response.get("Failed", [])
+        }
+
+    def _backoff(self, attempts: int) -> int:
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempts - 1))
+        return max(1, int(random.uniform(delay / 2, delay)))
+
+
+outbox_relay = OutboxRelay(
+    batch_limit=config.outbox_relay_batch_limit,
+    poll_interval=config.outbox_relay_poll_interval,
+    max_attempts=config.outbox_relay_max_attempts,
+)
@@ -0,0 +1,157 @@
+import pickle
+from abc import ABC, abstractmethod
+from typing import Any
+from uuid import UUID
+
+import msgpack
+import orjson
+
+# First byte of every pickle written with protocol 2 or later. Pickled entries written
+# before the codecs were introduced start with this byte instead of a codec version.
+LEGACY_PICKLE_PREFIX = 0x80
+
+AUTH_VALID_FLAG = b"\x01"
+AUTH_INVALID_FLAG = b"\x00"
+
+
+class RedisCodec(ABC):
+    """
+    Base class for Redis value serializers.
+
+    Every encoded payload is prefixed with the codec's one-byte ``version`` so values
+    can always be decoded, whatever codec is configured at the time of reading. A codec
+    missing ``dumps`` or ``loads`` can't be instantiated.
+    """
+
+    version: int
+    name: str
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Serialize ``value``, without the version prefix."""
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Any:
+        """Deserialize a payload whose version prefix has been stripped."""
+
+
+class OrjsonCodec(RedisCodec):
+    """JSON serializer backed by orjson."""
+
+    version = 0x01
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, payload: bytes) -> Any:
+        return orjson.loads(payload)
+
+
+class MsgpackCodec(RedisCodec):
+    """Binary serializer backed by msgpack."""
+
+    version = 0x02
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+
+class AuthCodec(RedisCodec):
+    """
+    Fixed binary layout for auth cache entries.
+
+    Stores the user's UUID as 16 raw bytes followed by a one-byte validity flag, so an
+    encoded entry is 18 bytes including the version prefix.
+    """
+
+    version = 0x03
+    name = "auth"
+
+    def dumps(self, value: dict[str, Any]) -> bytes:
+        user_id = value["user_id"]
+        # bytes.fromhex is several times faster than constructing a uuid.UUID
+        user_id_bytes = (
+            user_id.bytes if isinstance(user_id, UUID) else bytes.fromhex(user_id.replace("-", ""))
+        )
+        if len(user_id_bytes) != 16:  # noqa: PLR2004
+            raise ValueError(f"Invalid user_id for auth codec: {user_id}")
+        return user_id_bytes + (AUTH_VALID_FLAG if value["valid"] else AUTH_INVALID_FLAG)
+
+    def loads(self, payload: bytes) -> dict[str, Any]:
+        h = payload[:16].hex()
+        return {
+            "user_id": f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}",
+            "valid": payload[16:17] == AUTH_VALID_FLAG,
+        }
+
+
+CODECS: dict[int, RedisCodec] = {
+    codec.version: codec for codec in (OrjsonCodec(), MsgpackCodec(), AuthCodec())
+}
+CODECS_BY_NAME: dict[str, RedisCodec] = {codec.name: codec for codec in CODECS.values()}
+
+
+def get_codec(name: str) -> RedisCodec:
+    """
+    Look up a codec by name.
+
+    Args:
+        name (str): The codec name, e.g. "orjson" or "msgpack".
+
+    Returns:
+        RedisCodec: The matching codec.
+
+    Raises:
+        ValueError: If no codec is registered under that name.
+    """
+    try:
+        return CODECS_BY_NAME[name]
+    except KeyError as err:
+        raise ValueError(f"Unknown Redis codec: {name}") from err
+
+
+def encode(value: Any, codec: RedisCodec) -> bytes:
+    """
+    Serialize a value with the given codec and prefix it with the codec version.
+
+    Args:
+        value (Any): The value to serialize.
+        codec (RedisCodec): The codec to serialize with.
+
+    Returns:
+        bytes: The versioned payload.
+    """
+    return bytes((codec.version,)) + codec.dumps(value)
+
+
+def decode(data: bytes, allow_legacy_pickle: bool = True) -> Any:
+    """
+    Deserialize a versioned payload, dispatching on its first byte.
+
+    Args:
+        data (bytes): The payload read from Redis.
+        allow_legacy_pickle (bool, optional): Whether to unpickle entries written before
+            the codecs were introduced.
+
+    Returns:
+        Any: The deserialized value.
+
+    Raises:
+        ValueError: If the payload version is unknown or legacy pickle is disallowed.
+    """
+    version = data[0]
+    if version == LEGACY_PICKLE_PREFIX:
+        if not allow_legacy_pickle:
+            raise ValueError("Legacy pickle payloads are disabled")
+        # Only ever reads entries this service wrote before the codec rollout
+        return pickle.loads(data)
+
+    codec = CODECS.get(version)
+    if codec is None:
+        raise ValueError(f"Unknown Redis payload version: {version:#04x}")
+    return codec.loads(data[1:])
@@ -1,13 +1,32 @@
 import hashlib
-import pickle
+import secrets
+import time
 from typing import Any
 
 import redis
+from redis.client import PubSubWorkerThread
 from redis.connection import Connection, SSLConnection
 
+from service.auth_cache_service import AUTH_INVALIDATION_CHANNEL, local_auth_cache
+from service.redis_codecs import AuthCodec, RedisCodec, decode, encode, get_codec
 from utils.base_config import config, logger
 
 DEFAULT_AUTH_TTL: int = 2592000  # 30 days in seconds
+USER_PROFILE_CACHE_PREFIX = "user-profile"
+USER_PROFILE_RESOURCE = "users"
+RESOURCE_CACHE_PREFIX = "resource-cache"
+
+
+def user_profile_cache_key(user_id: Any) -> str:
+    return f"{USER_PROFILE_CACHE_PREFIX}:{user_id}"
+
+
+def resource_version_key(resource: str, user_id: Any) -> str:
+    return f"{RESOURCE_CACHE_PREFIX}:{resource}:{user_id}:version"
+
+
+def new_resource_version() -> str:
+    return secrets.token_hex(8)
 
 
 class RedisService:
@@ -21,6 +40,9 @@ class RedisService:
 
     _pool = None
     _client = None
+    _listener: PubSubWorkerThread | None = None
+    codec: RedisCodec = get_codec(config.redis_codec)
+    auth_codec: RedisCodec = AuthCodec()
 
     @classmethod
     def initialize_pool(cls):
@@ -53,6 +75,7 @@ class RedisService:
                 cls._client = redis.Redis(**client_kwargs)
                 cls._client.ping()
                 logger.info("Redis connection pool and client created successfully")
+                cls.start_auth_invalidation_listener()
             except Exception as e:
                 logger.error(f"Failed to create Redis connection pool: {e}")
                 cls._pool = None
@@ -97,16 +120,24 @@ class RedisService:
         return client is not None
 
     @classmethod
-    def set(cls, key: str, value: Any, ttl: int | None = DEFAULT_AUTH_TTL) -> bool:
+    def set(
+        cls,
+        key: str,
+        value: Any,
+        ttl: int | None = DEFAULT_AUTH_TTL,
+        codec: RedisCodec | None = None,
+    ) -> bool:
         """
         Set a key-value pair in Redis with optional expiration time (TTL).
 
-        Serializes the value using pickle before storing.
+        Serializes the value with the given codec, or the configured default codec,
+        prefixed with the codec's version byte.
 
         Args:
             key (str): The Redis key to set.
             value (Any): The Python object to serialize and store.
             ttl (int, optional): Time-to-live in seconds. If None, no expiry.
+            codec (RedisCodec, optional): Codec to serialize with. Defaults to cls.codec.
 
         Returns:
             bool: True if operation succeeded, False on failure.
@@ -114,7 +145,7 @@ class RedisService:
         if not cls.is_available():
             return False
         try:
-            serialized_value = pickle.dumps(value)
+            serialized_value = encode(value, codec or cls.codec)
             if ttl:
                 return cls._client.setex(key, ttl, serialized_value)
             else:
@@ -128,6 +159,9 @@ class RedisService:
         """
         Retrieve and deserialize a value stored by key from Redis.
 
+        The codec is picked from the payload's version byte, so values written with any
+        codec (or legacy pickled values, if allowed) can be read.
+
         Args:
             key (str): The Redis key to fetch.
 
@@ -140,7 +174,7 @@ class RedisService:
             serialized_value = cls._client.get(key)
             if serialized_value is None:
                 return None
-            return pickle.loads(serialized_value)
+            return decode(serialized_value, config.redis_allow_legacy_pickle)
         except Exception as e:
             logger.error(f"Error getting Redis key {key}: {e}")
             return None
@@ -164,6 +198,64 @@ class RedisService:
             logger.error(f"Error deleting Redis key {key}: {e}")
             return False
 
+    @classmethod
+    def publish(cls, channel: str, message: str) -> bool:
+        """
+        Publish a message on a Redis pub/sub channel.
+
+        Args:
+            channel (str): The channel to publish on.
+            message (str): The message payload.
+
+        Returns:
+            bool: True if the message was published, False on failure.
+        """
+        if not cls.is_available():
+            return False
+        try:
+            cls._client.publish(channel, message)
+            return True
+        except Exception as e:
+            logger.error(f"Error publishing to Redis channel {channel}: {e}")
+            return False
+
+    @classmethod
+    def start_auth_invalidation_listener(cls) -> None:
+        """
+        Subscribe this process to auth cache invalidations published by any worker.
+
+        Runs the subscription in a daemon thread that evicts matching entries from the
+        in-process auth cache. If the connection drops, the local cache is cleared since
+        invalidation messages may have been missed while disconnected.
+        """
+        if cls._listener is not None or cls._client is None:
+            return
+
+        def _on_invalidation(message: dict) -> None:
+            local_auth_cache.invalidate(message["data"].decode())
+
+        def _on_error(error: Exception, pubsub, thread) -> None:
+            logger.warning(f"Auth invalidation listener error, clearing local cache: {error}")
+            local_auth_cache.clear()
+            time.sleep(1)
+
+        try:
+            pubsub = cls._client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{AUTH_INVALIDATION_CHANNEL: _on_invalidation})
+            cls._listener = pubsub.run_in_thread(
+                sleep_time=1, daemon=True, exception_handler=_on_error
+            )
+        except Exception as e:
+            logger.error(f"Failed to start auth invalidation listener: {e}")
+            cls._listener = None
+
+    @classmethod
+    def stop_auth_invalidation_listener(cls) -> None:
+        """Stop the auth invalidation listener thread if it is running."""
+        if cls._listener is not None:
+            cls._listener.stop()
+            cls._listener = None
+
     @classmethod
     def set_auth_cache(
         cls, token_hash: str, user_id: str, ttl: int = DEFAULT_AUTH_TTL, valid: bool = True
@@ -183,7 +275,7 @@ class RedisService:
         """
         key = f"{token_hash}"
         cache_data = {"user_id": user_id, "valid": valid}
-        return cls.set(key, cache_data, ttl)
+        return cls.set(key, cache_data, ttl, codec=cls.auth_codec)
 
     @classmethod
     def get_auth_cache(cls, token_hash: str) -> Any | None:
@@ -204,6 +296,9 @@ class RedisService:
         """
         Remove authentication data from the cache.
 
+        The entry is evicted from this process's local cache immediately and an
+        invalidation is published so every other worker evicts it too.
+
         Args:
             token_hash (str): The hashed authentication token.
             user_id (str, optional): The identifier of the user associated
@@ -218,12 +313,65 @@ class RedisService:
         try:
             key = f"{token_hash}"
             deleted_cache = cls.delete(key)
+            local_auth_cache.invalidate(token_hash)
+            _ = cls.publish(AUTH_INVALIDATION_CHANNEL, token_hash)
             logger.info(f"Deleted Cache for user {user_id}: token_cache={deleted_cache}")
             return True
         except Exception as e:
             logger.error(f"Error deleting user session {user_id}: {e}")
             raise
 
+    @classmethod
+    def set_user_profile_cache(
+        cls, user_id: str, profile: dict[str, Any], ttl: int = config.user_profile_cache_ttl
+    ) -> bool:
+        """
+        Store a user's serialised profile response.
+
+        Args:
+            user_id (str): The user ID.
+            profile (dict): The profile response, as JSON-compatible data.
+            ttl (int, optional): Time-to-live in seconds. Bounds how stale the derived
+                age fields can get.
+
+        Returns:
+            bool: True if the profile was cached, False otherwise.
+        """
+        return cls.set(user_profile_cache_key(user_id), profile, ttl)
+
+    @classmethod
+    def get_user_profile_cache(cls, user_id: str) -> dict[str, Any] | None:
+        """
+        Retrieve a user's cached profile response.
+
+        Args:
+            user_id (str): The user ID.
+
+        Returns:
+            dict: The cached profile, or None on a miss.
+        """
+        return cls.get(user_profile_cache_key(user_id))
+
+    @classmethod
+    def delete_user_profile_cache(cls, user_id: str) -> bool:
+        """
+        Drop a user's cached profile after a write to the user or their motivations,
+        activity levels or email preferences, and give the profile a new version so its
+        ETag changes.
+
+        Args:
+            user_id (str): The user ID.
+
+        Returns:
+            bool: True if a cached profile was deleted, False otherwise.
+        """
+        cls.set(
+            resource_version_key(USER_PROFILE_RESOURCE, user_id),
+            new_resource_version(),
+            config.user_profile_cache_ttl,
+        )
+        return cls.delete(user_profile_cache_key(user_id))
+
 
 def get_redis_service() -> RedisService:
     """
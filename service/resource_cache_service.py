@@ -0,0 +1,204 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from service.async_redis_service import AsyncRedisService
+from service.redis_codecs import get_codec
+from service.redis_service import RESOURCE_CACHE_PREFIX, new_resource_version, resource_version_key
+from utils.base_config import config, logger
+
+LOCK_POLL_INTERVAL = 0.05
+
+
+class ResourceCache:
+    """
+    Read-through cache of per-user API resources in Redis, keyed by ``(resource, user_id)``.
+
+    Every ``(resource, user_id)`` pair has a version token. Values are stored under keys
+    that include the current token, so a write invalidates every cached variant of the
+    resource (e.g. each filtered list) at once by replacing the token. Entries written
+    under an old token are never read again and expire on their own. Because the token is
+    random, a reload that races a write can only fill a key nobody reads. The same token
+    serves as the resource's ETag, see ``api.etag``.
+
+    Misses are single-flight: concurrent misses for the same key in this process share
+    one load, and across processes a short Redis lock lets one worker load while the
+    others wait briefly for its result. Values are stored as JSON whatever codec Redis
+    is configured with, since they are response bodies.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttls: dict[str, int] | None = None,
+        default_ttl: int = 300,
+        lock_ttl: int = 5,
+        lock_wait: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            enabled (bool): When False every read goes straight to the loader. Versions
+                are still kept so ETags stay correct.
+            ttls (dict[str, int] | None): TTL in seconds per resource name.
+            default_ttl (int): TTL in seconds of resources not listed in ``ttls``.
+            lock_ttl (int): Lifetime in seconds of the cross-worker load lock.
+            lock_wait (float): Seconds to wait for another worker's load before
+                loading anyway.
+        """
+        self.enabled = enabled
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self.codec = get_codec("orjson")
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def ttl(self, resource: str) -> int:
+        return self.ttls.get(resource, self.default_ttl)
+
+    def _version_ttl(self) -> int:
+        # A token must outlive every value written under it, see get_or_load
+        return max([self.default_ttl, *self.ttls.values()])
+
+    @staticmethod
+    def _value_key(resource: str, user_id: Any, version: str, variant: str) -> str:
+        return f"{RESOURCE_CACHE_PREFIX}:{resource}:{user_id}:{version}:{variant}"
+
+    async def get_or_load(
+        self,
+        resource: str,
+        user_id: Any,
+        loader: Callable[[], Awaitable[Any]],
+        variant: str = "",
+    ) -> Any:
+        """
+        Return the cached value of a user's resource, loading and caching it on a miss.
+
+        Args:
+            resource (str): The resource name, e.g. "daily_targets".
+            user_id (Any): The owner of the resource.
+            loader (Callable): Coroutine function returning the JSON-compatible value.
+                ``None`` is returned as is and never cached.
+            variant (str, optional): Distinguishes variants of the resource, such as the
+                filters of a list.
+
+        Returns:
+            Any: The cached or freshly loaded value.
+        """
+        if not self.enabled or AsyncRedisService.get_client() is None:
+            return await loader()
+
+        version = await self.version(resource, user_id)
+        if version is None:
+            return await loader()
+
+        key = self._value_key(resource, user_id, version, variant)
+        value = await AsyncRedisService.get(key)
+        if value is not None:
+            return value
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # The request doing the load was cancelled, not this one
+                if not in_flight.cancelled():
+                    raise
+                return await loader()
+
+        in_flight = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = in_flight
+        try:
+            value = await self._load(key, self.ttl(resource), loader)
+        except asyncio.CancelledError:
+            in_flight.cancel()
+            raise
+        except Exception as e:
+            in_flight.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            in_flight.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+        in_flight.set_result(value)
+        return value
+
+    async def _load(self, key: str, ttl: int, loader: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = f"{key}:lock"
+        if not await AsyncRedisService.set_if_absent(lock_key, 1, self.lock_ttl):
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.lock_wait
+            while loop.time() < deadline:
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                value = await AsyncRedisService.get(key)
+                if value is not None:
+                    return value
+            logger.warning(f"Timed out waiting for another worker to load {key}")
+            return await loader()
+
+        try:
+            value = await loader()
+            if value is not None:
+                await AsyncRedisService.set(key, value, ttl, codec=self.codec)
+            return value
+        finally:
+            await AsyncRedisService.delete(lock_key)
+
+    async def version(self, resource: str, user_id: Any) -> str | None:
+        """
+        Return the version token of a user's resource, starting a new one if it has none.
+
+        Args:
+            resource (str): The resource name.
+            user_id (Any): The owner of the resource.
+
+        Returns:
+            str | None: The version token, or None if Redis is unavailable.
+        """
+        key = resource_version_key(resource, user_id)
+        version = await AsyncRedisService.get(key)
+        if version is None:
+            # Another request may start the token first, so read back whichever won
+            await AsyncRedisService.set_if_absent(key, new_resource_version(), self._version_ttl())
+            version = await AsyncRedisService.get(key)
+        return version
+
+    async def invalidate(self, resource: str, user_id: Any) -> None:
+        """
+        Invalidate every cached variant of a user's resource by replacing its version token.
+
+        Args:
+            resource (str): The resource name.
+            user_id (Any): The owner of the resource.
+        """
+        await self._new_version(resource, user_id)
+
+    async def _new_version(self, resource: str, user_id: Any) -> str:
+        version = new_resource_version()
+        await AsyncRedisService.set(
+            resource_version_key(resource, user_id), version, self._version_ttl()
+        )
+        return version
+
+    async def write(self, resource: str, user_id: Any, value: Any, variant: str = "") -> None:
+        """
+        Invalidate a user's resource and cache its new value in the same step.
+
+        Args:
+            resource (str): The resource name.
+            user_id (Any): The owner of the resource.
+            value (Any): The new JSON-compatible value.
+            variant (str, optional): The variant the value belongs to.
+        """
+        version = await self._new_version(resource, user_id)
+        if self.enabled:
+            key = self._value_key(resource, user_id, version, variant)
+            await AsyncRedisService.set(key, value, self.ttl(resource), codec=self.codec)
+
+
+resource_cache = ResourceCache(
+    enabled=config.resource_cache_enabled,
+    ttls=config.resource_cache_ttls,
+    default_ttl=config.resource_cache_default_ttl,
+)
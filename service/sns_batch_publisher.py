@@ -0,0 +1,313 @@
+import json
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import boto3
+from botocore.config import Config as BotoConfig
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from utils.base_config import config, logger
+
+SNS_MAX_BATCH_ENTRIES = 10
+SNS_MAX_BATCH_BYTES = 256 * 1024
+DEFAULT_SUBJECT = "activity-daily-data"
+
+meter = metrics.get_meter("active10.sns-publisher")
+
+
+class SNSBatchPublisher:
+    """
+    In-process SNS publisher that buffers messages and sends them with ``PublishBatch``.
+
+    ``submit`` puts a message on a bounded queue and never touches the network. A
+    collector thread groups queued messages per topic and flushes a batch once it holds
+    ``batch_size`` entries (or would exceed the 256 KiB batch limit), or once the oldest
+    buffered message is ``flush_interval`` seconds old. Batches are sent from a small
+    thread pool; failed entries are retried with exponential backoff and full jitter.
+
+    At most ``max_in_flight`` batches are sent or waiting to be sent at a time. Past that
+    the collector blocks, so while SNS is slow the queue fills up and ``submit`` starts
+    rejecting messages instead of memory growing.
+
+    ``stop`` drains the queue and every in-flight batch before returning, so buffered
+    records are not lost on a clean shutdown.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: Any | None = None,
+        queue_size: int = 10000,
+        batch_size: int = SNS_MAX_BATCH_ENTRIES,
+        flush_interval: float = 0.5,
+        max_attempts: int = 5,
+        max_in_flight: int = 4,
+        retry_base_delay: float = 0.1,
+        retry_max_delay: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            client: boto3 SNS client. Created lazily with a pool sized for max_in_flight.
+            queue_size (int): Maximum number of messages waiting to be batched.
+            batch_size (int): Entries per PublishBatch call, at most 10.
+            flush_interval (float): Maximum seconds a message waits for its batch to fill.
+            max_attempts (int): Attempts per entry before it is dropped and logged.
+            max_in_flight (int): Batches that may be sent at once before the collector blocks.
+            retry_base_delay (float): Base delay in seconds of the backoff.
+            retry_max_delay (float): Upper bound in seconds of a single backoff delay.
+        """
+        self._client = client
+        self.batch_size = max(1, min(batch_size, SNS_MAX_BATCH_ENTRIES))
+        self.flush_interval = flush_interval
+        self.max_attempts = max(1, max_attempts)
+        self.max_in_flight = max(1, max_in_flight)
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._queue: queue.Queue[tuple[str, str, str] | None] = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._collector: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self.submitted = 0
+        self.rejected = 0
+        self.published = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.last_flush_latency_ms = 0.0
+
+        self._batch_size_histogram = meter.create_histogram(
+            "sns.publisher.batch_size", unit="{message}", description="Entries per PublishBatch"
+        )
+        self._flush_latency_histogram = meter.create_histogram(
+            "sns.publisher.flush_latency", unit="ms", description="PublishBatch round trip time"
+        )
+        meter.create_observable_gauge(
+            "sns.publisher.queue_depth",
+            callbacks=[self._observe_queue_depth],
+            unit="{message}",
+            description="Messages waiting to be batched",
+        )
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            self._client = boto3.client(
+                "sns", config=BotoConfig(max_pool_connections=self.max_in_flight)
+            )
+        return self._client
+
+    def start(self) -> None:
+        """Start the collector thread and batch pool if they are not running."""
+        with self._lock:
+            if self._collector is not None and self._collector.is_alive():
+                return
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_in_flight, thread_name_prefix="sns-publisher"
+            )
+            self._collector = threading.Thread(
+                target=self._run, name="sns-publisher-collector", daemon=True
+            )
+            self._collector.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Flush every buffered message and stop the publisher.
+
+        If the collector has not drained within ``timeout``, batches that have not started
+        are cancelled and the call returns without waiting for the ones being sent.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for the collector to drain.
+        """
+        with self._lock:
+            collector, executor = self._collector, self._executor
+            if collector is None:
+                return
+            self._queue.put(None)
+            collector.join(timeout)
+            if collector.is_alive():
+                logger.error(f"SNS publisher did not drain within {timeout}s")
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                executor.shutdown(wait=True)
+            self._collector = None
+            self._executor = None
+
+    def submit(self, topic: str, record: dict[str, Any], subject: str = DEFAULT_SUBJECT) -> bool:
+        """
+        Queue a record for publishing without blocking.
+
+        Args:
+            topic (str): Target SNS topic arn.
+            record (dict): Data to be sent to the SNS topic.
+            subject (str, optional): SNS message subject.
+
+        Returns:
+            bool: True if the record was queued, False if the queue is full.
+        """
+        self.start()
+        try:
+            self._queue.put_nowait((topic, json.dumps(record), subject))
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected += 1
+            logger.warning(f"SNS publisher queue is full, rejecting message for topic {topic}")
+            return False
+        with self._stats_lock:
+            self.submitted += 1
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return publisher counters and the current queue depth."""
+        return {
+            "queue_depth": self._queue.qsize(),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "published": self.published,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_latency_ms": self.last_flush_latency_ms,
+        }
+
+    def _observe_queue_depth(self, _options: CallbackOptions):
+        yield Observation(self._queue.qsize())
+
+    def _run(self) -> None:
+        buffers: dict[str, list[dict[str, str]]] = {}
+        buffer_bytes: dict[str, int] = {}
+        oldest: float | None = None
+
+        while True:
+            timeout = None
+            if oldest is not None:
+                timeout = max(0.0, oldest + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+
+            if item is None:
+                self._flush_all(buffers)
+                return
+
+            if item:
+                self._buffer(buffers, buffer_bytes, *item)
+                if oldest is None:
+                    oldest = time.monotonic()
+
+            if oldest is not None and time.monotonic() - oldest >= self.flush_interval:
+                self._flush_all(buffers)
+            if not buffers:
+                oldest = None
+
+    def _buffer(
+        self,
+        buffers: dict[str, list[dict[str, str]]],
+        buffer_bytes: dict[str, int],
+        topic: str,
+        message: str,
+        subject: str,
+    ) -> None:
+        size = len(message.encode()) + len(subject)
+        if topic in buffers and buffer_bytes[topic] + size > SNS_MAX_BATCH_BYTES:
+            self._dispatch(topic, buffers.pop(topic))
+        if topic not in buffers:
+            buffers[topic] = []
+            buffer_bytes[topic] = 0
+
+        batch = buffers[topic]
+        batch.append({"Id": str(len(batch)), "Message": message, "Subject": subject})
+        buffer_bytes[topic] += size
+        if len(batch) >= self.batch_size:
+            self._dispatch(topic, buffers.pop(topic))
+
+    def _flush_all(self, buffers: dict[str, list[dict[str, str]]]) -> None:
+        for topic in list(buffers):
+            self._dispatch(topic, buffers.pop(topic))
+
+    def _dispatch(self, topic: str, entries: list[dict[str, str]]) -> None:
+        self._in_flight.acquire()
+        executor = self._executor
+        try:
+            if executor is None:
+                raise RuntimeError("SNS publisher is stopped")
+            future = executor.submit(self._publish_batch, topic, entries)
+        except RuntimeError:
+            # stop() timed out and shut the pool down while this batch was being collected
+            self._in_flight.release()
+            self._drop_on_shutdown(topic, entries)
+            return
+        future.add_done_callback(lambda f: self._batch_done(f, topic, entries))
+
+    def _batch_done(self, future: Future, topic: str, entries: list[dict[str, str]]) -> None:
+        self._in_flight.release()
+        if future.cancelled():
+            self._drop_on_shutdown(topic, entries)
+
+    def _drop_on_shutdown(self, topic: str, entries: list[dict[str, str]]) -> None:
+        with self._stats_lock:
+            self.failed += len(entries)
+        logger.error(f"Dropping {len(entries)} message(s) for SNS topic {topic} on shutdown")
+
+    def _publish_batch(self, topic: str, entries: list[dict[str, str]]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            start = time.perf_counter()
+            try:
+                response = self.client.publish_batch(
+                    TopicArn=topic, PublishBatchRequestEntries=entries
+                )
+                failed = response.get("Failed", [])
+            except Exception as e:
+                logger.error(f"Error occurred while publishing batch to SNS topic {topic}: {e}")
+                failed = [{"Id": entry["Id"], "SenderFault": False} for entry in entries]
+
+            latency_ms = (time.perf_counter() - start) * 1000
+            self._record_flush(len(entries), len(entries) - len(failed), latency_ms)
+
+            retryable_ids = {f["Id"] for f in failed if not f.get("SenderFault")}
+            rejected = len(failed) - len(retryable_ids)
+            if rejected:
+                with self._stats_lock:
+                    self.failed += rejected
+                logger.error(f"SNS rejected {rejected} message(s) for topic {topic}: {failed}")
+
+            entries = [entry for entry in entries if entry["Id"] in retryable_ids]
+            if not entries:
+                return
+            if attempt < self.max_attempts:
+                time.sleep(self._backoff(attempt))
+
+        with self._stats_lock:
+            self.failed += len(entries)
+        logger.error(
+            f"Dropping {len(entries)} message(s) for SNS topic {topic} "
+            f"after {self.max_attempts} attempts"
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2**attempt))
+
+    def _record_flush(self, size: int, published: int, latency_ms: float) -> None:
+        with self._stats_lock:
+            self.batches += 1
+            self.published += published
+            self.last_batch_size = size
+            self.last_flush_latency_ms = latency_ms
+        self._batch_size_histogram.record(size)
+        self._flush_latency_histogram.record(latency_ms)
+
+
+activity_publisher = SNSBatchPublisher(
+    queue_size=config.sns_publisher_queue_size,
+    batch_size=config.sns_publisher_batch_size,
+    flush_interval=config.sns_publisher_flush_interval,
+    max_attempts=config.sns_publisher_max_attempts,
+    max_in_flight=config.sns_publisher_max_in_flight,
+)
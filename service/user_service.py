@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from models.user import User
+from sqlalchemy import Row
+
 from schemas.activity_level import ActivityLevelResponseSchema
 from schemas.motivation import UserMotivationResponse
 from schemas.user import EmailPreferenceResponse, UserResponse
@@ -10,27 +11,26 @@ class UserService:
     def __init__(self):
         pass
 
-    def get_user_profile(self, user: User) -> UserResponse:
+    def get_user_profile(self, user: Row) -> UserResponse:
+        """Build the profile response from a row loaded by ``UserCRUD.get_user_profile``."""
         age_range = self.__get_age_range(user.date_of_birth)
         anony_email = self.__anonymize_email(user.email)
         age = self.calculate_age(user.date_of_birth)
         latest_motivation = None
-        if user.motivations.all():
-            latest = user.motivations[0]  # As list is sorted by created_at DESC
+        if user.motivation_id is not None:
             latest_motivation = UserMotivationResponse(
-                id=latest.id,
-                user_id=latest.user_id,
-                created_at=latest.created_at,
-                goals=latest.goals,
+                id=user.motivation_id,
+                user_id=user.id,
+                created_at=user.motivation_created_at,
+                goals=user.motivation_goals,
             )
         activity_level = None
-        if user.activity_levels.all():
-            latest_activity_level = user.activity_levels[0]
+        if user.activity_level_id is not None:
             activity_level = ActivityLevelResponseSchema(
-                id=latest_activity_level.id,
-                level=latest_activity_level.level,
-                created_at=latest_activity_level.created_at,
-                updated_at=latest_activity_level.updated_at,
+                id=user.activity_level_id,
+                level=user.activity_level,
+                created_at=user.activity_level_created_at,
+                updated_at=user.activity_level_updated_at,
             )
 
         return UserResponse(
@@ -44,12 +44,11 @@ class UserService:
             age=age,
             email_preferences=[
                 EmailPreferenceResponse(
-                    id=ep.id,
-                    name=ep.name,
-                    is_active=ep.is_active,
+                    id=ep["id"],
+                    name=ep["name"],
+                    is_active=ep["is_active"],
                 )
                 for ep in user.email_preferences
-                if user.email_preferences
             ],
             latest_motivation=latest_motivation,
             latest_activity_level=activity_level,
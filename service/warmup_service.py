@@ -0,0 +1,105 @@
+import asyncio
+import inspect
+import time
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+from utils.base_config import config, logger
+
+
+class WarmUpStatus(Enum):
+    PENDING = "pending"
+    WARM = "warm"
+    FAILED = "failed"
+
+
+class WarmUp:
+    """
+    Warms lazily initialised clients in the background once the app has started.
+
+    Nothing that needs the network is built at import time, so workers start serving
+    straight away. Each registered task then runs once, at most ``max_concurrency`` at a
+    time and each for at most ``timeout`` seconds. Sync tasks run in the threadpool.
+    A task that fails or times out leaves its client to be built on first use, as it
+    would be without warm-up. ``report`` feeds the readiness endpoint.
+    """
+
+    def __init__(self, max_concurrency: int = 4, timeout: float = 10) -> None:
+        """
+        Args:
+            max_concurrency (int): Tasks run at the same time.
+            timeout (float): Seconds a task may take before it's reported failed.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.tasks: dict[str, Callable[[], Any]] = {}
+        self.status: dict[str, WarmUpStatus] = {}
+        self.durations: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def register(self, name: str, task: Callable[[], Any]) -> None:
+        """
+        Add a task to warm up.
+
+        Args:
+            name (str): Name reported by the readiness endpoint.
+            task (Callable): Function or coroutine function building the client.
+        """
+        self.tasks[name] = task
+        self.status[name] = WarmUpStatus.PENDING
+
+    def start(self) -> asyncio.Task:
+        """Start warming every registered task in the background."""
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Cancel the warm-up if it's still running."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def run(self) -> None:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _warm(name: str, task: Callable[[], Any]) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    if inspect.iscoroutinefunction(task):
+                        await asyncio.wait_for(task(), self.timeout)
+                    else:
+                        await asyncio.wait_for(run_in_threadpool(task), self.timeout)
+                except Exception as e:
+                    self.status[name] = WarmUpStatus.FAILED
+                    logger.warning(f"Warm-up of {name} failed: {e!r}")
+                else:
+                    self.status[name] = WarmUpStatus.WARM
+                self.durations[name] = time.perf_counter() - started
+
+        await asyncio.gather(*(_warm(name, task) for name, task in self.tasks.items()))
+        logger.info(f"Warm-up finished: {self.report()['components']}")
+
+    def is_ready(self) -> bool:
+        """Return whether every task has finished, successfully or not."""
+        return WarmUpStatus.PENDING not in self.status.values()
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "ready": self.is_ready(),
+            "components": {
+                name: {
+                    "status": status.value,
+                    "duration_ms": round(self.durations[name] * 1000, 1)
+                    if name in self.durations
+                    else None,
+                }
+                for name, status in self.status.items()
+            },
+        }
+
+
+warmup = WarmUp(max_concurrency=config.warmup_max_concurrency, timeout=config.warmup_timeout)
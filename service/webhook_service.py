@@ -1,62 +1,85 @@
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import insert
+
 from db.session import get_db_context_session
 from models import LogoutUserEmailLogs, MonthlyReportEmailLogs
-from utils.base_config import logger
+from models.email_notification import EmailStatusEnum
+from utils.base_config import config, logger
 
 
-def insert_logout_logs(success_objects_list, failed_objects_list):
+def _event_timestamp(event: dict) -> int | None:
+    try:
+        return int(event.get("timestamp"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _delivery_fields(event: dict, status: EmailStatusEnum) -> dict[str, Any]:
+    return {
+        "user_id": event.get("user_id"),
+        "user_email": event.get("email"),
+        "email_delivery_status": status.value,
+        "timestamp": _event_timestamp(event),
+        "failure_reason": event.get("reason") if status == EmailStatusEnum.FAILED else None,
+        "message_id": event.get("sg_message_id"),
+        "event_id": event.get("sg_event_id"),
+    }
+
+
+def _insert_logs(model, rows: list[dict[str, Any]]) -> int:
+    """
+    Insert log rows in chunks of ``sendgrid_webhook_insert_chunk_size``, skipping events
+    already stored.
+
+    Each chunk is a single multi-row ``INSERT ... ON CONFLICT (event_id) DO NOTHING``, so
+    SendGrid retrying a batch doesn't duplicate its rows.
+
+    Returns:
+        int: Rows inserted.
+    """
+    statement = (
+        insert(model).on_conflict_do_nothing(index_elements=["event_id"]).returning(model.id)
+    )
+    chunk_size = config.sendgrid_webhook_insert_chunk_size
+    inserted = 0
     with get_db_context_session() as db:
-        for success_object in success_objects_list:
-            db_object = LogoutUserEmailLogs(
-                user_id=success_object.get("user_id"),
-                user_email=success_object.get("email"),
-                notification_type=success_object.get("notification_type"),
-                email_delivery_status="Sent",
-                timestamp=int(success_object.get("timestamp")),
-                message_id=success_object.get("sg_message_id"),
-            )
-            db.add(db_object)
-
-        for failed_object in failed_objects_list:
-            db_object = LogoutUserEmailLogs(
-                user_id=failed_object.get("user_id"),
-                user_email=failed_object.get("email"),
-                notification_type=failed_object.get("notification_type"),
-                email_delivery_status="Failed",
-                timestamp=int(failed_object.get("timestamp")),
-                failure_reason=failed_object.get("reason"),
-                message_id=failed_object.get("sg_message_id"),
-            )
-            db.add(db_object)
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            inserted += len(db.scalars(statement.values(chunk)).all())
         db.commit()
+    return inserted
+
+
+def insert_logout_logs(success_objects_list, failed_objects_list):
+    rows = [
+        {
+            **_delivery_fields(event, status),
+            "notification_type": event.get("notification_type"),
+        }
+        for events, status in (
+            (success_objects_list, EmailStatusEnum.SENT),
+            (failed_objects_list, EmailStatusEnum.FAILED),
+        )
+        for event in events
+    ]
+    return _insert_logs(LogoutUserEmailLogs, rows)
 
 
 def insert_monthly_report_logs(success_objects_list, failed_objects_list):
-    with get_db_context_session() as db:
-        for success_object in success_objects_list:
-            db_object = MonthlyReportEmailLogs(
-                report_month=success_object.get("report_month"),
-                batch_id=success_object.get("batch_id"),
-                user_id=success_object.get("user_id"),
-                user_email=success_object.get("email"),
-                email_delivery_status="Sent",
-                timestamp=int(success_object.get("timestamp")),
-                message_id=success_object.get("sg_message_id"),
-            )
-            db.add(db_object)
-
-        for failed_object in failed_objects_list:
-            db_object = MonthlyReportEmailLogs(
-                report_month=failed_object.get("report_month"),
-                batch_id=failed_object.get("batch_id"),
-                user_id=failed_object.get("user_id"),
-                user_email=failed_object.get("email"),
-                email_delivery_status="Failed",
-                timestamp=int(failed_object.get("timestamp")),
-                failure_reason=failed_object.get("reason"),
-                message_id=failed_object.get("sg_message_id"),
-            )
-            db.add(db_object)
-        db.commit()
+    rows = [
+        {
+            **_delivery_fields(event, status),
+            "report_month": event.get("report_month"),
+            "batch_id": event.get("batch_id"),
+        }
+        for events, status in (
+            (success_objects_list, EmailStatusEnum.SENT),
+            (failed_objects_list, EmailStatusEnum.FAILED),
+        )
+        for event in events
+    ]
+    return _insert_logs(MonthlyReportEmailLogs, rows)
 
 
 def handle_sendgrid_webhook(body, webhook_type):
@@ -64,6 +87,17 @@ def handle_sendgrid_webhook(body, webhook_type):
     failed_objects_list = []
 
     for event in body:
+        # Deliveries are merged before they're written, so a malformed event is skipped
+        # rather than failing the events of every delivery it was merged with
+        if not isinstance(event, dict):
+            logger.warning(f"Skipping {webhook_type} webhook event that is not an object")
+            continue
+        if event.get("event") in ["delivered", "bounced", "dropped"] and (
+            _event_timestamp(event) is None
+        ):
+            logger.warning(f"Skipping {webhook_type} webhook event without a valid timestamp")
+            continue
+
         if event.get("event") == "delivered":
             success_objects_list.append(event)
         elif event.get("event") in ["bounced", "dropped"]:
@@ -0,0 +1,250 @@
+import queue
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from service.webhook_service import handle_sendgrid_webhook
+from utils.base_config import config, logger
+
+meter = metrics.get_meter("active10.webhook-writer")
+
+# Errors a later attempt can succeed after: the database is unreachable or the pool is full
+TRANSIENT_WRITE_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError)
+
+
+class WebhookEventWriter:
+    """
+    In-process writer that lets the SendGrid webhook acknowledge before events hit the DB.
+
+    ``submit`` puts a validated batch of events on a queue and returns straight away. The
+    queue is bounded by the number of events it holds, not deliveries, since one
+    delivery can carry thousands of events. A delivery that would take it past
+    ``max_queued_events`` is rejected, unless the queue is empty, so an oversized delivery
+    is still accepted eventually.
+
+    A writer thread merges queued events per webhook type and writes them once
+    ``batch_size`` events are buffered, or once the oldest is ``flush_interval`` seconds
+    old. A write that fails with a transient database error is retried with exponential
+    backoff and full jitter; the inserts are idempotent, so a retry never duplicates rows.
+    If a merged write fails for any other reason, its deliveries are written one by one,
+    so a malformed delivery only loses its own events.
+
+    ``stop`` drains the queue before returning, so buffered events are not lost on a clean
+    shutdown.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        write: Callable[[list[dict[str, Any]], str], Any] = handle_sendgrid_webhook,
+        max_queued_events: int = 20000,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        max_attempts: int = 3,
+        retry_base_delay: float = 0.5,
+    ) -> None:
+        """
+        Args:
+            write (Callable): Writes a list of events of one webhook type.
+            max_queued_events (int): Maximum number of events waiting to be written.
+            batch_size (int): Events buffered per webhook type before they are written.
+            flush_interval (float): Maximum seconds an event waits for its batch to fill.
+            max_attempts (int): Attempts per batch before its events are dropped and logged.
+            retry_base_delay (float): Base delay in seconds of the backoff.
+        """
+        self.write = write
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.max_queued_events = max_queued_events
+        self._queue: queue.Queue[tuple[str, list[dict[str, Any]]] | None] = queue.Queue()
+        self._queued_events = 0
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.submitted = 0
+        self.rejected = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+        self._batch_size_histogram = meter.create_histogram(
+            "webhook.writer.batch_size", unit="{event}", description="Events per write"
+        )
+        meter.create_observable_gauge(
+            "webhook.writer.queue_depth",
+            callbacks=[self._observe_queue_depth],
+            unit="{event}",
+            description="Webhook events waiting to be written",
+        )
+
+    def start(self) -> None:
+        """Start the writer thread if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="webhook-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Write every buffered event and stop the writer.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for the writer to drain.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(None)
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.error(f"Webhook writer did not drain within {timeout}s")
+            self._thread = None
+
+    def submit(self, webhook_type: str, events: list[dict[str, Any]]) -> bool:
+        """
+        Queue a webhook delivery for writing without blocking.
+
+        Args:
+            webhook_type (str): The ``webhook_type`` custom arg of the delivery.
+            events (list): The delivery's events.
+
+        Returns:
+            bool: True if the events were queued, False if the queue is full.
+        """
+        self.start()
+        with self._stats_lock:
+            full = (
+                self._queued_events > 0
+                and self._queued_events + len(events) > self.max_queued_events
+            )
+            if full:
+                self.rejected += 1
+            else:
+                self._queued_events += len(events)
+                self.submitted += 1
+        if full:
+            logger.warning(f"Webhook writer queue is full, rejecting {len(events)} event(s)")
+            return False
+        self._queue.put_nowait((webhook_type, events))
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return writer counters and the current queue depth."""
+        return {
+            "queue_depth": self._queued_events,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    def _observe_queue_depth(self, _options: CallbackOptions):
+        yield Observation(self._queued_events)
+
+    def _run(self) -> None:
+        # Deliveries are buffered separately so a batch that can't be written can be split
+        buffers: dict[str, list[list[dict[str, Any]]]] = {}
+        buffered: dict[str, int] = {}
+        oldest: float | None = None
+
+        while True:
+            timeout = None
+            if oldest is not None:
+                timeout = max(0.0, oldest + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+
+            if item is None:
+                self._flush_all(buffers, buffered)
+                return
+
+            if item:
+                webhook_type, events = item
+                with self._stats_lock:
+                    self._queued_events -= len(events)
+                buffers.setdefault(webhook_type, []).append(events)
+                buffered[webhook_type] = buffered.get(webhook_type, 0) + len(events)
+                if oldest is None:
+                    oldest = time.monotonic()
+                if buffered[webhook_type] >= self.batch_size:
+                    del buffered[webhook_type]
+                    self._flush(webhook_type, buffers.pop(webhook_type))
+
+            if oldest is not None and time.monotonic() - oldest >= self.flush_interval:
+                self._flush_all(buffers, buffered)
+            if not buffers:
+                oldest = None
+
+    def _flush_all(
+        self, buffers: dict[str, list[list[dict[str, Any]]]], buffered: dict[str, int]
+    ) -> None:
+        buffered.clear()
+        for webhook_type in list(buffers):
+            self._flush(webhook_type, buffers.pop(webhook_type))
+
+    def _flush(self, webhook_type: str, deliveries: list[list[dict[str, Any]]]) -> None:
+        """
+        Write merged deliveries of one webhook type.
+
+        If the merged write fails with an error that a retry won't fix, each delivery is
+        written on its own, so a malformed delivery only loses its own events.
+        """
+        events = [event for delivery in deliveries for event in delivery]
+        error = self._write(webhook_type, events)
+        if error is None:
+            return
+
+        if len(deliveries) > 1 and not isinstance(error, TRANSIENT_WRITE_ERRORS):
+            logger.warning(
+                f"Writing {len(deliveries)} merged {webhook_type} webhook deliveries one by one"
+            )
+            for delivery in deliveries:
+                self._flush(webhook_type, [delivery])
+            return
+
+        with self._stats_lock:
+            self.failed += len(events)
+        logger.error(f"Dropping {len(events)} {webhook_type} webhook event(s): {error}")
+
+    def _write(self, webhook_type: str, events: list[dict[str, Any]]) -> Exception | None:
+        """
+        Write events, retrying transient database errors with backoff.
+
+        Returns:
+            Exception | None: The error of the last attempt, or None once written.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.write(events, webhook_type)
+            except Exception as e:
+                logger.error(f"Error occurred while writing {webhook_type} webhook events: {e}")
+                if not isinstance(e, TRANSIENT_WRITE_ERRORS) or attempt == self.max_attempts:
+                    return e
+                time.sleep(random.uniform(0, self.retry_base_delay * 2**attempt))
+                continue
+
+            with self._stats_lock:
+                self.batches += 1
+                self.written += len(events)
+            self._batch_size_histogram.record(len(events))
+            return None
+
+
+webhook_writer = WebhookEventWriter(
+    max_queued_events=config.sendgrid_webhook_max_queued_events,
+    batch_size=config.sendgrid_webhook_batch_size,
+    flush_interval=config.sendgrid_webhook_flush_interval,
+)
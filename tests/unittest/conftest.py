@@ -1,3 +1,4 @@
+import threading
 import time
 from contextlib import contextmanager
 from uuid import uuid4
@@ -10,22 +11,26 @@ from docker.errors import DockerException
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from sqlalchemy import NullPool, create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from testcontainers.postgres import PostgresContainer
 from testcontainers.redis import RedisContainer
 
 from crud.user_crud import UserCRUD
-from db.session import Base, get_db_session
+from db.session import Base, get_async_db_session, get_db_session
 from main import app
 from models import User, UserToken
+from service.async_redis_service import AsyncRedisService
 from service.nhs_login_service import NHSLoginService
 from service.redis_service import RedisService, get_redis_service
+from service.resource_cache_service import RESOURCE_CACHE_PREFIX
+from service.sns_batch_publisher import activity_publisher
 from utils.base_config import config as settings
 
 user_uuid_pk = uuid4()
 
 try:
-    postgres = PostgresContainer("postgres:16")
+    postgres = PostgresContainer("postgres:16", driver="psycopg")
     postgres.start()
 except DockerException as exc:  # pragma: no cover - only exercised when docker unavailable
     pytest.skip(
@@ -79,6 +84,8 @@ def redis_engine():
     RedisService._pool = None
     RedisService._client = None
     RedisService.initialize_pool()
+    AsyncRedisService._pool = None
+    AsyncRedisService._client = None
 
     yield RedisService
 
@@ -87,11 +94,59 @@ def redis_engine():
     if redis_client:
         redis_client.flushdb()
 
+    RedisService.stop_auth_invalidation_listener()
     RedisService._pool = None
     RedisService._client = None
     redis_container.stop()
 
 
+class LocalSNSStub:
+    """
+    In-memory stand-in for the boto3 SNS client used by the batched publisher.
+
+    Records every PublishBatch call. Entry ids listed in ``fail_ids`` fail once with the
+    given sender fault, and ``errors`` raises that many times before calls succeed.
+    """
+
+    def __init__(self):
+        self.batches: list[tuple[str, list[dict]]] = []
+        self.fail_ids: dict[str, bool] = {}
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def publish_batch(self, TopicArn, PublishBatchRequestEntries):
+        with self._lock:
+            if self.errors:
+                self.errors -= 1
+                raise ConnectionError("SNS is unavailable")
+
+            self.batches.append((TopicArn, list(PublishBatchRequestEntries)))
+            successful, failed = [], []
+            for entry in PublishBatchRequestEntries:
+                if entry["Id"] in self.fail_ids:
+                    sender_fault = self.fail_ids.pop(entry["Id"])
+                    failed.append({"Id": entry["Id"], "SenderFault": sender_fault})
+                else:
+                    successful.append({"Id": entry["Id"], "MessageId": str(uuid4())})
+            return {"Successful": successful, "Failed": failed}
+
+    @property
+    def messages(self) -> list[dict]:
+        return [entry for _, entries in self.batches for entry in entries]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sns_stub():
+    """Point the activity publisher at a local SNS stub for the whole test session."""
+    stub = LocalSNSStub()
+    activity_publisher._client = stub
+
+    yield stub
+
+    activity_publisher.stop()
+    activity_publisher._client = None
+
+
 @pytest.fixture(scope="module")
 def db_session(db_engine):
     connection = db_engine.connect()
@@ -144,13 +199,23 @@ def client(db_session, redis_engine):
     def override_get_db():
         yield db_session
 
+    async def override_get_async_db():
+        # Async routes drive the same transactional test session through AsyncSession
+        yield AsyncSession(sync_session_class=lambda **_: db_session)
+
     app.dependency_overrides[get_db_session] = override_get_db
+    app.dependency_overrides[get_async_db_session] = override_get_async_db
     app.dependency_overrides[NHSLoginService] = MockNHSLoginService
     app.dependency_overrides[get_redis_service] = lambda: RedisService()
 
     with TestClient(app) as client:
         yield client
 
+    # Redis outlives the per-module rollback, so drop resources cached from rolled back rows
+    redis_client = RedisService.get_client()
+    for key in redis_client.scan_iter(f"{RESOURCE_CACHE_PREFIX}:*"):
+        redis_client.delete(key)
+
 
 JWT_ALGORITHM = "HS256"
 JWT_SECRET = settings.auth_jwt_secret
@@ -1,13 +1,16 @@
+import json
 import time
 from datetime import datetime
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import select
 
 from crud.activities_crud import create_activity
+from models.outbox import OutboxEvent
 from schemas.activity import UserActivityRequestSchema
-from service.activity_service import load_activities_data_in_sns
 from tests.unittest.conftest import override_get_db_context_session, user_uuid_pk
+from utils.base_config import config as settings
 
 current_timestamp = int(datetime.now().timestamp())
 
@@ -30,12 +33,9 @@ def add_activity(authenticated_user, db_session):
 
 
 def test_create_activities(client, authenticated_user, db_session):
-    with (
-        patch("fastapi.BackgroundTasks.add_task") as mock_add_task,
-        patch(
-            "crud.activities_crud.get_db_context_session",
-            lambda: override_get_db_context_session(db_session),
-        ),
+    with patch(
+        "crud.activities_crud.get_db_context_session",
+        lambda: override_get_db_context_session(db_session),
     ):
         activity_payload = {
             "date": current_timestamp,
@@ -55,19 +55,17 @@ def test_create_activities(client, authenticated_user, db_session):
         resp = response.json()
         assert resp["message"] == "Success"
 
-        mock_add_task.assert_called_once()
-        args, _kwargs = mock_add_task.call_args
-        assert args[0] == load_activities_data_in_sns
-        assert str(args[2]) == str(user_uuid_pk)
+        event = db_session.scalars(select(OutboxEvent).order_by(OutboxEvent.id.desc())).first()
+        assert event.target == settings.aws_sns_activity_topic_arn
+        message = json.loads(event.message)
+        assert message["user_id"] == str(user_uuid_pk)
+        assert message["date"] == current_timestamp
 
 
 def test_create_activities_without_rewards(client, authenticated_user, db_session):
-    with (
-        patch("fastapi.BackgroundTasks.add_task") as mock_add_task,
-        patch(
-            "crud.activities_crud.get_db_context_session",
-            lambda: override_get_db_context_session(db_session),
-        ),
+    with patch(
+        "crud.activities_crud.get_db_context_session",
+        lambda: override_get_db_context_session(db_session),
     ):
         activity_payload = {
             "date": current_timestamp,
@@ -86,10 +84,11 @@ def test_create_activities_without_rewards(client, authenticated_user, db_sessio
         resp = response.json()
         assert resp["message"] == "Success"
 
-        mock_add_task.assert_called_once()
-        args, _kwargs = mock_add_task.call_args
-        assert args[0] == load_activities_data_in_sns
-        assert str(args[2]) == str(user_uuid_pk)
+        event = db_session.scalars(select(OutboxEvent).order_by(OutboxEvent.id.desc())).first()
+        assert event.target == settings.aws_sns_activity_topic_arn
+        message = json.loads(event.message)
+        assert message["user_id"] == str(user_uuid_pk)
+        assert message["date"] == current_timestamp
 
 
 def test_create_activities_missing_fields(client, authenticated_user):
@@ -152,3 +151,76 @@ def test_list_activities_by_unauthenticated_user(client, unauthenticated_user):
     )
 
     assert response.status_code == 404  # noqa: PLR2004
+
+
+@pytest.fixture
+def march_activities(authenticated_user, db_session):
+    dates = [1709251200 + day * 86400 for day in (4, 0, 2, 1, 3)]  # 1-5 March 2024
+    with patch(
+        "crud.activities_crud.get_db_context_session",
+        lambda: override_get_db_context_session(db_session),
+    ):
+        for date in dates:
+            create_activity(
+                activity_payload=UserActivityRequestSchema(
+                    date=date,
+                    user_postcode="HD81",
+                    user_age_range="23-39",
+                    activity={"brisk_minutes": 1, "walking_minutes": 2, "steps": 3},
+                ),
+                user_id=authenticated_user.id,
+            )
+        yield {"start_date": 1709251200, "end_date": 1711929599}
+
+
+def test_list_activities_cursor_pagination(
+    client, authenticated_user, db_session, march_activities
+):
+    headers = {"Authorization": f"Bearer {authenticated_user.token.token}"}
+    params = {**march_activities, "limit": 2}
+    dates = []
+
+    with patch(
+        "crud.activities_crud.get_db_context_session",
+        lambda: override_get_db_context_session(db_session),
+    ):
+        for _ in range(3):
+            response = client.get("/v1/activities", params=params, headers=headers)
+            assert response.status_code == 200  # noqa: PLR2004
+            dates.extend(activity["date"] for activity in response.json())
+            params["cursor"] = response.headers.get("X-Next-Cursor")
+
+    assert params["cursor"] is None
+    assert dates == sorted(dates)
+    assert len(dates) == 5  # noqa: PLR2004
+
+
+def test_list_activities_invalid_cursor(client, authenticated_user):
+    response = client.get(
+        "/v1/activities",
+        params={"cursor": "not-a-cursor"},
+        headers={"Authorization": f"Bearer {authenticated_user.token.token}"},
+    )
+
+    assert response.status_code == 400  # noqa: PLR2004
+
+
+def test_list_activities_streams_ndjson(client, authenticated_user, db_session, march_activities):
+    with patch(
+        "crud.activities_crud.get_db_context_session",
+        lambda: override_get_db_context_session(db_session),
+    ):
+        response = client.get(
+            "/v1/activities",
+            params=march_activities,
+            headers={
+                "Authorization": f"Bearer {authenticated_user.token.token}",
+                "Accept": "application/x-ndjson",
+            },
+        )
+
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["date"] for row in rows] == sorted(row["date"] for row in rows)
+    assert rows[0]["steps"] == 3  # noqa: PLR2004
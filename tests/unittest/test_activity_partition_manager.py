@@ -0,0 +1,109 @@
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from service.activity_partition_manager import ActivityPartitionManager, month_bounds
+
+
+@pytest.fixture
+def manager(db_engine):
+    yield ActivityPartitionManager(engine=db_engine, months_ahead=2, archive_schema="archive")
+
+    with db_engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA IF EXISTS archive CASCADE"))
+
+
+def _partitions(db_engine) -> dict[str, str]:
+    with db_engine.connect() as connection:
+        return dict(
+            connection.execute(
+                text(
+                    """
+                    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+                    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+                    WHERE i.inhparent = 'activities'::regclass
+                    """
+                )
+            ).all()
+        )
+
+
+def _insert_activities(db_engine, dates: list[int]):
+    with db_engine.begin() as connection:
+        for activity_date in dates:
+            connection.execute(
+                text(
+                    """
+                    INSERT INTO activities (id, date, user_postcode, user_age_range,
+                        brisk_minutes, walking_minutes, steps)
+                    VALUES (:id, :date, 'HD81', '23-39', 1, 2, 3)
+                    """
+                ),
+                {"id": uuid4(), "date": activity_date},
+            )
+
+
+def _count(db_engine, table: str, lo: int, hi: int) -> int:
+    with db_engine.connect() as connection:
+        return connection.scalar(
+            text(f"SELECT count(*) FROM {table} WHERE date >= :lo AND date < :hi"),
+            {"lo": lo, "hi": hi},
+        )
+
+
+def test_dry_run_changes_nothing(db_engine, manager):
+    manager.dry_run = True
+
+    statements = manager.run(date(2031, 1, 15))
+
+    assert any("ATTACH PARTITION activities_2031_03" in statement for statement in statements)
+    assert "activities_2031_01" not in _partitions(db_engine)
+
+
+def test_creates_months_ahead_once(db_engine, manager):
+    manager.run(date(2031, 1, 15))
+
+    partitions = _partitions(db_engine)
+    for name, month in (("activities_2031_01", 1), ("activities_2031_03", 3)):
+        lo, hi = month_bounds(date(2031, month, 1))
+        assert partitions[name] == f"FOR VALUES FROM ('{lo}') TO ('{hi}')"
+    assert "activities_2031_04" not in partitions
+    assert manager.run(date(2031, 1, 15)) == []
+
+
+def test_splits_rows_out_of_default_partition(db_engine, manager):
+    lo, hi = month_bounds(date(2032, 5, 1))
+    _insert_activities(db_engine, [lo, lo + 86400, hi - 1, hi])
+
+    statements = manager.run(date(2031, 1, 15))
+
+    assert any(statement.startswith("WITH moved AS") for statement in statements)
+    assert _count(db_engine, "activities_2032_05", lo, hi) == 3  # noqa: PLR2004
+    assert _count(db_engine, "activities_default", lo, hi) == 0
+    assert _count(db_engine, "activities", lo, hi + 1) == 4  # noqa: PLR2004
+    assert "activities_2032_06" in _partitions(db_engine)
+    with db_engine.connect() as connection:
+        constraints = connection.scalars(
+            text(
+                "SELECT conname FROM pg_constraint WHERE conrelid = 'activities_default'::regclass"
+            )
+        )
+        assert not [name for name in constraints if name.startswith("activities_default_not_")]
+
+
+def test_archives_partitions_past_retention(db_engine, manager):
+    lo, hi = month_bounds(date(2001, 1, 1))
+    _insert_activities(db_engine, [lo])
+    manager.run(date(2001, 1, 1))
+    assert "activities_2001_01" in _partitions(db_engine)
+
+    manager.retention_months = 1
+    manager.run(date(2001, 3, 10))
+
+    partitions = _partitions(db_engine)
+    assert "activities_2001_01" not in partitions
+    assert "activities_2001_03" in partitions
+    assert _count(db_engine, "activities", lo, hi) == 0
+    assert _count(db_engine, "archive.activities_2001_01", lo, hi) == 1
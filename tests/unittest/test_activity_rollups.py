@@ -0,0 +1,103 @@
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, select
+
+from crud.activities_crud import create_activity
+from models import Activity, UserActivityDailyRollup, UserActivityMonthlyRollup
+from schemas.activity import UserActivityRequestSchema
+from tests.unittest.conftest import override_get_db_context_session
+
+# 28 Feb 10:00, 29 Feb 23:30, 1 Mar 00:30 and 1 Mar 12:00 2020 UTC, all in the ISO week of 24 Feb
+DATES = [1582884000, 1583019000, 1583022600, 1583064000]
+RANGE = {"start_date": 1582502400, "end_date": 1583107199}  # 24 Feb - 1 Mar 2020
+
+
+@pytest.fixture
+def leap_day_activities(authenticated_user, db_session):
+    with patch(
+        "crud.activities_crud.get_db_context_session",
+        lambda: override_get_db_context_session(db_session),
+    ):
+        for date in DATES:
+            create_activity(
+                activity_payload=UserActivityRequestSchema(
+                    date=date,
+                    user_postcode="HD81",
+                    user_age_range="23-39",
+                    activity={"brisk_minutes": 10, "walking_minutes": 20, "steps": 1000},
+                ),
+                user_id=authenticated_user.id,
+            )
+
+    yield
+
+    db_session.execute(delete(Activity).where(Activity.date.in_(DATES)))
+    db_session.commit()
+
+
+def _summary(client, authenticated_user, **params):
+    return client.get(
+        "/v1/activities/summary",
+        params=RANGE | params,
+        headers={"Authorization": f"Bearer {authenticated_user.token.token}"},
+    )
+
+
+@pytest.mark.parametrize(
+    ("granularity", "expected"),
+    [
+        ("day", [("2020-02-28", 1), ("2020-02-29", 1), ("2020-03-01", 2)]),
+        ("week", [("2020-02-24", 4)]),
+        ("month", [("2020-02-01", 2), ("2020-03-01", 2)]),
+    ],
+)
+def test_activities_summary(client, authenticated_user, leap_day_activities, granularity, expected):
+    response = _summary(client, authenticated_user, granularity=granularity)
+
+    assert response.status_code == 200  # noqa: PLR2004
+    body = response.json()
+    assert [(row["period_start"], row["activity_count"]) for row in body] == expected
+    assert all(
+        row["steps"] == 1000 * row["activity_count"]
+        and row["brisk_minutes"] == 10 * row["activity_count"]
+        for row in body
+    )
+
+
+def test_rollups_follow_updates_and_deletes(authenticated_user, db_session, leap_day_activities):
+    activities = db_session.scalars(
+        select(Activity).where(Activity.date.in_(DATES[2:])).order_by(Activity.date)
+    ).all()
+    activities[0].steps = 500
+    db_session.flush()
+    db_session.execute(delete(Activity).where(Activity.id == activities[1].id))
+
+    [march] = db_session.scalars(
+        select(UserActivityMonthlyRollup).where(
+            UserActivityMonthlyRollup.user_id == authenticated_user.id,
+            UserActivityMonthlyRollup.period_start == date(2020, 3, 1),
+        )
+    ).all()
+    assert (march.steps, march.activity_count) == (500, 1)
+
+    db_session.execute(delete(Activity).where(Activity.id == activities[0].id))
+    days = db_session.scalars(
+        select(UserActivityDailyRollup.period_start).where(
+            UserActivityDailyRollup.user_id == authenticated_user.id
+        )
+    ).all()
+    assert [day.isoformat() for day in days] == ["2020-02-28", "2020-02-29"]
+
+
+def test_activities_summary_not_found(client, authenticated_user):
+    response = _summary(client, authenticated_user, granularity="week")
+
+    assert response.status_code == 404  # noqa: PLR2004
+
+
+def test_activities_summary_invalid_range(client, authenticated_user):
+    response = _summary(client, authenticated_user, start_date=1583107199, end_date=1582502400)
+
+    assert response.status_code == 400  # noqa: PLR2004
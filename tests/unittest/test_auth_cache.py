@@ -1,9 +1,17 @@
+import asyncio
+import threading
+import time
 from http import HTTPStatus
+from unittest.mock import MagicMock, call, patch
+from uuid import uuid4
 
 from fastapi.testclient import TestClient
 
 from models import User
+from service.async_redis_service import AsyncRedisService
+from service.auth_cache_service import AUTH_INVALIDATION_CHANNEL, LocalAuthCache, local_auth_cache
 from service.redis_service import RedisService
+from tests.unittest.conftest import create_user_token
 
 
 def test_auth_cache_set_and_hit(client: TestClient, authenticated_user: User, db_session) -> None:
@@ -48,3 +56,208 @@ def test_auth_cache_invalidation_on_logout(
     assert resp.status_code == HTTPStatus.OK
 
     assert RedisService.get_auth_cache(token_hash) is None
+
+
+def test_local_auth_cache_hit_after_first_request(
+    client: TestClient, authenticated_user: User
+) -> None:
+    token = authenticated_user.token.token
+    token_hash = RedisService.hash_token(token)
+    local_auth_cache.invalidate(token_hash)
+
+    resp1 = client.get("/v1/users/", headers={"Authorization": f"Bearer {token}"})
+    assert resp1.status_code == HTTPStatus.OK
+    assert local_auth_cache.get(token_hash) == {
+        "user_id": str(authenticated_user.id),
+        "valid": True,
+    }
+
+    hits_before = local_auth_cache.stats()["hits"]
+    resp2 = client.get("/v1/users/", headers={"Authorization": f"Bearer {token}"})
+    assert resp2.status_code == HTTPStatus.OK
+    assert local_auth_cache.stats()["hits"] == hits_before + 1
+
+
+def test_local_auth_cache_invalidation_on_logout(
+    client: TestClient, authenticated_user: User
+) -> None:
+    token = authenticated_user.token.token
+    token_hash = RedisService.hash_token(token)
+
+    resp = client.get("/v1/users/", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == HTTPStatus.OK
+
+    resp = client.post("/nhs_login/logout", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == HTTPStatus.OK
+
+    assert local_auth_cache.get(token_hash) is None
+
+
+def test_local_auth_cache_invalidation_via_pubsub(redis_engine) -> None:
+    local_auth_cache.set("published-token-hash", str(uuid4()))
+
+    assert RedisService.publish(AUTH_INVALIDATION_CHANNEL, "published-token-hash")
+
+    deadline = time.time() + 5
+    while local_auth_cache.get("published-token-hash") is not None and time.time() < deadline:
+        time.sleep(0.05)
+    assert local_auth_cache.get("published-token-hash") is None
+
+
+def test_local_auth_cache_lru_eviction() -> None:
+    cache = LocalAuthCache(max_size=2, ttl=60)
+    cache.set("a", "user-a")
+    cache.set("b", "user-b")
+    assert cache.get("a") is not None  # "a" becomes most recently used
+
+    cache.set("c", "user-c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["size"] == 2  # noqa: PLR2004
+
+
+def test_local_auth_cache_ttl_capped_by_token_expiry() -> None:
+    cache = LocalAuthCache(max_size=10, ttl=60)
+
+    assert not cache.set("expired", "user", token_exp=time.time() - 1)
+    assert cache.get("expired") is None
+
+    assert cache.set("short-lived", "user", token_exp=time.time() + 0.1)
+    time.sleep(0.2)
+    assert cache.get("short-lived") is None
+
+
+def test_local_auth_cache_negative_entry() -> None:
+    cache = LocalAuthCache(max_size=10, ttl=60)
+    cache.set("bad", "user", valid=False)
+
+    assert cache.get("bad") == {"user_id": "user", "valid": False}
+
+
+def test_local_auth_cache_exports_metrics() -> None:
+    cache = LocalAuthCache(max_size=10, ttl=60)
+    cache._requests_counter = MagicMock()
+    cache._invalidations_counter = MagicMock()
+
+    cache.get("a")
+    cache.set("a", "user")
+    cache.get("a")
+    cache.invalidate("a")
+    cache.invalidate("a")
+
+    assert cache._requests_counter.add.call_args_list == [
+        call(1, {"result": "miss"}),
+        call(1, {"result": "hit"}),
+    ]
+    cache._invalidations_counter.add.assert_called_once_with(1)
+    assert [observation.value for observation in cache._observe_size(None)] == [0]
+
+
+def test_local_auth_cache_disabled() -> None:
+    cache = LocalAuthCache(max_size=0, ttl=60)
+
+    assert not cache.set("a", "user")
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 0, "misses": 1, "invalidations": 0, "size": 0}
+
+
+def test_async_auth_cache_set_and_hit(client: TestClient, authenticated_user: User) -> None:
+    token = authenticated_user.token.token
+    token_hash = RedisService.hash_token(token)
+    local_auth_cache.invalidate(token_hash)
+    RedisService.get_client().delete(token_hash)
+    activity_payload = {
+        "date": int(time.time()),
+        "user_postcode": "HD81",
+        "user_age_range": "23-39",
+        "activity": {"brisk_minutes": 109, "walking_minutes": 30, "steps": 1867},
+    }
+
+    with patch("fastapi.BackgroundTasks.add_task"):
+        resp1 = client.post(
+            "/v1/activities", json=activity_payload, headers={"Authorization": f"Bearer {token}"}
+        )
+        assert resp1.status_code == HTTPStatus.CREATED
+        assert RedisService.get_auth_cache(token_hash) == {
+            "user_id": str(authenticated_user.id),
+            "valid": True,
+        }
+
+        local_auth_cache.invalidate(token_hash)
+        resp2 = client.post(
+            "/v1/activities", json=activity_payload, headers={"Authorization": f"Bearer {token}"}
+        )
+        assert resp2.status_code == HTTPStatus.CREATED
+        assert local_auth_cache.get(token_hash) is not None
+
+
+def test_async_auth_rejects_mismatched_token(
+    client: TestClient, authenticated_user: User, db_session
+) -> None:
+    stale_token = authenticated_user.token.token
+    create_user_token(authenticated_user, db_session)
+
+    with patch("fastapi.BackgroundTasks.add_task"):
+        resp = client.post(
+            "/v1/activities",
+            json={
+                "date": int(time.time()),
+                "user_postcode": "HD81",
+                "user_age_range": "23-39",
+                "activity": {"brisk_minutes": 1, "walking_minutes": 1, "steps": 1},
+            },
+            headers={"Authorization": f"Bearer {stale_token}"},
+        )
+
+    assert resp.status_code == HTTPStatus.FORBIDDEN
+    assert RedisService.get_auth_cache(RedisService.hash_token(stale_token))["valid"] is False
+
+
+def test_async_redis_service_auth_cache_round_trip(redis_engine) -> None:
+    user_id = str(uuid4())
+
+    async def _round_trip():
+        assert await AsyncRedisService.set_auth_cache("async-token-hash", user_id, ttl=60)
+        cached = await AsyncRedisService.get_auth_cache("async-token-hash")
+        assert await AsyncRedisService.delete_auth_cache("async-token-hash", user_id)
+        deleted = await AsyncRedisService.get_auth_cache("async-token-hash")
+        await AsyncRedisService.close()
+        return cached, deleted
+
+    cached, deleted = asyncio.run(_round_trip())
+
+    assert cached == {"user_id": user_id, "valid": True}
+    assert deleted is None
+
+
+def test_async_redis_pool_from_previous_loop_is_disconnected(redis_engine) -> None:
+    old_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=old_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def ping():
+        await AsyncRedisService.get_client().ping()
+        return AsyncRedisService._pool
+
+    async def ping_and_close():
+        try:
+            return await ping()
+        finally:
+            await AsyncRedisService.close()
+
+    try:
+        old_pool = asyncio.run_coroutine_threadsafe(ping(), old_loop).result(5)
+        [old_connection] = old_pool._available_connections
+        new_pool = asyncio.run(ping_and_close())
+        deadline = time.time() + 2
+        while old_connection.is_connected and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        old_loop.call_soon_threadsafe(old_loop.stop)
+        thread.join(5)
+        old_loop.close()
+
+    assert new_pool is not old_pool
+    assert not old_connection.is_connected
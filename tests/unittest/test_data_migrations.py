@@ -1,6 +1,15 @@
-from unittest.mock import patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
 
+import pytest
+from sqlalchemy import delete, select
+
+from models import Activity
+from schemas.activity import UserActivityRequestSchema
+from service.migrations_service import MonthlyActivityBatcher
 from tests.unittest.conftest import override_get_db_context_session
+from utils.ndjson_utils import LineTooLong, iter_ndjson_lines
 
 
 def test_post_activities_migrations(client, authenticated_user, db_session):
@@ -140,3 +149,213 @@ def test_post_activities_migrations_with_missing_month_field(client, authenticat
     )
 
     assert response.status_code == 422  # noqa: PLR2004
+
+
+def _migration_month(month: int, days: list[int], steps: int) -> dict:
+    return {
+        "month": month,
+        "activities": [
+            {
+                "date": month + day * 86400,
+                "user_postcode": "HD81",
+                "user_age_range": "23-39",
+                "rewards": [{"earned": 63, "slug": "high_five"}],
+                "activity": {"brisk_minutes": 10, "walking_minutes": 20, "steps": steps},
+            }
+            for day in days
+        ],
+    }
+
+
+def test_post_bulk_activities_migrations_upserts(client, authenticated_user, db_session):
+    january, february = 1420070400, 1422748800  # 2015-01-01, 2015-02-01 UTC
+    headers = {"Authorization": f"Bearer {authenticated_user.token.token}"}
+
+    with patch(
+        "crud.activities_crud.get_db_context_session",
+        lambda: override_get_db_context_session(db_session),
+    ):
+        first = client.post(
+            "/v1/migrations/activities/bulk",
+            json={"months": [_migration_month(january, [0, 1, 30], 100)]},
+            headers=headers,
+        )
+        # Re-sent January days are updated, the duplicate date keeps its last row
+        second = client.post(
+            "/v1/migrations/activities/bulk",
+            json={
+                "months": [
+                    _migration_month(january, [1, 30], 200),
+                    _migration_month(february, [0, 0, 27], 300),
+                ]
+            },
+            headers=headers,
+        )
+
+    rows = db_session.execute(
+        select(Activity.date, Activity.steps, Activity.rewards)
+        .where(Activity.user_id == authenticated_user.id, Activity.date < february + 28 * 86400)
+        .where(Activity.date >= january)
+        .order_by(Activity.date)
+    ).all()
+    db_session.execute(
+        delete(Activity).where(
+            Activity.user_id == authenticated_user.id,
+            Activity.date >= january,
+            Activity.date < february + 28 * 86400,
+        )
+    )
+    db_session.commit()
+
+    assert first.status_code == 200  # noqa: PLR2004
+    assert first.json() == {"inserted": 3, "updated": 0}
+    assert second.json() == {"inserted": 2, "updated": 2}
+    assert [(date - january) // 86400 for date, _, _ in rows] == [0, 1, 30, 31, 58]
+    assert [steps for _, steps, _ in rows] == [100, 200, 200, 300, 300]
+    assert rows[0].rewards == [{"earned": 63, "slug": "high_five"}]
+
+
+def test_post_bulk_activities_migrations_with_out_of_range_activities(client, authenticated_user):
+    january = 1420070400
+    month = _migration_month(january, [0], 100)
+    month["activities"].append(_migration_month(january, [31], 100)["activities"][0])
+
+    response = client.post(
+        "/v1/migrations/activities/bulk",
+        json={"months": [month]},
+        headers={"Authorization": f"Bearer {authenticated_user.token.token}"},
+    )
+
+    assert response.status_code == 400  # noqa: PLR2004
+    assert response.json() == {"detail": "Some activities are out of the month range"}
+
+
+def _ndjson(dates: list[int]) -> str:
+    return "".join(
+        json.dumps(_migration_month(date, [0], 100)["activities"][0]) + "\n" for date in dates
+    )
+
+
+def test_stream_activities_migrations_publishes_each_month(client, authenticated_user):
+    january, february, march = 1420070400, 1422748800, 1425168000  # 2015 UTC
+    dates = [january, january + 86400, february, march, march + 86400]
+    publish = AsyncMock()
+
+    with patch("api.v2.data_migrations.publish_month_of_activities", publish):
+        response = client.post(
+            "/v2/migrations/activities/stream",
+            content=_ndjson(dates) + "\n",
+            headers={
+                "Authorization": f"Bearer {authenticated_user.token.token}",
+                "Content-Type": "application/x-ndjson",
+            },
+        )
+
+    assert response.status_code == 201  # noqa: PLR2004
+    assert response.json() == {"message": "Success", "activities": 5, "batches": 3}
+    batches = [call.args[0] for call in publish.await_args_list]
+    assert [batch.month for batch in batches] == [january, february, march]
+    assert [len(batch.activities) for batch in batches] == [2, 1, 2]
+    assert {call.args[1] for call in publish.await_args_list} == {str(authenticated_user.id)}
+
+
+def test_stream_activities_migrations_stops_at_invalid_line(client, authenticated_user):
+    january, february = 1420070400, 1422748800
+    content = _ndjson([january, february]) + '{"date": "not a date"}\n' + _ndjson([february])
+    publish = AsyncMock()
+
+    with patch("api.v2.data_migrations.publish_month_of_activities", publish):
+        response = client.post(
+            "/v2/migrations/activities/stream",
+            content=content,
+            headers={"Authorization": f"Bearer {authenticated_user.token.token}"},
+        )
+
+    # January was published as soon as February started
+    assert response.status_code == 400  # noqa: PLR2004
+    assert response.json() == {"detail": "Activity on line 3 is invalid", "published_batches": 1}
+    assert publish.await_count == 1
+    assert publish.await_args.args[0].month == january
+
+
+@pytest.mark.parametrize("date", [-5, 0, 10**12, 10**20])
+def test_stream_activities_migrations_rejects_out_of_range_date(client, authenticated_user, date):
+    january, february = 1420070400, 1422748800
+    publish = AsyncMock()
+
+    with patch("api.v2.data_migrations.publish_month_of_activities", publish):
+        response = client.post(
+            "/v2/migrations/activities/stream",
+            content=_ndjson([january, february, date]),
+            headers={"Authorization": f"Bearer {authenticated_user.token.token}"},
+        )
+
+    assert response.status_code == 400  # noqa: PLR2004
+    assert response.json() == {"detail": "Activity on line 3 is invalid", "published_batches": 1}
+    assert publish.await_count == 1
+
+
+def test_monthly_activity_batcher_bounds_open_months():
+    january, february, march = 1420070400, 1422748800, 1425168000
+    batcher = MonthlyActivityBatcher(max_open_months=2)
+    activity = UserActivityRequestSchema.model_validate(
+        _migration_month(january, [0], 100)["activities"][0]
+    )
+
+    closed = []
+    for date in [january, march, february, january, march]:
+        closed += batcher.add(activity.model_copy(update={"date": date}))
+    closed += batcher.flush()
+
+    assert [(batch.month, len(batch.activities)) for batch in closed] == [
+        (january, 1),
+        (january, 1),
+        (february, 1),
+        (march, 2),
+    ]
+
+
+def test_monthly_activity_batcher_closes_month_when_ordered_stream_moves_on():
+    january, february = 1420070400, 1422748800
+    batcher = MonthlyActivityBatcher(max_open_months=2)
+    activity = UserActivityRequestSchema.model_validate(
+        _migration_month(january, [0], 100)["activities"][0]
+    )
+
+    assert batcher.add(activity) == []
+    assert batcher.add(activity.model_copy(update={"date": january + 86400})) == []
+    [closed] = batcher.add(activity.model_copy(update={"date": february}))
+
+    assert (closed.month, len(closed.activities)) == (january, 2)
+    assert [batch.month for batch in batcher.flush()] == [february]
+
+
+def test_monthly_activity_batcher_closes_full_months():
+    january = 1420070400
+    batcher = MonthlyActivityBatcher()
+    month = _migration_month(january, list(range(31)) * 2, 100)
+
+    closed = []
+    for activity in month["activities"]:
+        closed += batcher.add(UserActivityRequestSchema.model_validate(activity))
+
+    assert [len(batch.activities) for batch in closed] == [31, 31]
+    assert batcher.flush() == []
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def test_iter_ndjson_lines_splits_across_chunks():
+    async def collect(*chunks: bytes, max_line_bytes: int = 16):
+        return [line async for line in iter_ndjson_lines(_chunks(*chunks), max_line_bytes)]
+
+    assert asyncio.run(collect(b'{"a"', b": 1}\n\n{", b'"b": 2}')) == [
+        (1, b'{"a": 1}'),
+        (3, b'{"b": 2}'),
+    ]
+    with pytest.raises(LineTooLong) as exc_info:
+        asyncio.run(collect(b"{}\n", b"x" * 10, b"x" * 10))
+    assert exc_info.value.args == (2,)
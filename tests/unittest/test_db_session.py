@@ -0,0 +1,39 @@
+import asyncio
+import json
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from crud.outbox_crud import AsyncOutboxCRUD
+from models.outbox import OutboxDestination, OutboxEvent
+from tests.unittest.conftest import postgres
+
+QUEUE = "http://localhost:4566/000000000000/async-engine.fifo"
+
+
+def test_async_session_commits_through_async_engine():
+    # The client fixture drives async routes through the sync test session, so this is
+    # the test that exercises the psycopg async driver and pool
+    async def append_and_read():
+        engine = create_async_engine(postgres.get_connection_url(), pool_size=1, max_overflow=0)
+        session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+        try:
+            async with session_factory() as db:
+                await AsyncOutboxCRUD(db).append(OutboxDestination.SQS, QUEUE, {"n": 1})
+            async with session_factory() as db:
+                event = await db.scalar(
+                    select(OutboxEvent)
+                    .where(OutboxEvent.target == QUEUE)
+                    .order_by(OutboxEvent.id.desc())
+                )
+                await db.delete(event)
+                await db.commit()
+            return engine.dialect.is_async, event
+        finally:
+            await engine.dispose()
+
+    is_async, event = asyncio.run(append_and_read())
+
+    assert is_async
+    assert event.destination == OutboxDestination.SQS.value
+    assert json.loads(event.message) == {"n": 1}
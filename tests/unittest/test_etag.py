@@ -0,0 +1,84 @@
+from api.etag import _matches
+
+WALKING_PLAN = {"walking_plan_data": {"steps_per_day": 8000, "walking_days": 3}}
+
+
+def _auth(user, **headers) -> dict:
+    return {"Authorization": f"Bearer {user.token.token}", **headers}
+
+
+def test_if_none_match_parsing():
+    assert _matches('W/"abc"', 'W/"abc"')
+    assert _matches('"xyz", "abc"', 'W/"abc"')
+    assert _matches("*", 'W/"abc"')
+    assert not _matches('W/"abd"', 'W/"abc"')
+    assert not _matches(None, 'W/"abc"')
+
+
+def test_walking_plan_not_modified_until_updated(client, authenticated_user):
+    client.post("/v1/walking_plans", json=WALKING_PLAN, headers=_auth(authenticated_user))
+
+    response = client.get("/v1/walking_plans", headers=_auth(authenticated_user))
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = client.get(
+        "/v1/walking_plans", headers=_auth(authenticated_user, **{"If-None-Match": etag})
+    )
+    assert response.status_code == 304  # noqa: PLR2004
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    client.put("/v1/walking_plans", json=WALKING_PLAN, headers=_auth(authenticated_user))
+    response = client.get(
+        "/v1/walking_plans", headers=_auth(authenticated_user, **{"If-None-Match": etag})
+    )
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.headers["ETag"] != etag
+
+    client.delete("/v1/walking_plans", headers=_auth(authenticated_user))
+
+
+def test_daily_targets_etag_changes_on_create(client, authenticated_user):
+    client.post(
+        "/v1/daily_targets",
+        json={"daily_target": 30, "date": 1700000000},
+        headers=_auth(authenticated_user),
+    )
+    etag = client.get("/v1/daily_targets", headers=_auth(authenticated_user)).headers["ETag"]
+
+    client.post(
+        "/v1/daily_targets",
+        json={"daily_target": 40, "date": 1700086400},
+        headers=_auth(authenticated_user),
+    )
+    response = client.get(
+        "/v1/daily_targets", headers=_auth(authenticated_user, **{"If-None-Match": etag})
+    )
+    assert response.status_code == 200  # noqa: PLR2004
+    assert len(response.json()) == 2  # noqa: PLR2004
+
+
+def test_user_profile_etag_changes_on_motivation_write(client, authenticated_user):
+    etag = client.get("/v1/users/", headers=_auth(authenticated_user)).headers["ETag"]
+    not_modified = client.get(
+        "/v1/users/", headers=_auth(authenticated_user, **{"If-None-Match": etag})
+    )
+    assert not_modified.status_code == 304  # noqa: PLR2004
+
+    client.post(
+        "/v1/motivations/",
+        json={"goals": [{"text": "Walk daily"}]},
+        headers=_auth(authenticated_user),
+    )
+    response = client.get(
+        "/v1/users/", headers=_auth(authenticated_user, **{"If-None-Match": etag})
+    )
+    assert response.status_code == 200  # noqa: PLR2004
+
+
+def test_not_found_has_no_etag(client, authenticated_user):
+    response = client.get("/v1/walking_plans", headers=_auth(authenticated_user))
+
+    assert response.status_code == 404  # noqa: PLR2004
+    assert "ETag" not in response.headers
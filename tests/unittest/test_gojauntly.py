@@ -0,0 +1,270 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+import pytest
+from fastapi import HTTPException
+
+from api.v1 import gojauntly as gojauntly_api
+from gojauntly.cache import GoJauntlyCache, request_hash
+from gojauntly.circuit_breaker import CircuitBreaker, CircuitState
+from gojauntly.gojauntly import GoJauntlyApi
+from schemas.gojauntly import CuratedWalkRetrieve, CuratedWalksSearch
+from service.async_redis_service import AsyncRedisService
+from utils.base_config import config
+
+
+class StubGoJauntly(BaseHTTPRequestHandler):
+    """
+    Answers every POST with the number of calls so far. Walks ending in "broken" fail
+    with a 500, and the next ``unavailable`` calls fail with a 503.
+    """
+
+    protocol_version = "HTTP/1.1"
+    calls = 0
+    unavailable = 0
+    delay = 0.0
+    connections: ClassVar[set[int]] = set()
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with StubGoJauntly.lock:
+            StubGoJauntly.calls += 1
+            StubGoJauntly.connections.add(self.client_address[1])
+            calls = StubGoJauntly.calls
+            unavailable = StubGoJauntly.unavailable > 0
+            StubGoJauntly.unavailable -= unavailable
+        time.sleep(StubGoJauntly.delay)
+
+        status = 200
+        if self.path.endswith("broken"):
+            status = 500
+        elif unavailable:
+            status = 503
+        body = json.dumps({"calls": calls, "path": self.path}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGoJauntly)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def upstream(stub_url, redis_engine):
+    StubGoJauntly.calls = 0
+    StubGoJauntly.unavailable = 0
+    StubGoJauntly.delay = 0.0
+    StubGoJauntly.connections = set()
+    redis_client = redis_engine.get_client()
+    for key in redis_client.scan_iter("gojauntly:*"):
+        redis_client.delete(key)
+    return GoJauntlyApi(
+        key_id=config.gojauntly_key_id,
+        secret_key=config.gojauntly_private_key,
+        issuer_id=config.gojauntly_issuer_id,
+        base_url=stub_url,
+        retry_base_delay=0,
+        circuit_breaker=CircuitBreaker("GoJauntly", failure_threshold=2, reset_timeout=0.2),
+    )
+
+
+def run(upstream: GoJauntlyApi, coroutine):
+    async def _run():
+        try:
+            return await coroutine
+        finally:
+            await upstream.close()
+            await AsyncRedisService.close()
+
+    return asyncio.run(_run())
+
+
+def test_request_hash_is_canonical():
+    explicit = CuratedWalksSearch(page=1, amount=10, postcode="HD8 1AA", radius=None)
+    implicit = CuratedWalksSearch(amount=10, postcode="HD8 1AA", page=1)
+
+    assert request_hash(explicit) == request_hash(implicit)
+    assert request_hash(explicit) != request_hash(explicit, "walk-id")
+    assert request_hash(explicit) != request_hash(CuratedWalksSearch(page=2, amount=10))
+
+
+def test_identical_searches_reach_upstream_once(client, authenticated_user, upstream, monkeypatch):
+    monkeypatch.setattr(gojauntly_api, "gojauntly_client", upstream)
+    headers = {"Authorization": f"Bearer {authenticated_user.token.token}"}
+
+    first = client.post(
+        "/v1/curated-walks/search",
+        json={"page": 1, "amount": 5, "postcode": "HD8"},
+        headers=headers,
+    )
+    second = client.post(
+        "/v1/curated-walks/search",
+        json={"postcode": "HD8", "amount": 5, "page": 1},
+        headers=headers,
+    )
+
+    assert first.status_code == second.status_code == 200  # noqa: PLR2004
+    assert first.json() == second.json() == {"calls": 1, "path": "/curated-walks/search"}
+    assert StubGoJauntly.calls == 1
+
+
+def test_calls_reuse_pooled_connections(upstream):
+    async def retrieve_three():
+        for _ in range(3):
+            await upstream.curated_walk_retrieve(id="walk", data={})
+
+    run(upstream, retrieve_three())
+
+    assert StubGoJauntly.calls == 3  # noqa: PLR2004
+    assert len(StubGoJauntly.connections) == 1
+
+
+def test_client_from_previous_loop_is_closed(upstream):
+    old_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=old_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def get_client():
+        return upstream.get_client()
+
+    try:
+        old_client = asyncio.run_coroutine_threadsafe(get_client(), old_loop).result(5)
+        new_client = run(upstream, get_client())
+        deadline = time.monotonic() + 2
+        while not old_client.is_closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        old_loop.call_soon_threadsafe(old_loop.stop)
+        thread.join(5)
+        old_loop.close()
+
+    assert new_client is not old_client
+    assert old_client.is_closed
+
+
+def test_unavailable_upstream_is_retried(upstream):
+    StubGoJauntly.unavailable = 2
+
+    response = run(upstream, upstream.curated_walk_search(data={"page": 1, "amount": 5}))
+
+    assert response["calls"] == 3  # noqa: PLR2004
+
+
+def test_stored_routes_are_not_retried(upstream):
+    StubGoJauntly.unavailable = 1
+
+    with pytest.raises(HTTPException) as exc:
+        run(upstream, upstream.dynamic_routes_circular_collection(data={"store": True}))
+
+    assert exc.value.status_code == 503  # noqa: PLR2004
+    assert StubGoJauntly.calls == 1
+
+
+def test_circuit_opens_after_repeated_failures(upstream):
+    async def retrieve_broken():
+        with pytest.raises(HTTPException) as exc:
+            await upstream.curated_walk_retrieve(id="broken", data={})
+        return exc.value.status_code
+
+    async def scenario():
+        failures = [await retrieve_broken() for _ in range(3)]
+        calls_while_open = StubGoJauntly.calls
+        await asyncio.sleep(0.2)
+        await upstream.curated_walk_retrieve(id="walk", data={})
+        return failures, calls_while_open
+
+    failures, calls_while_open = run(upstream, scenario())
+
+    assert failures == [500, 500, 503]
+    assert calls_while_open == 2  # noqa: PLR2004
+    assert StubGoJauntly.calls == 3  # noqa: PLR2004
+    assert upstream.circuit_breaker.state is CircuitState.CLOSED
+
+
+def test_concurrent_misses_are_coalesced(upstream):
+    cache = GoJauntlyCache()
+    StubGoJauntly.delay = 0.2
+    data = CuratedWalkRetrieve()
+
+    def retrieve():
+        return cache.get_or_fetch(
+            "curated_walk_retrieve",
+            data,
+            lambda: upstream.curated_walk_retrieve(id="walk", data=data.model_dump()),
+            "walk",
+        )
+
+    async def retrieve_five():
+        return await asyncio.gather(*(retrieve() for _ in range(5)))
+
+    results = run(upstream, retrieve_five())
+
+    assert StubGoJauntly.calls == 1
+    assert all(result["calls"] == 1 for result in results)
+    assert cache.counts["miss"] == 1
+    assert cache.counts["coalesced"] == 4  # noqa: PLR2004
+
+
+def test_stale_entries_are_served_while_refreshing(upstream):
+    cache = GoJauntlyCache(ttls={"curated_walk_search": 0}, stale_ttl=60)
+    data = CuratedWalksSearch(page=1, amount=5)
+
+    def search():
+        return cache.get_or_fetch(
+            "curated_walk_search", data, lambda: upstream.curated_walk_search(data.model_dump())
+        )
+
+    async def scenario():
+        served = [(await search())["calls"], (await search())["calls"]]
+        await cache.shutdown()
+        refreshed_calls = StubGoJauntly.calls
+        served.append((await search())["calls"])
+        await cache.shutdown()
+        return served, refreshed_calls
+
+    served, refreshed_calls = run(upstream, scenario())
+
+    assert served == [1, 1, 2]
+    assert refreshed_calls == 2  # noqa: PLR2004
+    assert cache.stats() == {
+        "hit": 0,
+        "stale": 2,
+        "miss": 1,
+        "coalesced": 0,
+        "bypass": 0,
+        "hit_ratio": 2 / 3,
+    }
+
+
+def test_upstream_errors_are_not_cached(upstream):
+    cache = GoJauntlyCache()
+    data = CuratedWalkRetrieve()
+
+    async def retrieve_broken_twice():
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await cache.get_or_fetch(
+                    "curated_walk_retrieve",
+                    data,
+                    lambda: upstream.curated_walk_retrieve(id="broken", data=data.model_dump()),
+                    "broken",
+                )
+
+    run(upstream, retrieve_broken_twice())
+
+    assert StubGoJauntly.calls == 2  # noqa: PLR2004
@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from service.health_service import HealthCheck, health_check, postgres_probe, redis_probe
+from tests.unittest.conftest import postgres
+
+
+@pytest.fixture(scope="module")
+def pooled_engine():
+    engine = create_engine(postgres.get_connection_url(), pool_size=2, max_overflow=1)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def test_probes(pooled_engine, monkeypatch):
+    # The app's engines point at the configured database, not the test one
+    monkeypatch.setattr(
+        health_check, "probes", {"postgres": postgres_probe(pooled_engine, 1), "redis": redis_probe}
+    )
+    monkeypatch.setattr(health_check, "_result", None)
+
+
+def _wait_until_ready(client):
+    deadline = time.monotonic() + 15
+    response = client.get("/healthcheck/ready")
+    while response.status_code != 200 and time.monotonic() < deadline:  # noqa: PLR2004
+        time.sleep(0.1)
+        response = client.get("/healthcheck/ready")
+    return response
+
+
+def test_live(client):
+    response = client.get("/healthcheck/live")
+
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.json() == {"status": "ok"}
+
+
+def test_ready_reports_warm_up_and_probes(client, test_probes):
+    response = _wait_until_ready(client)
+
+    assert response.status_code == 200  # noqa: PLR2004
+    body = response.json()
+    assert body["ready"] is True
+    assert {"nhs_login", "gojauntly", "sns", "sqs"} <= body["components"].keys()
+    assert body["checks"]["redis"]["status"] == "ok"
+    postgres_check = body["checks"]["postgres"]
+    assert postgres_check["status"] == "ok"
+    assert postgres_check["capacity"] == 3  # noqa: PLR2004
+    assert postgres_check["checked_out"] == 0
+
+
+def test_ready_fails_on_exhausted_pool(client, test_probes, pooled_engine):
+    _wait_until_ready(client)
+    health_check._result = None
+    connections = [pooled_engine.connect() for _ in range(3)]
+    try:
+        response = client.get("/healthcheck/ready")
+    finally:
+        for connection in connections:
+            connection.close()
+
+    assert response.status_code == 503  # noqa: PLR2004
+    postgres_check = response.json()["checks"]["postgres"]
+    assert postgres_check["status"] == "error"
+    assert postgres_check["error"] == "RuntimeError"
+
+
+def test_probes_run_concurrently_with_timeout_and_cache():
+    calls = {"slow": 0, "hanging": 0}
+
+    async def slow():
+        calls["slow"] += 1
+        await asyncio.sleep(0.1)
+        return {"detail": 1}
+
+    async def hanging():
+        calls["hanging"] += 1
+        await asyncio.sleep(5)
+        return {}
+
+    health = HealthCheck(timeout=0.3, cache_ttl=60)
+    health.register("slow", slow)
+    health.register("hanging", hanging)
+
+    async def check_three_times():
+        started = time.perf_counter()
+        results = await asyncio.gather(*(health.check() for _ in range(3)))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(check_three_times())
+
+    assert elapsed < 1
+    assert calls == {"slow": 1, "hanging": 1}
+    assert results[0] is results[2]
+    assert results[0]["healthy"] is False
+    assert results[0]["checks"]["slow"]["status"] == "ok"
+    assert results[0]["checks"]["slow"]["detail"] == 1
+    assert results[0]["checks"]["hanging"]["status"] == "timeout"
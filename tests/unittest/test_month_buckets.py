@@ -0,0 +1,69 @@
+import os
+import time
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pytest
+from dateutil.relativedelta import relativedelta
+from hypothesis import given
+from hypothesis import strategies as st
+
+from utils.month_buckets import (
+    all_in_month,
+    month_bounds,
+    month_start,
+    month_starts,
+    to_months,
+)
+
+# 0001-01-01 to 9999-12-31, the range datetime supports
+unix_times = st.integers(min_value=-62135596800, max_value=253402300799)
+
+
+@given(st.lists(unix_times, max_size=50))
+def test_month_starts_match_scalar(timestamps):
+    assert month_starts(timestamps).tolist() == [month_start(unix) for unix in timestamps]
+
+
+@given(unix_times)
+def test_month_start_is_first_second_of_utc_month(unix):
+    start = datetime.fromtimestamp(month_start(unix), timezone.utc)  # noqa: UP017 Not supported in Python 3.10
+    moment = datetime.fromtimestamp(unix, timezone.utc)  # noqa: UP017 Not supported in Python 3.10
+
+    assert (start.year, start.month, start.day) == (moment.year, moment.month, 1)
+    assert (start.hour, start.minute, start.second) == (0, 0, 0)
+
+
+@given(st.dates(min_value=date(1, 1, 1), max_value=date(9999, 11, 30)))
+def test_month_bounds_match_calendar(day):
+    start = datetime(day.year, day.month, 1, tzinfo=timezone.utc)  # noqa: UP017 Not supported in Python 3.10
+    expected = (int(start.timestamp()), int((start + relativedelta(months=1)).timestamp()))
+
+    assert month_bounds(day) == expected
+    assert month_starts([expected[0], expected[1] - 1]).tolist() == [expected[0]] * 2
+
+
+@given(unix_times, st.lists(unix_times, max_size=20))
+def test_all_in_month_matches_scalar(month, timestamps):
+    expected = all(month_start(unix) == month_start(month) for unix in timestamps)
+    assert all_in_month(timestamps, month) is expected
+
+
+def test_months_are_utc_whatever_the_local_timezone():
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available")
+    last_second_of_april = 1714521599  # 2024-04-30T23:59:59Z, already May in Kiritimati
+
+    original = os.environ.get("TZ")
+    os.environ["TZ"] = "Pacific/Kiritimati"  # UTC+14
+    time.tzset()
+    try:
+        assert month_start(last_second_of_april) == 1711929600  # noqa: PLR2004
+        assert to_months([last_second_of_april])[0] == np.datetime64("2024-04")
+        assert not all_in_month([last_second_of_april], 1714521600)
+    finally:
+        if original is None:
+            del os.environ["TZ"]
+        else:
+            os.environ["TZ"] = original
+        time.tzset()
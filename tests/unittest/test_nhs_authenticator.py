@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+from urllib.parse import urlsplit
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from nhs.authenticator import Authenticator
+from nhs.pds import get_signing_key
+from service.open_telemetry_service import (
+    AUTH_BUDGET_EXCEEDED_KEY,
+    AUTH_BUDGET_REMAINING_KEY,
+    AUTH_STEP_DURATION_KEY,
+    STEP_TOKEN_EXCHANGE,
+    STEP_USERINFO,
+    LatencyBudget,
+)
+from utils.base_config import config
+
+CLIENT_ID = "active10-test"
+
+_exporter = InMemorySpanExporter()
+trace.get_tracer_provider().add_span_processor(SimpleSpanProcessor(_exporter))
+
+
+class StubProvider(BaseHTTPRequestHandler):
+    """A stand-in OIDC provider issuing ID tokens signed with ``signing_key``."""
+
+    protocol_version = "HTTP/1.1"
+    issuer = ""
+    signing_key = None
+    kid = "key-1"
+    requests: ClassVar[list[tuple[str, int]]] = []
+
+    def _send_json(self, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        StubProvider.requests.append((path, self.client_address[1]))
+        if path == "/.well-known/openid-configuration":
+            self._send_json(
+                {
+                    "issuer": self.issuer,
+                    "authorization_endpoint": f"{self.issuer}/authorize",
+                    "token_endpoint": f"{self.issuer}/token",
+                    "userinfo_endpoint": f"{self.issuer}/userinfo",
+                    "jwks_uri": f"{self.issuer}/jwks",
+                }
+            )
+        elif path == "/jwks":
+            jwk = json.loads(RSAAlgorithm.to_jwk(self.signing_key.public_key()))
+            self._send_json({"keys": [{**jwk, "kid": self.kid, "use": "sig", "alg": "RS512"}]})
+        elif path == "/userinfo":
+            self._send_json({"sub": "nhs-user", "given_name": "Sam"})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        StubProvider.requests.append((urlsplit(self.path).path, self.client_address[1]))
+        now = int(time.time())
+        id_token = jwt.encode(
+            {"iss": self.issuer, "sub": "nhs-user", "aud": CLIENT_ID, "iat": now, "exp": now + 60},
+            self.signing_key,
+            algorithm="RS512",
+            headers={"kid": self.kid},
+        )
+        self._send_json({"access_token": "access", "token_type": "Bearer", "id_token": id_token})
+
+    def log_message(self, *args):
+        pass
+
+
+def _new_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(scope="module")
+def provider():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubProvider)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubProvider.issuer = f"http://127.0.0.1:{server.server_port}"
+    yield StubProvider
+    server.shutdown()
+
+
+@pytest.fixture
+def authenticator(provider, monkeypatch):
+    client_key = _new_key().private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    monkeypatch.setattr(config, "nhs_pds_jwt_private_key", client_key.decode())
+    monkeypatch.setattr(config, "nhs_login_jwks_min_refresh_interval", 0)
+    get_signing_key.cache_clear()
+    provider.signing_key = _new_key()
+    provider.kid = "key-1"
+    provider.requests = []
+
+    yield Authenticator(CLIENT_ID, provider.issuer, "openid", "https://app/callback")
+    get_signing_key.cache_clear()
+
+
+def _login(authenticator: Authenticator) -> dict:
+    auth_resp = authenticator.get_authorization_response({"code": "code", "state": "app_1"})
+    return authenticator.get_access_token(auth_resp)
+
+
+def _paths(provider) -> list[str]:
+    return [path for path, _ in provider.requests]
+
+
+def test_calls_share_one_pooled_connection(authenticator, provider):
+    tokens = _login(authenticator)
+    user_info = authenticator.get_userinfo(tokens["access_token"])
+
+    assert user_info["sub"] == "nhs-user"
+    ports = {port for path, port in provider.requests if path != "/jwks"}
+    assert len(ports) == 1
+
+
+def test_jwks_is_cached_between_logins(authenticator, provider):
+    for _ in range(3):
+        tokens = _login(authenticator)
+        assert tokens["id_token"]["sub"] == "nhs-user"
+
+    assert _paths(provider).count("/jwks") == 1
+
+
+def test_jwks_is_refreshed_when_keys_rotate(authenticator, provider):
+    _login(authenticator)
+    provider.signing_key = _new_key()
+    provider.kid = "key-2"
+
+    tokens = _login(authenticator)
+
+    assert tokens["id_token"]["sub"] == "nhs-user"
+    assert _paths(provider).count("/jwks") == 2  # noqa: PLR2004
+
+
+def test_latency_budget_is_recorded_per_step():
+    _exporter.clear()
+    budget = LatencyBudget(budget_ms=20)
+
+    with budget.step(STEP_TOKEN_EXCHANGE):
+        pass
+    with budget.step(STEP_USERINFO):
+        time.sleep(0.03)
+
+    token_exchange, userinfo = _exporter.get_finished_spans()[-2:]
+    assert token_exchange.attributes[AUTH_BUDGET_REMAINING_KEY] > 0
+    assert AUTH_BUDGET_EXCEEDED_KEY not in token_exchange.attributes
+    assert userinfo.attributes[AUTH_STEP_DURATION_KEY] >= 30  # noqa: PLR2004
+    assert userinfo.attributes[AUTH_BUDGET_EXCEEDED_KEY] is True
+    assert budget.exceeded
@@ -0,0 +1,186 @@
+import json
+import time
+from contextlib import nullcontext
+
+import pytest
+from sqlalchemy import delete, select
+
+from models.outbox import OutboxDestination, OutboxEvent
+from service.outbox_relay import OutboxRelay
+from service.sns_batch_publisher import SNS_MAX_BATCH_BYTES
+from tests.unittest.conftest import LocalSNSStub, user_uuid_pk
+from utils.base_config import config as settings
+
+TOPIC = "arn:aws:sns:eu-west-2:000000000000:activities"
+QUEUE = "http://localhost:4566/000000000000/activities.fifo"
+
+
+class LocalSQSStub:
+    def __init__(self):
+        self.batches: list[tuple[str, list[dict]]] = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.batches.append((QueueUrl, list(Entries)))
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries], "Failed": []}
+
+
+@pytest.fixture
+def outbox(db_session):
+    db_session.execute(delete(OutboxEvent))
+    db_session.commit()
+    return db_session
+
+
+def _add_events(db_session, count: int, destination=OutboxDestination.SNS, target=TOPIC):
+    now = int(time.time())
+    events = [
+        OutboxEvent(
+            destination=destination.value,
+            target=target,
+            subject="activity-daily-data",
+            message=json.dumps({"n": i}),
+            attempts=0,
+            available_at=now,
+            created_at=now,
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(events)
+    db_session.commit()
+    return events
+
+
+def _relay(db_session, sns=None, sqs=None, **kwargs) -> OutboxRelay:
+    return OutboxRelay(
+        session_factory=lambda: nullcontext(db_session),
+        sns_client=sns or LocalSNSStub(),
+        sqs_client=sqs or LocalSQSStub(),
+        **kwargs,
+    )
+
+
+def _remaining(db_session) -> list[OutboxEvent]:
+    return db_session.scalars(select(OutboxEvent).order_by(OutboxEvent.id)).all()
+
+
+def test_save_bulk_activities_writes_outbox(client, authenticated_user, outbox):
+    response = client.post(
+        "/v1/migrations/activities",
+        json={
+            "month": 1714637586,
+            "activities": [
+                {
+                    "date": 1714637586,
+                    "user_postcode": "HD81",
+                    "user_age_range": "23-39",
+                    "activity": {"brisk_minutes": 1, "walking_minutes": 1, "steps": 1},
+                }
+            ],
+        },
+        headers={"Authorization": f"Bearer {authenticated_user.token.token}"},
+    )
+
+    assert response.status_code == 201  # noqa: PLR2004
+    [event] = _remaining(outbox)
+    assert event.destination == OutboxDestination.SNS.value
+    assert event.target == settings.aws_sns_activities_migration_topic_arn
+    assert json.loads(event.message)["user_id"] == str(user_uuid_pk)
+
+
+def test_relay_delivers_in_batches_and_deletes(outbox):
+    _add_events(outbox, 23)
+    _add_events(outbox, 2, OutboxDestination.SQS, QUEUE)
+    sns, sqs = LocalSNSStub(), LocalSQSStub()
+
+    assert _relay(outbox, sns, sqs).run_once() == 25  # noqa: PLR2004
+
+    assert [len(entries) for _, entries in sns.batches] == [10, 10, 3]
+    assert sorted(json.loads(m["Message"])["n"] for m in sns.messages) == list(range(23))
+    [(queue_url, entries)] = sqs.batches
+    assert queue_url == QUEUE
+    assert entries[0]["MessageDeduplicationId"] == entries[0]["Id"]
+    assert _remaining(outbox) == []
+
+
+def test_relay_reschedules_failed_events(outbox):
+    events = _add_events(outbox, 3)
+    failed_id = events[1].id
+    sns = LocalSNSStub()
+    sns.fail_ids = {str(failed_id): False}
+    relay = _relay(outbox, sns)
+
+    relay.run_once()
+
+    [event] = _remaining(outbox)
+    assert event.id == failed_id
+    assert event.attempts == 1
+    assert event.available_at >= int(time.time())
+    assert event.last_error is not None
+
+    event.available_at = 0
+    outbox.commit()
+    relay.run_once()
+    assert _remaining(outbox) == []
+
+
+def test_relay_keeps_events_when_sns_is_down(outbox):
+    _add_events(outbox, 2)
+    sns = LocalSNSStub()
+    sns.errors = 1
+
+    _relay(outbox, sns).run_once()
+
+    remaining = _remaining(outbox)
+    assert [event.attempts for event in remaining] == [1, 1]
+    assert all("SNS is unavailable" in event.last_error for event in remaining)
+
+
+def test_relay_dead_letters_sender_faults_without_retrying(outbox):
+    events = _add_events(outbox, 2)
+    rejected_id = events[0].id
+    sns = LocalSNSStub()
+    sns.fail_ids = {str(rejected_id): True}
+    relay = _relay(outbox, sns)
+
+    relay.run_once()
+
+    [event] = _remaining(outbox)
+    assert event.id == rejected_id
+    assert event.dead_lettered_at is not None
+    assert event.attempts == 1
+
+    assert relay.run_once() == 0
+    assert len(sns.batches) == 1
+
+
+def test_relay_dead_letters_events_after_max_attempts(outbox):
+    _add_events(outbox, 1)
+    sns = LocalSNSStub()
+    sns.errors = 5
+    relay = _relay(outbox, sns, max_attempts=2)
+
+    relay.run_once()
+    [event] = _remaining(outbox)
+    assert event.dead_lettered_at is None
+    event.available_at = 0
+    outbox.commit()
+
+    relay.run_once()
+    [event] = _remaining(outbox)
+    assert event.attempts == 2  # noqa: PLR2004
+    assert event.dead_lettered_at is not None
+    assert relay.run_once() == 0
+
+
+def test_relay_dead_letters_oversized_messages_without_sending(outbox):
+    [event] = _add_events(outbox, 1)
+    event.message = json.dumps({"padding": "x" * SNS_MAX_BATCH_BYTES})
+    outbox.commit()
+    sns = LocalSNSStub()
+
+    _relay(outbox, sns).run_once()
+
+    [event] = _remaining(outbox)
+    assert event.dead_lettered_at is not None
+    assert "256 KiB" in event.last_error
+    assert sns.batches == []
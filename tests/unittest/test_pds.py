@@ -0,0 +1,139 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+from urllib.parse import parse_qs
+
+import jwt
+import pytest
+import requests
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from nhs.pds import PDSClient, get_signing_key
+from utils.base_config import config
+
+
+class StubTokenEndpoint(BaseHTTPRequestHandler):
+    """Issues a client-credentials token per request, valid for ``expires_in`` seconds."""
+
+    protocol_version = "HTTP/1.1"
+    expires_in = "599"
+    assertions: ClassVar[list[str]] = []
+    exchange_barrier: ClassVar[threading.Barrier | None] = None
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        StubTokenEndpoint.assertions.append(form["client_assertion"][0])
+        if "subject_token" in form:
+            self._token_exchange(form["subject_token"][0])
+            return
+        self._send_json(
+            200,
+            {
+                "access_token": f"token-{len(StubTokenEndpoint.assertions)}",
+                "expires_in": StubTokenEndpoint.expires_in,
+                "token_type": "Bearer",
+            },
+        )
+
+    def do_GET(self):
+        token = self.headers["Authorization"].removeprefix("Bearer ")
+        self._send_json(200, {"gender": token})
+
+    def _token_exchange(self, subject_token):
+        # Hold concurrent exchanges until all of them have reached the endpoint
+        if StubTokenEndpoint.exchange_barrier is not None:
+            StubTokenEndpoint.exchange_barrier.wait()
+        if subject_token == "invalid":
+            self._send_json(401, {"error": "invalid_request"})
+        else:
+            self._send_json(200, {"access_token": f"exchanged-{subject_token}"})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def pds(private_key, monkeypatch):
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    monkeypatch.setattr(config, "nhs_pds_jwt_private_key", pem)
+    get_signing_key.cache_clear()
+    StubTokenEndpoint.assertions = []
+    StubTokenEndpoint.expires_in = "599"
+    StubTokenEndpoint.exchange_barrier = None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTokenEndpoint)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield PDSClient("api-key", f"http://127.0.0.1:{server.server_port}", timeout=5)
+    server.shutdown()
+    get_signing_key.cache_clear()
+
+
+def test_access_token_is_cached_until_near_expiry(pds):
+    first = pds.get_pds_access_token()
+    second = pds.get_pds_access_token()
+
+    assert first["access_token"] == second["access_token"] == "token-1"
+    assert len(StubTokenEndpoint.assertions) == 1
+
+
+def test_access_token_is_renewed_within_refresh_margin(pds):
+    StubTokenEndpoint.expires_in = str(pds.token_refresh_margin)
+
+    assert pds.get_pds_access_token()["access_token"] == "token-1"
+    assert pds.get_pds_access_token()["access_token"] == "token-2"
+
+
+def test_signing_key_is_parsed_once(pds, private_key):
+    pds.get_pds_access_token()
+    pds.generate_and_sign_jwt()
+
+    assert get_signing_key.cache_info().misses == 1
+    claims = jwt.decode(
+        StubTokenEndpoint.assertions[0],
+        private_key.public_key(),
+        algorithms=["RS512"],
+        audience=f"{pds.nhs_api_url}/oauth2/token",
+    )
+    assert claims["iss"] == "api-key"
+
+
+def test_concurrent_token_exchanges_keep_their_own_token(pds):
+    StubTokenEndpoint.exchange_barrier = threading.Barrier(2, timeout=5)
+    results = {}
+
+    def login(id_token):
+        results[id_token] = pds.get_pds_data(id_token, "9000000009")["gender"]
+
+    threads = [threading.Thread(target=login, args=(id_token,)) for id_token in ("alice", "bob")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert results == {"alice": "exchanged-alice", "bob": "exchanged-bob"}
+
+
+def test_failed_token_exchange_does_not_reuse_previous_token(pds):
+    assert pds.get_pds_data("alice", "9000000009")["gender"] == "exchanged-alice"
+
+    with pytest.raises(requests.HTTPError):
+        pds.get_pds_data("invalid", "9000000009")
@@ -0,0 +1,76 @@
+import pickle
+from uuid import uuid4
+
+import pytest
+
+from service.redis_codecs import (
+    AuthCodec,
+    MsgpackCodec,
+    OrjsonCodec,
+    RedisCodec,
+    decode,
+    encode,
+    get_codec,
+)
+from service.redis_service import RedisService
+
+
+@pytest.mark.parametrize("codec", [OrjsonCodec(), MsgpackCodec()])
+def test_codec_round_trip(codec) -> None:
+    value = {"user_id": str(uuid4()), "valid": True, "goals": [{"id": 1, "text": "walk"}]}
+
+    payload = encode(value, codec)
+
+    assert payload[0] == codec.version
+    assert decode(payload) == value
+
+
+def test_auth_codec_fixed_layout() -> None:
+    value = {"user_id": str(uuid4()), "valid": False}
+
+    payload = encode(value, AuthCodec())
+
+    assert len(payload) == 18  # noqa: PLR2004 version byte + 16 UUID bytes + flag
+    assert decode(payload) == value
+
+
+def test_decode_legacy_pickle() -> None:
+    value = {"user_id": str(uuid4()), "valid": True}
+    payload = pickle.dumps(value)
+
+    assert decode(payload) == value
+    with pytest.raises(ValueError):
+        decode(payload, allow_legacy_pickle=False)
+
+
+def test_decode_unknown_version() -> None:
+    with pytest.raises(ValueError):
+        decode(b"\x7f{}")
+
+
+def test_incomplete_codec_cannot_be_instantiated() -> None:
+    class DumpsOnlyCodec(RedisCodec):
+        version = 0x7E
+        name = "dumps-only"
+
+        def dumps(self, value) -> bytes:
+            return b""
+
+    with pytest.raises(TypeError):
+        DumpsOnlyCodec()
+
+
+def test_get_unknown_codec() -> None:
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+def test_redis_service_reads_legacy_and_new_entries(redis_engine) -> None:
+    user_id = str(uuid4())
+    RedisService.get_client().set("legacy-token-hash", pickle.dumps({"user_id": user_id}))
+
+    assert RedisService.get("legacy-token-hash") == {"user_id": user_id}
+
+    assert RedisService.set_auth_cache("new-token-hash", user_id, valid=True)
+    assert len(RedisService.get_client().get("new-token-hash")) == 18  # noqa: PLR2004
+    assert RedisService.get_auth_cache("new-token-hash") == {"user_id": user_id, "valid": True}
@@ -0,0 +1,118 @@
+import asyncio
+from uuid import uuid4
+
+from service.async_redis_service import AsyncRedisService
+from service.resource_cache_service import ResourceCache
+
+
+class CountingLoader:
+    def __init__(self, value, delay: float = 0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+def _run(coro):
+    async def _with_fresh_client():
+        try:
+            return await coro
+        finally:
+            await AsyncRedisService.close()
+
+    return asyncio.run(_with_fresh_client())
+
+
+def test_read_through_until_invalidated(redis_engine):
+    cache = ResourceCache(ttls={"plans": 60})
+    user_id = uuid4()
+    loader = CountingLoader([{"id": user_id, "n": 1}])
+
+    async def scenario():
+        first = await cache.get_or_load("plans", user_id, loader)
+        second = await cache.get_or_load("plans", user_id, loader)
+        await cache.invalidate("plans", user_id)
+        third = await cache.get_or_load("plans", user_id, loader)
+        return first, second, third
+
+    first, second, third = _run(scenario())
+
+    assert first == third == [{"id": user_id, "n": 1}]
+    # Hits come back as stored, i.e. as JSON
+    assert second == [{"id": str(user_id), "n": 1}]
+    assert loader.calls == 2  # noqa: PLR2004
+
+
+def test_invalidate_drops_every_variant(redis_engine):
+    cache = ResourceCache()
+    user_id = uuid4()
+    loaders = {variant: CountingLoader([variant]) for variant in ("a", "b")}
+
+    async def scenario():
+        for _ in range(2):
+            for variant, loader in loaders.items():
+                await cache.get_or_load("targets", user_id, loader, variant=variant)
+            await cache.invalidate("targets", user_id)
+
+    _run(scenario())
+
+    assert [loader.calls for loader in loaders.values()] == [2, 2]
+
+
+def test_write_through_caches_new_value(redis_engine):
+    cache = ResourceCache()
+    user_id = uuid4()
+    loader = CountingLoader({"plan": "old"})
+
+    async def scenario():
+        await cache.get_or_load("plans", user_id, loader)
+        await cache.write("plans", user_id, {"plan": "new"})
+        return await cache.get_or_load("plans", user_id, loader)
+
+    assert _run(scenario()) == {"plan": "new"}
+    assert loader.calls == 1
+
+
+def test_concurrent_misses_load_once(redis_engine):
+    cache = ResourceCache()
+    user_id = uuid4()
+    loader = CountingLoader(["value"], delay=0.1)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(cache.get_or_load("levels", user_id, loader) for _ in range(10))
+        )
+
+    assert _run(scenario()) == [["value"]] * 10
+    assert loader.calls == 1
+
+
+def test_missing_values_and_disabled_cache_are_not_cached(redis_engine):
+    user_id = uuid4()
+    missing = CountingLoader(None)
+    disabled = ResourceCache(enabled=False)
+    loader = CountingLoader(["value"])
+
+    async def scenario():
+        for _ in range(2):
+            await ResourceCache().get_or_load("plans", user_id, missing)
+            await disabled.get_or_load("plans", user_id, loader)
+
+    _run(scenario())
+
+    assert missing.calls == 2  # noqa: PLR2004
+    assert loader.calls == 2  # noqa: PLR2004
+
+
+def test_motivation_list_is_refreshed_after_create(client, authenticated_user):
+    headers = {"Authorization": f"Bearer {authenticated_user.token.token}"}
+    before = client.get("/v1/motivations/", headers=headers).json()
+
+    client.post("/v1/motivations/", json={"goals": [{"text": "Walk daily"}]}, headers=headers)
+
+    after = client.get("/v1/motivations/", headers=headers).json()
+    assert len(after) == len(before) + 1
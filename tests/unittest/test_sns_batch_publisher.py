@@ -0,0 +1,186 @@
+import json
+import threading
+import time
+from http import HTTPStatus
+from unittest.mock import AsyncMock, patch
+
+from service.sns_batch_publisher import SNSBatchPublisher
+from tests.unittest.conftest import LocalSNSStub
+
+TOPIC = "arn:aws:sns:eu-west-2:000000000000:activities"
+
+
+class BlockingSNSStub(LocalSNSStub):
+    """SNS stub whose PublishBatch calls wait until ``release`` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def publish_batch(self, TopicArn, PublishBatchRequestEntries):
+        self.release.wait(5)
+        return super().publish_batch(TopicArn, PublishBatchRequestEntries)
+
+
+def _wait_for(condition) -> None:
+    deadline = time.monotonic() + 2
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def _publisher(stub: LocalSNSStub, **kwargs) -> SNSBatchPublisher:
+    kwargs.setdefault("flush_interval", 60)
+    kwargs.setdefault("retry_base_delay", 0)
+    return SNSBatchPublisher(client=stub, **kwargs)
+
+
+def test_flushes_full_batches_and_drains_on_stop() -> None:
+    stub = LocalSNSStub()
+    publisher = _publisher(stub)
+
+    for i in range(25):
+        assert publisher.submit(TOPIC, {"n": i})
+    publisher.stop()
+
+    assert [len(entries) for _, entries in stub.batches] == [10, 10, 5]
+    assert sorted(json.loads(m["Message"])["n"] for m in stub.messages) == list(range(25))
+    assert publisher.stats()["published"] == 25  # noqa: PLR2004
+    assert publisher.stats()["queue_depth"] == 0
+
+
+def test_flushes_partial_batch_after_interval() -> None:
+    stub = LocalSNSStub()
+    publisher = _publisher(stub, flush_interval=0.05)
+
+    publisher.submit(TOPIC, {"n": 1})
+    deadline = time.monotonic() + 2
+    while not stub.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(stub.messages) == 1
+    publisher.stop()
+
+
+def test_batches_are_grouped_per_topic() -> None:
+    stub = LocalSNSStub()
+    publisher = _publisher(stub)
+
+    publisher.submit(TOPIC, {"n": 1})
+    publisher.submit("other-topic", {"n": 2})
+    publisher.submit(TOPIC, {"n": 3})
+    publisher.stop()
+
+    assert sorted((topic, len(entries)) for topic, entries in stub.batches) == [
+        (TOPIC, 2),
+        ("other-topic", 1),
+    ]
+
+
+def test_retries_failed_entries_and_errors() -> None:
+    stub = LocalSNSStub()
+    stub.errors = 1
+    stub.fail_ids = {"1": False}
+    publisher = _publisher(stub)
+
+    for i in range(3):
+        publisher.submit(TOPIC, {"n": i})
+    publisher.stop()
+
+    assert [len(entries) for _, entries in stub.batches] == [3, 1]
+    assert publisher.stats()["published"] == 3  # noqa: PLR2004
+    assert publisher.stats()["failed"] == 0
+
+
+def test_sender_fault_entries_are_not_retried() -> None:
+    stub = LocalSNSStub()
+    stub.fail_ids = {"0": True}
+    publisher = _publisher(stub)
+
+    publisher.submit(TOPIC, {"n": 0})
+    publisher.stop()
+
+    assert len(stub.batches) == 1
+    assert publisher.stats()["failed"] == 1
+
+
+def test_drops_entries_after_max_attempts() -> None:
+    stub = LocalSNSStub()
+    stub.errors = 5
+    publisher = _publisher(stub, max_attempts=2)
+
+    publisher.submit(TOPIC, {"n": 0})
+    publisher.stop()
+
+    assert stub.batches == []
+    assert stub.errors == 3  # noqa: PLR2004
+    assert publisher.stats()["failed"] == 1
+
+
+def test_full_queue_rejects_submissions() -> None:
+    stub = LocalSNSStub()
+    publisher = _publisher(stub, queue_size=1)
+
+    with patch.object(publisher, "start"):
+        assert publisher.submit(TOPIC, {"n": 0})
+        assert not publisher.submit(TOPIC, {"n": 1})
+
+    assert publisher.stats()["rejected"] == 1
+    assert publisher.stats()["queue_depth"] == 1
+    publisher.start()
+    publisher.stop()
+    assert len(stub.messages) == 1
+
+
+def test_slow_sns_fills_the_queue_instead_of_the_pool() -> None:
+    stub = BlockingSNSStub()
+    publisher = _publisher(stub, queue_size=2, batch_size=1, max_in_flight=1)
+
+    # One batch is being sent and the collector is blocked holding the next one
+    assert publisher.submit(TOPIC, {"n": 0})
+    assert publisher.submit(TOPIC, {"n": 1})
+    _wait_for(lambda: publisher.stats()["queue_depth"] == 0)
+    assert publisher.submit(TOPIC, {"n": 2})
+    assert publisher.submit(TOPIC, {"n": 3})
+    _wait_for(lambda: publisher.stats()["queue_depth"] == 2)  # noqa: PLR2004
+
+    assert not publisher.submit(TOPIC, {"n": 4})
+    assert publisher.stats()["rejected"] == 1
+
+    stub.release.set()
+    publisher.stop()
+    assert publisher.stats()["published"] == 4  # noqa: PLR2004
+
+
+def test_stop_does_not_wait_for_pool_after_timeout() -> None:
+    stub = BlockingSNSStub()
+    publisher = _publisher(stub, batch_size=1, max_in_flight=1)
+
+    for i in range(3):
+        publisher.submit(TOPIC, {"n": i})
+    _wait_for(lambda: publisher.stats()["queue_depth"] == 1)
+
+    start = time.monotonic()
+    publisher.stop(timeout=0.1)
+    assert time.monotonic() - start < 1
+
+    stub.release.set()
+    _wait_for(lambda: publisher.stats()["published"] + publisher.stats()["failed"] == 3)  # noqa: PLR2004
+    assert publisher.stats()["published"] == 1
+    assert publisher.stats()["failed"] == 2  # noqa: PLR2004
+
+
+def test_save_activity_returns_503_when_queue_is_full(client, authenticated_user) -> None:
+    with patch("api.v1.activities.load_activities_data_in_sns", AsyncMock(return_value=False)):
+        response = client.post(
+            "/v1/activities",
+            json={
+                "date": int(time.time()),
+                "user_postcode": "HD81",
+                "user_age_range": "23-39",
+                "activity": {"brisk_minutes": 1, "walking_minutes": 1, "steps": 1},
+            },
+            headers={"Authorization": f"Bearer {authenticated_user.token.token}"},
+        )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,85 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+from service.warmup_service import WarmUp, WarmUpStatus
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+# Generous for CI runners; a cold `import main` takes about 2s on a laptop
+IMPORT_TIME_BUDGET_US = 5_000_000
+
+IMPORT_PROBE = """
+import socket
+
+def _no_network(*args, **kwargs):
+    raise RuntimeError("network used at import time")
+
+socket.socket.connect = _no_network
+
+import main
+from gojauntly.gojauntly import gojauntly_client
+from service.aws_sns_service import get_sns_client
+from service.aws_sqs_service import get_sqs_client
+from service.nhs_login_service import auth_nhs
+
+assert auth_nhs._client is None
+assert gojauntly_client._token is None
+assert get_sns_client.cache_info().currsize == 0
+assert get_sqs_client.cache_info().currsize == 0
+"""
+
+
+def _cumulative_import_time_us(importtime_log: str, module: str) -> int:
+    # Lines look like "import time:      self [us] | cumulative | imported package"
+    for line in importtime_log.splitlines():
+        if line.startswith("import time:") and line.rsplit("|", 1)[-1].strip() == module:
+            return int(line.split("|")[1])
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+def test_import_is_offline_and_within_budget():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_PROBE],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert _cumulative_import_time_us(result.stderr, "main") < IMPORT_TIME_BUDGET_US
+
+
+def test_warm_up_is_bounded_and_reports_failures():
+    warmup = WarmUp(max_concurrency=2, timeout=0.2)
+    running = 0
+    max_running = 0
+
+    async def slow_client():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    def broken_client():
+        raise ConnectionError("unreachable")
+
+    async def hanging_client():
+        await asyncio.sleep(1)
+
+    for name in ("a", "b", "c"):
+        warmup.register(name, slow_client)
+    warmup.register("broken", broken_client)
+    warmup.register("hanging", hanging_client)
+    assert not warmup.is_ready()
+
+    asyncio.run(warmup.run())
+
+    assert warmup.is_ready()
+    assert max_running == 2  # noqa: PLR2004
+    assert warmup.status["a"] is WarmUpStatus.WARM
+    assert warmup.status["broken"] is WarmUpStatus.FAILED
+    assert warmup.status["hanging"] is WarmUpStatus.FAILED
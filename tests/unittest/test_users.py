@@ -1,3 +1,19 @@
+import time
+
+import pytest
+
+from models.motivation import UserMotivation
+from service.redis_service import RedisService
+
+
+@pytest.fixture(autouse=True)
+def clear_profile_cache(authenticated_user):
+    # The test database is rolled back per module, so drop any profile cached elsewhere
+    RedisService.delete_user_profile_cache(authenticated_user.id)
+    yield
+    RedisService.delete_user_profile_cache(authenticated_user.id)
+
+
 def test_read_user_with_token(client, authenticated_user):
     response = client.get(
         "/v1/users",
@@ -22,3 +38,56 @@ def test_read_user_unauthenticated_token(client, unauthenticated_user):
     )
     assert response.status_code == 404  # noqa: PLR2004
     assert response.json() == {"detail": "User not found"}
+
+
+def test_read_user_profile_has_latest_records(client, authenticated_user, db_session):
+    headers = {"Authorization": f"Bearer {authenticated_user.token.token}"}
+    # Later than any motivation created through the API, and the newest is inserted first
+    now = int(time.time())
+    for text, created_at in (("Walk more", now + 200), ("Walk further", now + 100)):
+        db_session.add(
+            UserMotivation(
+                goals=[{"text": text}],
+                user_id=authenticated_user.id,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+    db_session.commit()
+    client.post("/v1/activity_level/", json={"level": "Active"}, headers=headers)
+    client.post(
+        "/v1/users/email_preferences/subscribe",
+        json={"name": "active10_mailing_list"},
+        headers=headers,
+    )
+
+    data = client.get("/v1/users", headers=headers).json()
+
+    assert [goal["text"] for goal in data["latest_motivation"]["goals"]] == ["Walk more"]
+    assert data["latest_motivation"]["user_id"] == str(authenticated_user.id)
+    assert data["latest_activity_level"]["level"] == "Active"
+    assert [(ep["name"], ep["is_active"]) for ep in data["email_preferences"]] == [
+        ("active10_mailing_list", True)
+    ]
+
+
+def test_read_user_profile_is_cached_until_a_write(client, authenticated_user):
+    headers = {"Authorization": f"Bearer {authenticated_user.token.token}"}
+
+    data = client.get("/v1/users", headers=headers).json()
+    assert RedisService.get_user_profile_cache(authenticated_user.id) == data
+
+    level_id = data["latest_activity_level"]["id"]
+    client.put(f"/v1/activity_level/{level_id}", json={"level": "Inactive"}, headers=headers)
+    assert RedisService.get_user_profile_cache(authenticated_user.id) is None
+
+    data = client.get("/v1/users", headers=headers).json()
+    assert data["latest_activity_level"]["level"] == "Inactive"
+
+    client.post(
+        "/v1/users/email_preferences/unsubscribe",
+        json={"name": "active10_mailing_list"},
+        headers=headers,
+    )
+    data = client.get("/v1/users", headers=headers).json()
+    assert data["email_preferences"][0]["is_active"] is False
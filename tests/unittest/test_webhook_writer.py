@@ -0,0 +1,127 @@
+import threading
+import time
+from unittest.mock import patch
+
+from sqlalchemy.exc import OperationalError
+
+from service.webhook_writer import WebhookEventWriter
+
+
+class RecordingWrite:
+    def __init__(self, failures: int = 0):
+        self.calls: list[tuple[str, list[dict]]] = []
+        self.failures = failures
+
+    def __call__(self, events, webhook_type):
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError("INSERT", {}, ConnectionError("database unavailable"))
+        self.calls.append((webhook_type, list(events)))
+
+
+def _writer(write, **kwargs) -> WebhookEventWriter:
+    kwargs.setdefault("flush_interval", 60)
+    kwargs.setdefault("retry_base_delay", 0)
+    return WebhookEventWriter(write=write, **kwargs)
+
+
+def test_merges_deliveries_per_type_and_drains_on_stop() -> None:
+    write = RecordingWrite()
+    writer = _writer(write, batch_size=3)
+
+    writer.submit("monthly_report", [{"n": 1}, {"n": 2}])
+    writer.submit("logout_user_notification", [{"n": 3}])
+    writer.submit("monthly_report", [{"n": 4}])
+    writer.stop()
+
+    assert sorted((webhook_type, len(events)) for webhook_type, events in write.calls) == [
+        ("logout_user_notification", 1),
+        ("monthly_report", 3),
+    ]
+    assert writer.stats()["written"] == 4  # noqa: PLR2004
+    assert writer.stats()["queue_depth"] == 0
+
+
+def test_writes_partial_batch_after_interval() -> None:
+    write = RecordingWrite()
+    writer = _writer(write, flush_interval=0.05)
+
+    writer.submit("monthly_report", [{"n": 1}])
+    deadline = time.monotonic() + 2
+    while not write.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert write.calls == [("monthly_report", [{"n": 1}])]
+    writer.stop()
+
+
+def test_retries_failed_writes_then_drops() -> None:
+    write = RecordingWrite(failures=1)
+    writer = _writer(write, max_attempts=2)
+    writer.submit("monthly_report", [{"n": 1}])
+    writer.stop()
+    assert write.calls == [("monthly_report", [{"n": 1}])]
+
+    write = RecordingWrite(failures=2)
+    writer = _writer(write, max_attempts=2)
+    writer.submit("monthly_report", [{"n": 1}])
+    writer.stop()
+    assert write.calls == []
+    assert writer.stats()["failed"] == 1
+
+
+def test_rejects_when_queue_holds_too_many_events() -> None:
+    release = threading.Event()
+
+    def blocked_write(events, webhook_type):
+        release.wait(5)
+
+    writer = _writer(blocked_write, max_queued_events=2, batch_size=1)
+    writer.submit("monthly_report", [{"n": 1}])
+    deadline = time.monotonic() + 2
+    while writer.stats()["queue_depth"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert writer.submit("monthly_report", [{"n": 2}])
+    assert not writer.submit("monthly_report", [{"n": 3}, {"n": 4}])
+    assert writer.submit("monthly_report", [{"n": 5}])
+    assert not writer.submit("monthly_report", [{"n": 6}])
+    assert writer.stats()["queue_depth"] == 2  # noqa: PLR2004
+    assert writer.stats()["rejected"] == 2  # noqa: PLR2004
+
+    release.set()
+    writer.stop()
+    assert writer.stats()["queue_depth"] == 0
+
+
+def test_accepts_oversized_delivery_into_empty_queue() -> None:
+    write = RecordingWrite()
+    writer = _writer(write, max_queued_events=2)
+
+    with patch.object(writer, "start"):
+        assert writer.submit("monthly_report", [{"n": i} for i in range(5)])
+        assert not writer.submit("monthly_report", [{"n": 5}])
+
+    writer.start()
+    writer.stop()
+
+    assert writer.stats()["written"] == 5  # noqa: PLR2004
+
+
+def test_bad_delivery_does_not_fail_deliveries_merged_with_it() -> None:
+    attempts = []
+
+    def write(events, webhook_type):
+        attempts.append(len(events))
+        if any("timestamp" not in event for event in events):
+            raise ValueError("invalid literal for int()")
+
+    writer = _writer(write, max_attempts=3)
+    writer.submit("monthly_report", [{"n": 1, "timestamp": 1}, {"n": 2, "timestamp": 2}])
+    writer.submit("monthly_report", [{"n": 3}])
+    writer.stop()
+
+    # The merged write isn't retried, then each delivery is written on its own
+    assert attempts == [3, 2, 1]
+    assert writer.stats()["written"] == 2  # noqa: PLR2004
+    assert writer.stats()["failed"] == 1
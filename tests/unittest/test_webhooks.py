@@ -0,0 +1,186 @@
+import base64
+import hashlib
+import json
+from contextlib import nullcontext
+from uuid import uuid4
+
+import pytest
+from ecdsa import NIST256p, SigningKey
+from ecdsa.util import sigencode_der
+from sqlalchemy import delete, select
+
+from api.v1 import webhooks
+from models import LogoutUserEmailLogs, MonthlyReportEmailLogs
+from service import webhook_service
+from utils import webhook_utils
+from utils.base_config import config as settings
+
+
+@pytest.fixture
+def signing_key(monkeypatch):
+    key = SigningKey.generate(curve=NIST256p)
+    public_key = "".join(key.get_verifying_key().to_pem().decode().strip().splitlines()[1:-1])
+    monkeypatch.setattr(settings, "sendgrid_webhook_public_key", public_key)
+    webhook_utils.get_verifying_key.cache_clear()
+    yield key
+    webhook_utils.get_verifying_key.cache_clear()
+
+
+def _sign(key: SigningKey, payload: str, timestamp: str) -> str:
+    signature = key.sign(
+        (timestamp + payload).encode(), hashfunc=hashlib.sha256, sigencode=sigencode_der
+    )
+    return base64.b64encode(signature).decode()
+
+
+def test_signature_verified_with_key_parsed_once(signing_key):
+    payload = '[{"event": "delivered"}]'
+    timestamp = "1760000000"
+    signature = _sign(signing_key, payload, timestamp)
+
+    assert webhook_utils.is_valid_webhook_signature(payload, signature, timestamp)
+    assert webhook_utils.is_valid_webhook_signature(payload, signature, timestamp)
+    assert not webhook_utils.is_valid_webhook_signature(payload + " ", signature, timestamp)
+
+    cache = webhook_utils.get_verifying_key.cache_info()
+    assert (cache.misses, cache.hits) == (1, 2)
+
+
+@pytest.fixture
+def email_logs(db_session, monkeypatch):
+    for model in (LogoutUserEmailLogs, MonthlyReportEmailLogs):
+        db_session.execute(delete(model))
+    db_session.commit()
+    monkeypatch.setattr(webhook_service, "get_db_context_session", lambda: nullcontext(db_session))
+    monkeypatch.setattr(settings, "sendgrid_webhook_insert_chunk_size", 2)
+    return db_session
+
+
+def _event(status: str, **extra) -> dict:
+    return {
+        "event": status,
+        "sg_event_id": str(uuid4()),
+        "sg_message_id": str(uuid4()),
+        "user_id": str(uuid4()),
+        "email": "user@example.com",
+        "timestamp": 1760000000,
+        **extra,
+    }
+
+
+def test_logout_logs_inserted_in_chunks_and_retries_skipped(email_logs):
+    delivered = [_event("delivered", notification_type="Logged Out for 6 Months") for _ in range(3)]
+    bounced = [_event("bounced", notification_type="Logged Out for 1 Year", reason="Mailbox full")]
+
+    assert webhook_service.insert_logout_logs(delivered, bounced) == 4  # noqa: PLR2004
+    # SendGrid retrying the same batch, plus one new event
+    extra = _event("delivered", notification_type="Logged Out for 9 Months")
+    assert webhook_service.insert_logout_logs([*delivered, extra], bounced) == 1
+
+    rows = email_logs.scalars(select(LogoutUserEmailLogs)).all()
+    assert len(rows) == 5  # noqa: PLR2004
+    failed = [row for row in rows if row.email_delivery_status == "Failed"]
+    assert [(row.event_id, row.failure_reason) for row in failed] == [
+        (bounced[0]["sg_event_id"], "Mailbox full")
+    ]
+    assert all(row.failure_reason is None for row in rows if row not in failed)
+
+
+def test_handle_monthly_report_webhook(email_logs):
+    batch_id = str(uuid4())
+    events = [
+        _event(
+            "delivered", webhook_type="monthly_report", report_month="2026-09", batch_id=batch_id
+        ),
+        _event("dropped", webhook_type="monthly_report", report_month="2026-09", batch_id=batch_id),
+        _event(
+            "processed", webhook_type="monthly_report", report_month="2026-09", batch_id=batch_id
+        ),
+    ]
+
+    webhook_service.handle_sendgrid_webhook(events, "monthly_report")
+    webhook_service.handle_sendgrid_webhook(events, "monthly_report")
+
+    rows = email_logs.scalars(select(MonthlyReportEmailLogs)).all()
+    assert sorted(row.event_id for row in rows) == sorted(e["sg_event_id"] for e in events[:2])
+    assert {row.report_month for row in rows} == {"2026-09"}
+
+
+def test_handle_webhook_skips_malformed_events(email_logs):
+    good = [_event("delivered", notification_type="Logged Out for 6 Months") for _ in range(2)]
+    no_timestamp = {**_event("bounced", notification_type="Logged Out for 1 Year")}
+    del no_timestamp["timestamp"]
+
+    webhook_service.handle_sendgrid_webhook(
+        [*good, "not an event", no_timestamp], "logout_user_notification"
+    )
+
+    rows = email_logs.scalars(select(LogoutUserEmailLogs)).all()
+    assert sorted(row.event_id for row in rows) == sorted(e["sg_event_id"] for e in good)
+
+
+class RecordingWriter:
+    def __init__(self, accept: bool = True):
+        self.accept = accept
+        self.submitted: list[tuple[str, list[dict]]] = []
+
+    def submit(self, webhook_type, events):
+        self.submitted.append((webhook_type, events))
+        return self.accept
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    writer = RecordingWriter()
+    monkeypatch.setattr(webhooks, "webhook_writer", writer)
+    return writer
+
+
+def _post(client, payload: str, key: SigningKey | None = None, signature: str | None = None):
+    timestamp = "1760000000"
+    headers = {
+        "content-type": "application/json",
+        "x-twilio-email-event-webhook-timestamp": timestamp,
+        "x-twilio-email-event-webhook-signature": signature or _sign(key, payload, timestamp),
+    }
+    return client.post("/v1/webhook/sendgrid", content=payload, headers=headers)
+
+
+def test_webhook_queues_verified_events(client, signing_key, writer):
+    events = [_event("delivered", webhook_type="monthly_report")]
+    response = _post(client, json.dumps(events), signing_key)
+
+    assert response.status_code == 200  # noqa: PLR2004
+    assert writer.submitted == [("monthly_report", events)]
+
+
+def test_webhook_rejects_bad_requests(client, signing_key, writer):
+    payload = json.dumps([_event("delivered", webhook_type="monthly_report")])
+    other_key = SigningKey.generate(curve=NIST256p)
+
+    missing_headers = client.post("/v1/webhook/sendgrid", content=payload)
+    bad_signature = _post(client, payload, other_key)
+    not_events = _post(client, '{"event": "delivered"}', signing_key)
+
+    assert missing_headers.status_code == 400  # noqa: PLR2004
+    assert bad_signature.status_code == 400  # noqa: PLR2004
+    assert bad_signature.json() == {"message": "Invalid signature"}
+    assert not_events.status_code == 400  # noqa: PLR2004
+    assert writer.submitted == []
+
+
+def test_webhook_rejects_oversized_payload(client, signing_key, writer, monkeypatch):
+    monkeypatch.setattr(settings, "sendgrid_webhook_max_payload_bytes", 64)
+    payload = json.dumps([_event("delivered", webhook_type="monthly_report")])
+
+    response = _post(client, payload, signature="unchecked")
+
+    assert response.status_code == 413  # noqa: PLR2004
+    assert writer.submitted == []
+
+
+def test_webhook_asks_for_retry_when_queue_is_full(client, signing_key, monkeypatch):
+    monkeypatch.setattr(webhooks, "webhook_writer", RecordingWriter(accept=False))
+    payload = json.dumps([_event("delivered", webhook_type="monthly_report")])
+
+    assert _post(client, payload, signing_key).status_code == 503  # noqa: PLR2004
@@ -0,0 +1,22 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+
+def close_on_loop(
+    close: Callable[[], Coroutine[Any, Any, Any]], loop: asyncio.AbstractEventLoop
+) -> None:
+    """
+    Close a connection pool bound to ``loop`` from code running outside that loop.
+
+    Pooled asyncio connections can only be closed on the loop that opened them, so
+    ``close`` is handed to that loop without waiting for it. A loop that is already closed
+    can't run it; the sockets of its connections are closed when they are garbage
+    collected.
+
+    Args:
+        close (Callable): Returns the coroutine that closes the pool.
+        loop (asyncio.AbstractEventLoop): The loop the pool's connections are bound to.
+    """
+    if not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(close(), loop)
@@ -14,30 +14,93 @@ class Config(BaseSettings):
     nhs_api_url: str
     nhs_api_key: str
     nhs_vectors: str = '["P5.Cp.Cd"]'
+    nhs_login_connect_timeout: float = 3
+    nhs_login_read_timeout: float = 10
+    nhs_login_jwks_cache_ttl: int = 3600
+    nhs_login_jwks_min_refresh_interval: int = 60
+    nhs_login_callback_budget_ms: float = 3000
     auth_jwt_secret: str
     nhs_pds_jwt_private_key: str
+    nhs_pds_timeout: float = 10
+    nhs_pds_token_refresh_margin: int = 60
     db_host: str
     db_port: str
     db_user: str
     db_pass: str
     db_name: str
-    db_pool_size: int = 35
-    db_max_overflow: int = 10
+    # The sync and async engines share a budget of 45 connections per worker process
+    db_pool_size: int = 25
+    db_max_overflow: int = 5
     db_pool_recycle: int = 1800
+    db_async_pool_size: int = 12
+    db_async_max_overflow: int = 3
     app_uri: str
     gojauntly_key_id: str
     gojauntly_private_key: str
     gojauntly_issuer_id: str
+    gojauntly_timeout: float = 15
+    gojauntly_connect_timeout: float = 5
+    gojauntly_max_connections: int = 20
+    gojauntly_max_keepalive_connections: int = 10
+    gojauntly_http2: bool = True
+    gojauntly_max_retries: int = 2
+    gojauntly_retry_base_delay: float = 0.2
+    gojauntly_circuit_failure_threshold: int = 5
+    gojauntly_circuit_reset_timeout: float = 30
+    gojauntly_cache_enabled: bool = True
+    gojauntly_cache_default_ttl: int = 300
+    gojauntly_cache_ttls: dict[str, int] = {
+        "curated_walk_search": 900,
+        "curated_walk_retrieve": 3600,
+        "dynamic_routes_circular_collection": 900,
+    }
+    gojauntly_cache_stale_ttl: int = 3600
     aws_sqs_queue_url: str
     aws_sqs_activities_migrations_queue_url: str
     aws_sns_activity_topic_arn: str
     aws_sns_activities_migration_topic_arn: str
+    activity_migration_stream_max_line_bytes: int = 64 * 1024
+    activity_migration_stream_open_months: int = 2
+    activity_outbox_enabled: bool = True
+    outbox_relay_batch_limit: int = 100
+    outbox_relay_poll_interval: float = 0.5
+    outbox_relay_max_attempts: int = 10
+    activity_partitions_manage_on_startup: bool = False
+    activity_partitions_months_ahead: int = 3
+    activity_partitions_retention_months: int = 0
+    activity_partitions_archive_schema: str = "archive"
+    activity_partitions_lock_timeout_ms: int = 5000
+    sns_publisher_queue_size: int = 10000
+    sns_publisher_batch_size: int = 10
+    sns_publisher_flush_interval: float = 0.5
+    sns_publisher_max_attempts: int = 5
+    sns_publisher_max_in_flight: int = 4
+    sns_publisher_shutdown_timeout: float = 30
     sendgrid_webhook_public_key: str
+    sendgrid_webhook_insert_chunk_size: int = 1000
+    sendgrid_webhook_max_payload_bytes: int = 5 * 1024 * 1024
+    sendgrid_webhook_max_queued_events: int = 20000
+    sendgrid_webhook_batch_size: int = 1000
+    sendgrid_webhook_flush_interval: float = 1.0
+    sendgrid_webhook_shutdown_timeout: float = 30
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
     redis_password: str = ""
     redis_use_ssl: bool = False
+    redis_codec: str = "orjson"
+    redis_allow_legacy_pickle: bool = True
+    auth_local_cache_max_size: int = 10000
+    auth_local_cache_ttl: int = 60
+    user_profile_cache_ttl: int = 3600
+    resource_cache_enabled: bool = True
+    resource_cache_default_ttl: int = 300
+    resource_cache_ttls: dict[str, int] = {
+        "walking_plans": 3600,
+        "daily_targets": 900,
+        "motivations": 3600,
+        "activity_level": 3600,
+    }
 
     otel_service_name: str = "active10-auth"
     otel_exporter_otlp_endpoint: str
@@ -50,6 +113,13 @@ class Config(BaseSettings):
 
     cprofile_enable: bool = False
 
+    warmup_enabled: bool = True
+    warmup_max_concurrency: int = 4
+    warmup_timeout: float = 10
+    health_probe_timeout: float = 2
+    health_cache_ttl: float = 5
+    health_probe_aws: bool = False
+
     # Extra allowed for adding AWS_ local dummy secrets in the .env file
     model_config = SettingsConfigDict(
         env_file=(".env", "tests/tests.env"),
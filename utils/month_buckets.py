@@ -0,0 +1,55 @@
+"""
+Bin unix timestamps into UTC calendar months.
+
+``month_start`` handles one timestamp with ``datetime``; the other functions take
+arrays and do the same with NumPy ``datetime64[M]``, with no Python loop over the
+timestamps. Both always work in UTC, whatever the local timezone of the process.
+"""
+
+from datetime import date, datetime, timezone
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+def month_start(unix: int) -> int:
+    """Return the unix time the UTC month containing ``unix`` starts at."""
+    moment = datetime.fromtimestamp(unix, timezone.utc)  # noqa: UP017 Not supported in Python 3.10
+    return int(datetime(moment.year, moment.month, 1, tzinfo=timezone.utc).timestamp())  # noqa: UP017 Not supported in Python 3.10
+
+
+def to_months(timestamps: ArrayLike) -> np.ndarray:
+    """
+    Return the UTC month of each unix timestamp.
+
+    Args:
+        timestamps (ArrayLike): Unix timestamps in seconds.
+
+    Returns:
+        np.ndarray: The months, as ``datetime64[M]``.
+    """
+    return np.asarray(timestamps, dtype=np.int64).astype("datetime64[s]").astype("datetime64[M]")
+
+
+def months_to_unix(months: np.ndarray) -> np.ndarray:
+    """Return the unix time each ``datetime64[M]`` month starts at, as ``int64``."""
+    return months.astype("datetime64[s]").astype(np.int64)
+
+
+def month_starts(timestamps: ArrayLike) -> np.ndarray:
+    """Return the start of the UTC month containing each unix timestamp, as ``int64``."""
+    return months_to_unix(to_months(timestamps))
+
+
+def month_bounds(month: date) -> tuple[int, int]:
+    """Return the unix range ``[start, end)`` of the UTC month containing ``month``."""
+    start = np.datetime64(month, "M")
+    start_unix, end_unix = months_to_unix(np.array([start, start + 1]))
+    return int(start_unix), int(end_unix)
+
+
+def all_in_month(timestamps: ArrayLike, month: int) -> bool:
+    """
+    Check every unix timestamp falls in the UTC month containing the unix time ``month``.
+    """
+    return bool((to_months(timestamps) == to_months(month)).all())
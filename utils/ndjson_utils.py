@@ -0,0 +1,42 @@
+from collections.abc import AsyncIterable, AsyncIterator
+
+
+class LineTooLong(Exception):
+    pass
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Split a stream of NDJSON bytes into lines as they arrive.
+
+    Blank lines are skipped. Only the current partial line is buffered, so memory is
+    bounded by ``max_line_bytes`` whatever the size of the stream.
+
+    Yields:
+        tuple[int, bytes]: The 1-based line number and the line, without its newline.
+
+    Raises:
+        LineTooLong: If a line exceeds ``max_line_bytes``.
+    """
+    buffer = bytearray()
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line_number += 1
+            line = bytes(buffer[start:end]).strip()
+            start = end + 1
+            if len(line) > max_line_bytes:
+                raise LineTooLong(line_number)
+            if line:
+                yield line_number, line
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise LineTooLong(line_number + 1)
+
+    line = bytes(buffer).strip()
+    if line:
+        yield line_number + 1, line
@@ -1,13 +1,18 @@
+from functools import lru_cache
+
+from ecdsa import VerifyingKey
 from sendgrid import EventWebhook
 
 from utils.base_config import config
 
-SENDGRID_WEBHOOK_PUBLIC_KEY = config.sendgrid_webhook_public_key
+_event_webhook = EventWebhook()
 
 
-def is_valid_webhook_signature(payload: str, signature: str, timestamp: str) -> bool:
-    ew = EventWebhook()
-    key = ew.convert_public_key_to_ecdsa(SENDGRID_WEBHOOK_PUBLIC_KEY)
-    is_valid = ew.verify_signature(payload, signature, timestamp, key)
+@lru_cache(maxsize=1)
+def get_verifying_key() -> VerifyingKey:
+    """Parse the SendGrid Event Webhook public key once per process."""
+    return _event_webhook.convert_public_key_to_ecdsa(config.sendgrid_webhook_public_key)
 
-    return is_valid
+
+def is_valid_webhook_signature(payload: str, signature: str, timestamp: str) -> bool:
+    return _event_webhook.verify_signature(payload, signature, timestamp, get_verifying_key())